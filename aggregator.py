@@ -0,0 +1,147 @@
+"""通知聚合窗口：把多轮抓取到的新闻缓存在 state 数据库中，窗口结束时合并推送。"""
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import fields
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from ai import AISummary
+from deduper import make_news_id
+from fetcher.base_fetcher import NewsRecord
+from utils.config_loader import DEFAULT_CONFIG_PATH
+from utils.settings import AggregationSettings, get_config
+
+logger = logging.getLogger(__name__)
+
+_SUMMARY_FIELDS = {item.name for item in fields(AISummary)}
+
+
+class NotificationAggregator:
+    """缓冲待推送的新闻，窗口到期、数量达到阈值或命中紧急规则时一次性取出。"""
+
+    def __init__(
+        self,
+        db_path: Path,
+        config_path: Optional[Path] = None,
+        *,
+        clock: Callable[[], float] = time.time,
+        settings: Optional[AggregationSettings] = None,
+    ) -> None:
+        cfg = settings or get_config(config_path or DEFAULT_CONFIG_PATH).notification.aggregation
+        self.enabled = cfg.enabled
+        self.window_sec = cfg.window_min * 60
+        self.max_items = cfg.max_items
+        self.urgent_rules: Set[str] = set(cfg.urgent_rules)
+        self.clock = clock
+        self.db_path = db_path
+        if not db_path.parent.exists():
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS notification_buffer (
+                news_id TEXT PRIMARY KEY,
+                rule TEXT,
+                record_json TEXT,
+                summary_json TEXT,
+                created_at REAL
+            )
+            """
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def add(self, records: Iterable[NewsRecord], summaries: Dict[str, AISummary]) -> int:
+        """写入缓冲区；已在缓冲区中的新闻保留最初的入队时间。返回新增条数。"""
+        now = self.clock()
+        rows = []
+        for record in records:
+            summary = summaries.get(self._record_key(record))
+            raw = record.raw if isinstance(record.raw, dict) else {}
+            rows.append(
+                (
+                    make_news_id(record),
+                    str(raw.get("_matched_rule") or ""),
+                    json.dumps(record.to_dict(), ensure_ascii=False, default=str),
+                    json.dumps(summary.to_dict(), ensure_ascii=False, default=str) if summary else None,
+                    now,
+                )
+            )
+        with self._lock:
+            cur = self.conn.executemany(
+                """
+                INSERT OR IGNORE INTO notification_buffer (news_id, rule, record_json, summary_json, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            self.conn.commit()
+        return max(cur.rowcount, 0)
+
+    def pending_news_ids(self) -> Set[str]:
+        with self._lock:
+            return {row[0] for row in self.conn.execute("SELECT news_id FROM notification_buffer")}
+
+    def flush_reason(self) -> Optional[str]:
+        """判断缓冲区是否应当推送：urgent / size / window，未到期返回 None。"""
+        with self._lock:
+            count, oldest = self.conn.execute("SELECT COUNT(*), MIN(created_at) FROM notification_buffer").fetchone()
+            if not count:
+                return None
+            if self.urgent_rules:
+                marks = ",".join("?" for _ in self.urgent_rules)
+                hit = self.conn.execute(
+                    f"SELECT 1 FROM notification_buffer WHERE rule IN ({marks}) LIMIT 1",
+                    sorted(self.urgent_rules),
+                ).fetchone()
+                if hit:
+                    return "urgent"
+        if self.max_items and count >= self.max_items:
+            return "size"
+        if self.clock() - float(oldest) >= self.window_sec:
+            return "window"
+        return None
+
+    def take(self) -> Tuple[List[NewsRecord], Dict[str, AISummary]]:
+        """按入队顺序读出缓冲区内的全部新闻与摘要；确认交付后再调用 discard 删除。"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT record_json, summary_json FROM notification_buffer ORDER BY created_at, rowid"
+            ).fetchall()
+        records: List[NewsRecord] = []
+        summaries: Dict[str, AISummary] = {}
+        for record_json, summary_json in rows:
+            try:
+                record = NewsRecord(**json.loads(record_json))
+            except (TypeError, ValueError) as exc:
+                logger.warning("聚合缓冲区记录无法解析，已跳过: %s", exc)
+                continue
+            records.append(record)
+            if summary_json:
+                try:
+                    data = json.loads(summary_json)
+                    summary = AISummary(**{key: value for key, value in data.items() if key in _SUMMARY_FIELDS})
+                except (TypeError, ValueError):
+                    continue
+                summaries[self._record_key(record)] = summary
+        return records, summaries
+
+    def discard(self, records: Sequence[NewsRecord]) -> None:
+        with self._lock:
+            self.conn.executemany(
+                "DELETE FROM notification_buffer WHERE news_id = ?",
+                [(make_news_id(record),) for record in records],
+            )
+            self.conn.commit()
+
+    def _record_key(self, record: NewsRecord) -> str:
+        return record.url or f"{record.source}-{record.title}"
@@ -1,7 +1,9 @@
 """AI 客户端与类型定义。"""
 from .client import AIClient
+from .combined import AICombinedProcessor
 from .filter import AISummaryFilter
 from .prefilter import AIPreFilter
+from .queue import AIWorkQueue
 from .types import AISummary
 
-__all__ = ["AIClient", "AISummary", "AISummaryFilter", "AIPreFilter"]
+__all__ = ["AIClient", "AICombinedProcessor", "AISummary", "AISummaryFilter", "AIPreFilter", "AIWorkQueue"]
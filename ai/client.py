@@ -2,8 +2,8 @@
 from __future__ import annotations
 
 import json
-import os
 import logging
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
@@ -11,12 +11,26 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import requests
 
+from .prompting import PromptTemplate
 from .types import AISummary
+from .usage import AI_REQUEST_ERRORS, AI_REQUEST_SECONDS, UsageTotals, parse_usage, record_usage, stage_label
 from fetcher.base_fetcher import NewsRecord
-from utils.config_loader import DEFAULT_CONFIG_PATH, load_settings
+from utils.config_loader import DEFAULT_CONFIG_PATH
+from utils.settings import get_config
 from utils.time_utils import get_timezone_helper
 
 DEFAULT_PROMPT_FILE = Path("prompts/news_summary.md")
+DEFAULT_PROMPT_TEMPLATE = "请总结以下新闻：\n标题：{title}\n来源：{source}\n内容：{content}\n链接：{url}"
+SUMMARY_PROMPT_FIELDS = (
+    "identity_hint",
+    "title",
+    "source",
+    "summary",
+    "url",
+    "content",
+    "current_time",
+    "publish_time",
+)
 
 
 logger = logging.getLogger(__name__)
@@ -27,44 +41,48 @@ class AIClient:
 
     def __init__(self, config_path: Optional[Path] = None) -> None:
         self.config_path = config_path or DEFAULT_CONFIG_PATH
-        self.config = self._load_config()
-        self.enabled = self.config.get("enabled", False)
-        self.base_url = self.config.get("base_url", "https://api.openai.com/v1")
-        self.model = self.config.get("model", "gpt-4o-mini")
-        self.api_key = (
-            os.environ.get("ARK_API_KEY")
-            or os.environ.get("OPENAI_API_KEY")
-            or self.config.get("api_key", "")
-        )
-        prompt_file = self.config.get("prompt_file") or str(DEFAULT_PROMPT_FILE)
+        self.config = get_config(self.config_path).ai
+        self.enabled = self.config.enabled
+        self.base_url = self.config.base_url
+        self.model = self.config.model
+        self.api_key = self.config.api_key
+        prompt_file = self.config.prompt_file or str(DEFAULT_PROMPT_FILE)
         self.prompt_template = Path(prompt_file).read_text(encoding="utf-8") if Path(prompt_file).exists() else ""
-        self.system_prompt = self.config.get("system_prompt", "你是一名严谨的中文财经记者，请根据指定信息生成摘要。")
-        self.reasoning_effort = self.config.get("reasoning_effort")
-        self.temperature = self.config.get("temperature")
-        self.timeout = int(self.config.get("timeout_sec", 30))
-        self.max_items = int(self.config.get("max_items", 5))
-        max_workers = self.config.get("max_workers")
-        try:
-            self.max_workers = max(1, int(max_workers)) if max_workers is not None else 3
-        except (TypeError, ValueError):
-            self.max_workers = 3
-        self.use_article_body = bool(self.config.get("use_article_body", True))
-        self.identity_hint = self.config.get("identity_hint") or "保持专业中立、关注风险敞口的分析视角"
-        self.fail_open_on_error = bool(self.config.get("fail_open_on_error", True))
+        self.system_prompt = self.config.system_prompt
+        self.reasoning_effort = self.config.reasoning_effort
+        self.temperature = self.config.temperature
+        self.timeout = self.config.timeout_sec
+        self.max_items = self.config.max_items
+        self.max_workers = self.config.max_workers
+        self.use_article_body = self.config.use_article_body
+        self.identity_hint = self.config.identity_hint
+        self.fail_open_on_error = self.config.fail_open_on_error
         self.tz_helper = get_timezone_helper(self.config_path)
-
-    def _load_config(self) -> Dict[str, any]:  # type: ignore[override]
-        settings = load_settings(self.config_path)
-        return settings.get("ai", {})
-
-    def summarize_news(self, records: Iterable[NewsRecord]) -> List[AISummary]:
+        self.prompt = PromptTemplate(
+            self.prompt_template or DEFAULT_PROMPT_TEMPLATE,
+            SUMMARY_PROMPT_FIELDS,
+        ).bind({"identity_hint": self.identity_hint})
+        self.usage_totals = UsageTotals()
+        # 复用 HTTP 连接池，常驻流水线中跨轮保持 keep-alive
+        self.session = requests.Session()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def summarize_news(
+        self,
+        records: Iterable[NewsRecord],
+        *,
+        deadline: Optional[float] = None,
+    ) -> List[AISummary]:
+        """逐条生成摘要；deadline 为 time.monotonic() 截止时间，超时未开始的新闻会被标记 `_ai_deferred`。"""
         record_list = list(records)
         summaries: List[Tuple[int, AISummary]] = []
         if not self.enabled or not self.api_key or not record_list:
             return []
         if len(record_list) == 1 or self.max_workers <= 1:
             for idx, record in enumerate(record_list):
-                summary = self._summarize_single(record)
+                summary = self._summarize_before_deadline(record, deadline)
                 if summary:
                     summaries.append((idx, summary))
                     logger.info("[AI]%s -> %s", record.title or record.source, summary.summary)
@@ -72,7 +90,7 @@ class AIClient:
         max_workers = min(self.max_workers, len(record_list))
         with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai-summary") as executor:
             future_map = {
-                executor.submit(self._summarize_single, record): (idx, record)
+                executor.submit(self._summarize_before_deadline, record, deadline): (idx, record)
                 for idx, record in enumerate(record_list)
             }
             for future in as_completed(future_map):
@@ -88,9 +106,34 @@ class AIClient:
         summaries.sort(key=lambda pair: pair[0])
         return [summary for _, summary in summaries]
 
+    def estimate_tokens(self, record: NewsRecord, chars_per_token: float = 1.5, completion_tokens: int = 800) -> int:
+        """粗略估算单条新闻的 token 消耗（提示词长度 + 预留输出）。"""
+        prompt_chars = len(self.system_prompt or "") + len(self._render_prompt(record))
+        return int(prompt_chars / max(chars_per_token, 0.1)) + completion_tokens
+
+    def _summarize_before_deadline(self, record: NewsRecord, deadline: Optional[float]) -> Optional[AISummary]:
+        if deadline is not None and time.monotonic() >= deadline:
+            if not isinstance(record.raw, dict):
+                record.raw = {}
+            record.raw["_ai_deferred"] = True
+            return None
+        return self._summarize_single(record)
+
     def _summarize_single(self, record: NewsRecord) -> Optional[AISummary]:
         prompt = self._render_prompt(record)
         logger.debug("AI prompt:\n%s", prompt)
+        data, error = self._post_chat(prompt, record.title, stage="AI 摘要")
+        if data is None:
+            return self._handle_summary_failure(record, error or "request_error")
+        content = self._message_content(data)
+        if not content:
+            logger.warning("AI 摘要返回空内容: %s", record.title)
+            return self._handle_summary_failure(record, "empty_content")
+        structured = self._ensure_schema(self._parse_ai_output(content), record)
+        return self._build_summary(record, structured, content, data)
+
+    def _post_chat(self, prompt: str, title: Optional[str], stage: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """调用 chat/completions，返回 (响应 JSON, 失败原因)。"""
         payload = {
             "model": self.model,
             "messages": [
@@ -106,15 +149,18 @@ class AIClient:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
+        label = stage_label(stage)
         try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=self.timeout,
-            )
+            with AI_REQUEST_SECONDS.time(stage=label):
+                response = self.session.post(
+                    f"{self.base_url}/chat/completions",
+                    headers=headers,
+                    json=payload,
+                    timeout=self.timeout,
+                )
             response.raise_for_status()
         except requests.RequestException as exc:
+            AI_REQUEST_ERRORS.inc(stage=label, reason="request_error")
             error_text = ""
             if exc.response is not None:
                 try:
@@ -122,19 +168,28 @@ class AIClient:
                 except Exception:
                     error_text = "<无法读取响应>"
             logger.warning("AI 请求失败: %s | payload=%s | response=%s", exc, payload, error_text)
-            return self._handle_summary_failure(record, "request_error")
+            return None, "request_error"
         try:
             data = response.json()
         except ValueError as exc:  # noqa: B007
             logger.warning("AI 响应解析失败: %s", exc)
-            return self._handle_summary_failure(record, "invalid_json")
+            AI_REQUEST_ERRORS.inc(stage=label, reason="invalid_json")
+            return None, "invalid_json"
+        self._log_usage(data.get("usage"), title, stage=stage)
+        return data, None
+
+    def _message_content(self, data: Dict[str, Any]) -> str:
+        return data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
+
+    def _build_summary(
+        self,
+        record: NewsRecord,
+        structured: Dict[str, Any],
+        content: str,
+        data: Dict[str, Any],
+    ) -> Optional[AISummary]:
+        """把已补全 schema 的模型输出转换为 AISummary，拒答时按配置回退或拦截。"""
         usage = data.get("usage")
-        self._log_usage(usage, record.title, stage="AI 摘要")
-        content = data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
-        if not content:
-            logger.warning("AI 摘要返回空内容: %s", record.title)
-            return self._handle_summary_failure(record, "empty_content")
-        structured = self._ensure_schema(self._parse_ai_output(content), record)
         summary_text = structured.get("summary") or ""
         if self._is_refusal_summary(summary_text, usage):
             logger.warning("AI 摘要疑似拒答或无效输出，改用原始信息: %s", record.title)
@@ -187,22 +242,16 @@ class AIClient:
         )
 
     def _render_prompt(self, record: NewsRecord) -> str:
-        template = self.prompt_template or "请总结以下新闻：\n标题：{title}\n来源：{source}\n内容：{content}\n链接：{url}"
         values = {
             "title": record.title or "",
             "source": record.source or "",
             "summary": record.summary or "",
             "url": record.url or "",
             "content": self._select_content(record),
-            "identity_hint": self.identity_hint,
             "current_time": self._current_time_text(),
             "publish_time": self._record_publish_time(record),
         }
-        rendered = template
-        for key, val in values.items():
-            safe_val = str(val or "")
-            rendered = rendered.replace(f"{{{key}}}", safe_val)
-        return rendered
+        return self.prompt.render(values)
 
     def _parse_ai_output(self, content: str) -> Dict[str, any]:  # type: ignore[override]
         """尝试解析 JSON，如果失败则回退到纯文本摘要。"""
@@ -443,33 +492,25 @@ class AIClient:
             return 0
 
     def _log_usage(self, usage: Any, title: Optional[str], stage: str) -> None:
-        if not isinstance(usage, dict):
-            return
-        def _to_int(val: Any) -> Optional[int]:
-            try:
-                return int(val)
-            except (TypeError, ValueError):
-                return None
-
-        prompt = _to_int(usage.get("prompt_tokens"))
-        completion = _to_int(usage.get("completion_tokens"))
-        total = _to_int(usage.get("total_tokens"))
-        if total is None and prompt is not None and completion is not None:
-            total = prompt + completion
-        if all(v is None for v in (prompt, completion, total)):
+        stats = parse_usage(usage)
+        if stats.empty:
             return
+        self.usage_totals.add(stats)
+        record_usage(stats, stage)
+        prompt, completion, total = stats.prompt, stats.completion, stats.total
         safe_title = (title or "").strip() or "未知标题"
         try:
             raw_usage = json.dumps(usage, ensure_ascii=False)
         except TypeError:
             raw_usage = str(usage)
         logger.info(
-            "[AI tokens] %s | %s | prompt=%s completion=%s total=%s",
+            "[AI tokens] %s | %s | prompt=%s completion=%s total=%s cached=%s",
             stage,
             safe_title,
             prompt if prompt is not None else "-",
             completion if completion is not None else "-",
             total if total is not None else "-",
+            stats.cached if stats.cached is not None else "-",
         )
         if prompt == completion == total == 0:
             logger.info("[AI usage raw] %s | %s | %s", stage, safe_title, raw_usage)
@@ -0,0 +1,143 @@
+"""合并模式：一次调用同时完成 AI 预过滤判定与结构化摘要。"""
+from __future__ import annotations
+
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Collection, Dict, List, Optional, Sequence, Tuple
+
+from fetcher.base_fetcher import NewsRecord
+from filters import FilterRule
+
+from .client import AIClient
+from .prefilter import AIPreFilter, PrefilterResult
+from .prompting import PromptTemplate
+from .types import AISummary
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMBINED_PROMPT = Path("prompts/news_combined.md")
+COMBINED_PROMPT_FIELDS = (
+    "rules",
+    "identity_hint",
+    "title",
+    "source",
+    "url",
+    "summary",
+    "content",
+    "current_time",
+    "publish_time",
+)
+
+
+class AICombinedProcessor:
+    """复用 AIPreFilter 的判定落库逻辑与 AIClient 的摘要解析，把两次模型调用合并为一次。"""
+
+    def __init__(self, prefilter: AIPreFilter, client: AIClient) -> None:
+        self.prefilter = prefilter
+        self.client = client
+        prompt_path = Path(prefilter.combined_prompt_file or DEFAULT_COMBINED_PROMPT)
+        if not prompt_path.exists():
+            prompt_path = DEFAULT_COMBINED_PROMPT
+        self.prompt_template = prompt_path.read_text(encoding="utf-8") if prompt_path.exists() else ""
+        self.prompt = PromptTemplate(self.prompt_template, COMBINED_PROMPT_FIELDS)
+        self._summaries: Dict[int, AISummary] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return (
+            self.prefilter.mode == "combined"
+            and self.prefilter.enabled
+            and self.client.enabled
+            and bool(self.client.api_key)
+            and bool(self.prompt_template)
+        )
+
+    def apply(
+        self,
+        records: Sequence[NewsRecord],
+        rules: Sequence[FilterRule],
+        *,
+        summary_targets: Optional[Collection[int]] = None,
+    ) -> Tuple[List[NewsRecord], Dict[str, AISummary]]:
+        """返回 (预过滤保留的新闻, 已生成的摘要映射)；未能生成摘要的新闻交由常规摘要流程处理。
+
+        summary_targets 为允许顺带生成摘要的新闻 id()，由调用方按 ai.max_items 与 AI 队列预算挑选；
+        其余新闻只做相关性判定（与分开模式相同的预过滤调用），摘要留给常规流程。None 表示不限制。"""
+        active_rules = [rule for rule in rules if rule.enabled]
+        if not active_rules:
+            return list(records), {}
+        self._summaries = {}
+        candidates, removed = self.prefilter._local_screen(records)
+        bound = self.prompt.bind(
+            {"rules": self.prefilter.rules_json(active_rules), "identity_hint": self.client.identity_hint}
+        )
+        evaluations = self.prefilter._evaluate_batch(
+            candidates,
+            active_rules,
+            evaluator=lambda record, _rules: (
+                self._evaluate_record(record, bound)
+                if summary_targets is None or id(record) in summary_targets
+                else self.prefilter._evaluate_record(record, _rules)
+            ),
+            max_workers=self.client.max_workers,
+        )
+        kept, rejected = self.prefilter.apply_results(evaluations, len(candidates))
+        removed += rejected
+        if removed:
+            logger.info("AI 预过滤(合并模式)过滤 %d 条新闻，剩余 %d 条。", removed, len(kept))
+        summary_map: Dict[str, AISummary] = {}
+        for record in kept:
+            summary = self._summaries.get(id(record))
+            if summary is not None:
+                summary_map[record.url or f"{record.source}-{record.title}"] = summary
+        return kept, summary_map
+
+    def _evaluate_record(self, record: NewsRecord, prompt_template: PromptTemplate) -> Optional[PrefilterResult]:
+        prompt = self._render_prompt(record, prompt_template)
+        logger.debug("AI combined prompt:\n%s", prompt)
+        data, _ = self.client._post_chat(prompt, record.title, stage="AI 预过滤+摘要")
+        if data is None:
+            return None
+        content = self.client._message_content(data)
+        if not content:
+            return None
+        parsed = self.client._parse_ai_output(content)
+        if "relevant" not in parsed:
+            logger.warning("AI 合并模式输出缺少 relevant 字段: %s", record.title)
+            return None
+        matched = [str(name).strip() for name in parsed.get("matched_rules") or [] if str(name).strip()]
+        reason = str(parsed.get("reason") or "").strip()
+        relevant = self._as_bool(parsed.get("relevant"))
+        if relevant and not self._as_bool(parsed.get("skip_summary")):
+            structured = self.client._ensure_schema(self._summary_fields(parsed), record)
+            summary = self.client._build_summary(record, structured, content, data)
+            if summary is not None:
+                with self._lock:
+                    self._summaries[id(record)] = summary
+        return PrefilterResult(relevant, matched, reason)
+
+    def _summary_fields(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            key: value
+            for key, value in parsed.items()
+            if key not in {"relevant", "matched_rules", "reason", "skip_summary"}
+        }
+
+    def _as_bool(self, value: Any) -> bool:
+        if isinstance(value, str):
+            return value.strip().lower() in {"true", "1", "yes"}
+        return bool(value)
+
+    def _render_prompt(self, record: NewsRecord, prompt_template: PromptTemplate) -> str:
+        values = {
+            "title": record.title or "",
+            "source": record.source or "",
+            "url": record.url or "",
+            "summary": record.summary or "",
+            "content": self.client._select_content(record),
+            "current_time": self.client._current_time_text(),
+            "publish_time": self.client._record_publish_time(record),
+        }
+        return prompt_template.render(values)
@@ -0,0 +1,238 @@
+"""AI 后置过滤的谓词编译：把 ai_filter 配置预编译为按列批量求值的判定器。"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .types import AISummary
+
+LEVEL_ALIASES = {"low": "低", "medium": "中", "mid": "中", "high": "高"}
+
+
+@lru_cache(maxsize=4096)
+def _normalize_str(text: str) -> str:
+    return text.strip().lower()
+
+
+def normalize_token(value: Any) -> str:
+    # 模型输出可能是字典或列表等不可哈希的值，先转成字符串再走缓存
+    if value is None:
+        return ""
+    return _normalize_str(str(value))
+
+
+def _normalize_set(values: Optional[Iterable[Any]]) -> FrozenSet[str]:
+    if not values:
+        return frozenset()
+    if isinstance(values, (str, bytes)):
+        values = [values]
+    return frozenset(token for token in (normalize_token(item) for item in values) if token)
+
+
+def _normalize_level(value: Any) -> str:
+    token = normalize_token(value)
+    return LEVEL_ALIASES.get(token, token)
+
+
+def _safe_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class SummaryColumns:
+    """一批摘要的列式视图，每个字段只归一化一次。"""
+
+    present: List[bool] = field(default_factory=list)
+    fallback: List[bool] = field(default_factory=list)
+    topics: List[FrozenSet[str]] = field(default_factory=list)
+    labels: List[str] = field(default_factory=list)
+    scores: List[Optional[float]] = field(default_factory=list)
+    levels: List[str] = field(default_factory=list)
+    entity_types: List[FrozenSet[str]] = field(default_factory=list)
+    keyword_text: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.present)
+
+    @classmethod
+    def from_summaries(cls, summaries: Sequence[Optional[AISummary]]) -> "SummaryColumns":
+        columns = cls()
+        for summary in summaries:
+            columns.append(summary)
+        return columns
+
+    def append(self, summary: Optional[AISummary]) -> None:
+        if summary is None:
+            self.present.append(False)
+            self.fallback.append(False)
+            self.topics.append(frozenset())
+            self.labels.append("")
+            self.scores.append(None)
+            self.levels.append("")
+            self.entity_types.append(frozenset())
+            self.keyword_text.append("")
+            return
+        meta = summary.meta if isinstance(summary.meta, dict) else {}
+        sentiment = summary.sentiment if isinstance(summary.sentiment, dict) else {}
+        if isinstance(summary.sentiment, str):
+            sentiment = {"label": summary.sentiment}
+        entities = summary.entities if isinstance(summary.entities, list) else []
+        keywords = [str(item) for item in (summary.keywords or []) if item]
+        keywords.extend(str(entity.get("text") or "") for entity in entities if isinstance(entity, dict))
+        self.present.append(True)
+        self.fallback.append(bool(meta.get("_fallback_no_ai")))
+        self.topics.append(_normalize_set(summary.topics))
+        self.labels.append(normalize_token(sentiment.get("label")))
+        self.scores.append(_safe_float(sentiment.get("score")))
+        self.levels.append(_normalize_level(sentiment.get("level")))
+        self.entity_types.append(
+            _normalize_set(entity.get("type") for entity in entities if isinstance(entity, dict))
+        )
+        self.keyword_text.append("\n".join(normalize_token(item) for item in keywords if item))
+
+
+ColumnPredicate = Callable[[SummaryColumns], List[bool]]
+
+
+def _section(value: Any) -> Dict[str, Any]:
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, list):
+        return {"include": value}
+    return {}
+
+
+def _set_include(column: str, allowed: FrozenSet[str]) -> ColumnPredicate:
+    return lambda cols: [bool(values & allowed) for values in getattr(cols, column)]
+
+
+def _set_exclude(column: str, denied: FrozenSet[str]) -> ColumnPredicate:
+    return lambda cols: [not (values & denied) for values in getattr(cols, column)]
+
+
+def _value_include(column: str, allowed: FrozenSet[str]) -> ColumnPredicate:
+    return lambda cols: [bool(value) and value in allowed for value in getattr(cols, column)]
+
+
+def _value_exclude(column: str, denied: FrozenSet[str]) -> ColumnPredicate:
+    return lambda cols: [not value or value not in denied for value in getattr(cols, column)]
+
+
+def _pattern(tokens: FrozenSet[str]) -> "re.Pattern[str]":
+    return re.compile("|".join(re.escape(token) for token in sorted(tokens, key=len, reverse=True)))
+
+
+class CompiledSummaryFilter:
+    """由 ai_filter 配置编译出的谓词集合，对整批摘要按列求值。"""
+
+    def __init__(self, predicates: Sequence[Tuple[str, ColumnPredicate]], requires_summary: bool) -> None:
+        self.predicates = list(predicates)
+        self.requires_summary = requires_summary
+
+    @classmethod
+    def from_config(cls, cfg: Mapping[str, Any]) -> "CompiledSummaryFilter":
+        predicates: List[Tuple[str, ColumnPredicate]] = []
+        requires = False
+
+        categories = _section(cfg.get("categories"))
+        include = _normalize_set(categories.get("include"))
+        exclude = _normalize_set(categories.get("exclude"))
+        if include:
+            predicates.append(("categories.include", _set_include("topics", include)))
+            requires = True
+        if exclude:
+            predicates.append(("categories.exclude", _set_exclude("topics", exclude)))
+
+        sentiments = _section(cfg.get("sentiments"))
+        include = _normalize_set(sentiments.get("include"))
+        exclude = _normalize_set(sentiments.get("exclude"))
+        if include:
+            predicates.append(("sentiments.include", _value_include("labels", include)))
+            requires = True
+        if exclude:
+            predicates.append(("sentiments.exclude", _value_exclude("labels", exclude)))
+        min_score = _safe_float(sentiments.get("min_score"))
+        max_score = _safe_float(sentiments.get("max_score"))
+        if min_score is not None:
+            predicates.append(
+                ("sentiments.min_score", lambda cols: [s is not None and s >= min_score for s in cols.scores])
+            )
+            requires = True
+        if max_score is not None:
+            predicates.append(
+                ("sentiments.max_score", lambda cols: [s is not None and s <= max_score for s in cols.scores])
+            )
+            requires = True
+
+        levels = _section(cfg.get("levels"))
+        include = frozenset(_normalize_level(item) for item in levels.get("include") or [] if item)
+        exclude = frozenset(_normalize_level(item) for item in levels.get("exclude") or [] if item)
+        if include:
+            predicates.append(("levels.include", _value_include("levels", include)))
+            requires = True
+        if exclude:
+            predicates.append(("levels.exclude", _value_exclude("levels", exclude)))
+
+        entities = _section(cfg.get("entities"))
+        include = _normalize_set(entities.get("include_types"))
+        exclude = _normalize_set(entities.get("exclude_types"))
+        if include:
+            predicates.append(("entities.include_types", _set_include("entity_types", include)))
+            requires = True
+        if exclude:
+            predicates.append(("entities.exclude_types", _set_exclude("entity_types", exclude)))
+
+        keywords = _section(cfg.get("keywords"))
+        include = _normalize_set(keywords.get("include"))
+        exclude = _normalize_set(keywords.get("exclude"))
+        if include:
+            include_pattern = _pattern(include)
+            predicates.append(
+                ("keywords.include", lambda cols: [bool(include_pattern.search(text)) for text in cols.keyword_text])
+            )
+            requires = True
+        if exclude:
+            exclude_pattern = _pattern(exclude)
+            predicates.append(
+                ("keywords.exclude", lambda cols: [not exclude_pattern.search(text) for text in cols.keyword_text])
+            )
+        return cls(predicates, requires)
+
+    def evaluate(self, columns: SummaryColumns) -> List[bool]:
+        """返回每条摘要是否保留；无摘要时仅在未配置必需字段时保留，回退摘要始终保留。"""
+        mask = [True] * len(columns)
+        for _, predicate in self.predicates:
+            for idx, passed in enumerate(predicate(columns)):
+                if not passed:
+                    mask[idx] = False
+        return self._finalize(columns, mask)
+
+    def evaluate_detailed(self, columns: SummaryColumns) -> Tuple[List[bool], Dict[str, int]]:
+        """额外统计每个谓词在有效 AI 摘要上单独拒绝的条数，用于回测。"""
+        mask = [True] * len(columns)
+        rejections: Dict[str, int] = {}
+        applicable = [present and not fallback for present, fallback in zip(columns.present, columns.fallback)]
+        for name, predicate in self.predicates:
+            rejected = 0
+            for idx, passed in enumerate(predicate(columns)):
+                if not passed:
+                    mask[idx] = False
+                    rejected += int(applicable[idx])
+            rejections[name] = rejected
+        return self._finalize(columns, mask), rejections
+
+    def _finalize(self, columns: SummaryColumns, mask: List[bool]) -> List[bool]:
+        result: List[bool] = []
+        for present, fallback, passed in zip(columns.present, columns.fallback, mask):
+            if not present:
+                result.append(not self.requires_summary)
+            elif fallback:
+                result.append(True)
+            else:
+                result.append(passed)
+        return result
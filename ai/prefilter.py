@@ -3,21 +3,27 @@ from __future__ import annotations
 
 import json
 import logging
-import os
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import requests
 
 from fetcher.base_fetcher import NewsRecord
 from filters import FilterRule
-from utils.config_loader import DEFAULT_CONFIG_PATH, load_settings
+from utils.config_loader import DEFAULT_CONFIG_PATH
+from utils.settings import resolve_settings
+
+from .prompting import PromptTemplate
+from .relevance import DEFAULT_MODEL_PATH, RelevanceModel, relevance_text
+from .usage import AI_REQUEST_ERRORS, AI_REQUEST_SECONDS, UsageTotals, parse_usage, record_usage, stage_label
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_PREFILTER_PROMPT = Path("prompts/ai_prefilter.md")
+PREFILTER_PROMPT_FIELDS = ("rules", "title", "source", "summary", "url")
 
 
 @dataclass
@@ -30,43 +36,51 @@ class PrefilterResult:
 class AIPreFilter:
     """调用轻量模型，对新闻与关键词的关联做初筛。"""
 
-    def __init__(self, config_path: Optional[Path] = None) -> None:
+    def __init__(self, config_path: Optional[Path] = None, *, settings: Optional[Dict[str, Any]] = None) -> None:
         self.config_path = config_path or DEFAULT_CONFIG_PATH
-        settings = load_settings(self.config_path)
-        cfg = settings.get("ai_prefilter", {}) or {}
-        ai_cfg = settings.get("ai", {}) or {}
-        self.enabled = bool(cfg.get("enabled", False))
-        self.base_url = cfg.get("base_url") or ai_cfg.get("base_url") or "https://api.openai.com/v1"
-        self.model = cfg.get("model") or ai_cfg.get("model") or "gpt-4o-mini"
-        self.api_key = (
-            os.environ.get("ARK_API_KEY")
-            or os.environ.get("OPENAI_API_KEY")
-            or cfg.get("api_key")
-            or ai_cfg.get("api_key")
-            or ""
-        )
-        prompt_file = cfg.get("prompt_file") or str(DEFAULT_PREFILTER_PROMPT)
-        prompt_path = Path(prompt_file)
+        cfg = resolve_settings(self.config_path, settings).ai_prefilter
+        self.enabled = cfg.enabled
+        self.base_url = cfg.base_url
+        self.model = cfg.model
+        self.api_key = cfg.api_key
+        prompt_path = Path(cfg.prompt_file or str(DEFAULT_PREFILTER_PROMPT))
         self.prompt_template = (
             prompt_path.read_text(encoding="utf-8") if prompt_path.exists() else DEFAULT_PREFILTER_PROMPT.read_text(encoding="utf-8")
         )
-        self.system_prompt = cfg.get(
-            "system_prompt",
-            "你是一名资深的中英文新闻审核员，擅长理解不同语言的同义表达并判断是否命中指定情报需求。",
-        )
-        self.temperature = cfg.get("temperature")
-        self.reasoning_effort = cfg.get("reasoning_effort")
-        self.timeout = int(cfg.get("timeout_sec", 30))
-        self.include_article_body = bool(cfg.get("include_article_body", False))
-        self.max_text_chars = int(cfg.get("max_text_chars", 300))
-        self.log_rejections = bool(cfg.get("log_rejections", False))
-        self.fail_open_on_error = bool(cfg.get("fail_open_on_error", True))
-        workers_raw = cfg.get("max_workers")
+        self.system_prompt = cfg.system_prompt
+        self.temperature = cfg.temperature
+        self.reasoning_effort = cfg.reasoning_effort
+        self.timeout = cfg.timeout_sec
+        self.include_article_body = cfg.include_article_body
+        self.max_text_chars = cfg.max_text_chars
+        self.log_rejections = cfg.log_rejections
+        self.fail_open_on_error = cfg.fail_open_on_error
+        self.prompt = PromptTemplate(self.prompt_template, PREFILTER_PROMPT_FIELDS)
+        self._bound_rules: Tuple[FilterRule, ...] = ()
+        self._bound_prompt: Optional[PromptTemplate] = None
+        self._prompt_lock = threading.Lock()
+        self.usage_totals = UsageTotals()
+        self.mode = cfg.mode
+        self.combined_prompt_file = cfg.combined_prompt_file
+        self.max_workers = cfg.max_workers
+        self.local_model_path = Path(cfg.local_model.model_path or DEFAULT_MODEL_PATH)
+        self.local_reject_below = cfg.local_model.reject_below
+        self.local_model = self._load_local_model() if cfg.local_model.enabled else None
+        # 复用 HTTP 连接池，常驻流水线中跨轮保持 keep-alive
+        self.session = requests.Session()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _load_local_model(self) -> Optional[RelevanceModel]:
+        if not self.local_model_path.exists():
+            logger.info("未找到本地相关性模型 %s，全部新闻交由 AI 预过滤。", self.local_model_path)
+            return None
         try:
-            workers_val = int(workers_raw) if workers_raw is not None else 3
-        except (TypeError, ValueError):
-            workers_val = 3
-        self.max_workers = max(1, workers_val)
+            return RelevanceModel.load(self.local_model_path)
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning("加载本地相关性模型失败，已跳过: %s", exc)
+            return None
 
     def apply(
         self,
@@ -80,10 +94,22 @@ class AIPreFilter:
         active_rules = [rule for rule in rules if rule.enabled]
         if not active_rules:
             return list(records)
+        candidates, removed = self._local_screen(records)
+        evaluations = self._evaluate_batch(candidates, active_rules)
+        kept, rejected = self.apply_results(evaluations, len(candidates))
+        removed += rejected
+        if removed:
+            logger.info("AI 预过滤过滤 %d 条新闻，剩余 %d 条。", removed, len(kept))
+        return kept
+
+    def apply_results(
+        self,
+        evaluations: Sequence[Tuple[int, NewsRecord, Optional[PrefilterResult]]],
+        total: int,
+    ) -> Tuple[List[NewsRecord], int]:
+        """把判定结果写回 record.raw，返回 (保留的新闻, 剔除数量)。"""
         kept: List[NewsRecord] = []
         removed = 0
-        total = len(records)
-        evaluations = self._evaluate_batch(records, active_rules)
         for index, record, result in evaluations:
             if result is None:
                 if self.fail_open_on_error:
@@ -126,6 +152,10 @@ class AIPreFilter:
                 )
             else:
                 removed += 1
+                if isinstance(record.raw, dict):
+                    record.raw["_prefilter_relevant"] = False
+                    if result.reason:
+                        record.raw["_prefilter_reason"] = result.reason
                 logging.info(
                     "AI 预过滤 %d/%d 剔除: %s",
                     index,
@@ -139,28 +169,52 @@ class AIPreFilter:
                         record.title,
                         result.reason if result else "无返回",
                     )
-        if removed:
-            logger.info("AI 预过滤过滤 %d 条新闻，剩余 %d 条。", removed, len(kept))
-        return kept
+        return kept, removed
+
+    def _local_screen(self, records: Sequence[NewsRecord]) -> Tuple[List[NewsRecord], int]:
+        """本地模型高置信度判定无关的新闻直接剔除，其余交给远端模型。"""
+        if self.local_model is None:
+            return list(records), 0
+        forwarded: List[NewsRecord] = []
+        rejected = 0
+        for record in records:
+            score = self.local_model.predict_proba(relevance_text(record))
+            if isinstance(record.raw, dict):
+                record.raw["_prefilter_local_score"] = round(score, 4)
+            if score >= self.local_reject_below:
+                forwarded.append(record)
+                continue
+            rejected += 1
+            if isinstance(record.raw, dict):
+                record.raw["_prefilter_relevant"] = False
+                record.raw["_prefilter_local"] = True
+                record.raw["_prefilter_reason"] = f"本地模型判定无关 (score={score:.3f})"
+            if self.log_rejections:
+                logger.debug("本地模型剔除: %s - %s (score=%.3f)", record.source, record.title, score)
+        logger.info("本地相关性模型剔除 %d 条新闻，%d 条交由 AI 预过滤。", rejected, len(forwarded))
+        return forwarded, rejected
 
     def _evaluate_batch(
         self,
         records: Sequence[NewsRecord],
         active_rules: Sequence[FilterRule],
+        evaluator: Optional[Callable[[NewsRecord, Sequence[FilterRule]], Optional[PrefilterResult]]] = None,
+        max_workers: Optional[int] = None,
     ) -> List[Tuple[int, NewsRecord, Optional[PrefilterResult]]]:
         total = len(records)
         if total == 0:
             return []
-        max_workers = min(self.max_workers, total)
+        evaluate = evaluator or self._evaluate_record
+        max_workers = min(max_workers or self.max_workers, total)
         if max_workers <= 1:
             return [
-                (index, record, self._evaluate_record(record, active_rules))
+                (index, record, evaluate(record, active_rules))
                 for index, record in enumerate(records, 1)
             ]
         results: List[Tuple[int, NewsRecord, Optional[PrefilterResult]]] = []
         with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai-prefilter") as executor:
             future_map = {
-                executor.submit(self._evaluate_record, record, active_rules): (index, record)
+                executor.submit(evaluate, record, active_rules): (index, record)
                 for index, record in enumerate(records, 1)
             }
             for future in as_completed(future_map):
@@ -191,19 +245,22 @@ class AIPreFilter:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
+        stage = "AI 预过滤"
         try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=self.timeout,
-            )
+            with AI_REQUEST_SECONDS.time(stage=stage_label(stage)):
+                response = self.session.post(
+                    f"{self.base_url}/chat/completions",
+                    headers=headers,
+                    json=payload,
+                    timeout=self.timeout,
+                )
             response.raise_for_status()
         except requests.RequestException as exc:
             logger.warning("AI 预过滤请求失败: %s", exc)
+            AI_REQUEST_ERRORS.inc(stage=stage_label(stage), reason="request_error")
             return None
         data = response.json()
-        self._log_usage(data.get("usage"), record.title, stage="AI 预过滤")
+        self._log_usage(data.get("usage"), record.title, stage=stage)
         content = data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
         parsed = self._parse_ai_output(content)
         if not parsed:
@@ -213,6 +270,27 @@ class AIPreFilter:
         return PrefilterResult(bool(parsed.get("relevant")), matched, reason)
 
     def _render_prompt(self, record: NewsRecord, rules: Sequence[FilterRule]) -> str:
+        values = {
+            "title": record.title or "",
+            "summary": self._select_text(record),
+            "source": record.source or "",
+            "url": record.url or "",
+        }
+        return self._prompt_for(rules).render(values)
+
+    def _prompt_for(self, rules: Sequence[FilterRule]) -> PromptTemplate:
+        """规则 JSON 只在规则集变化时序列化一次，之后复用已绑定的模板。"""
+        with self._prompt_lock:
+            bound = self._bound_prompt
+            if bound is None or len(self._bound_rules) != len(rules) or any(
+                left is not right for left, right in zip(self._bound_rules, rules)
+            ):
+                bound = self.prompt.bind({"rules": self.rules_json(rules)})
+                self._bound_prompt = bound
+                self._bound_rules = tuple(rules)
+            return bound
+
+    def rules_json(self, rules: Sequence[FilterRule]) -> str:
         rules_payload = [
             {
                 "name": rule.name,
@@ -222,19 +300,7 @@ class AIPreFilter:
             }
             for rule in rules
         ]
-        rules_json = json.dumps(rules_payload, ensure_ascii=False, indent=2)
-        summary_text = self._select_text(record)
-        values = {
-            "title": record.title or "",
-            "summary": summary_text,
-            "rules": rules_json,
-            "source": record.source or "",
-            "url": record.url or "",
-        }
-        rendered = self.prompt_template
-        for key, value in values.items():
-            rendered = rendered.replace(f"{{{key}}}", value)
-        return rendered
+        return json.dumps(rules_payload, ensure_ascii=False, indent=2)
 
     def _select_text(self, record: NewsRecord) -> str:
         parts: List[str] = []
@@ -300,28 +366,18 @@ class AIPreFilter:
         return None
 
     def _log_usage(self, usage: Any, title: Optional[str], stage: str) -> None:
-        if not isinstance(usage, dict):
-            return
-
-        def _to_int(value: Any) -> Optional[int]:
-            try:
-                return int(value)
-            except (TypeError, ValueError):
-                return None
-
-        prompt = _to_int(usage.get("prompt_tokens"))
-        completion = _to_int(usage.get("completion_tokens"))
-        total = _to_int(usage.get("total_tokens"))
-        if total is None and prompt is not None and completion is not None:
-            total = prompt + completion
-        if all(v is None for v in (prompt, completion, total)):
+        stats = parse_usage(usage)
+        if stats.empty:
             return
+        self.usage_totals.add(stats)
+        record_usage(stats, stage)
         safe_title = (title or "").strip() or "未知标题"
         logger.info(
-            "[AI tokens] %s | %s | prompt=%s completion=%s total=%s",
+            "[AI tokens] %s | %s | prompt=%s completion=%s total=%s cached=%s",
             stage,
             safe_title,
-            prompt if prompt is not None else "-",
-            completion if completion is not None else "-",
-            total if total is not None else "-",
+            stats.prompt if stats.prompt is not None else "-",
+            stats.completion if stats.completion is not None else "-",
+            stats.total if stats.total is not None else "-",
+            stats.cached if stats.cached is not None else "-",
         )
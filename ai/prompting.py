@@ -0,0 +1,64 @@
+"""提示词模板预编译：一次切分为字面量/占位符片段，静态字段按运行绑定，逐条渲染只做拼接。"""
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable, List, Mapping, Optional, Tuple
+
+Segment = Tuple[bool, str]  # (是否为占位符, 字面量文本或占位符名)
+
+
+class PromptTemplate:
+    """只识别给定字段名的 `{name}` 占位符，模板中的 JSON 花括号保持原样。"""
+
+    def __init__(self, text: str, fields: Iterable[str], segments: Optional[List[Segment]] = None) -> None:
+        self.text = text
+        self.fields = tuple(fields)
+        self.segments: List[Segment] = segments if segments is not None else self._compile(text, self.fields)
+
+    @staticmethod
+    def _compile(text: str, fields: Tuple[str, ...]) -> List[Segment]:
+        if not fields:
+            return [(False, text)] if text else []
+        pattern = re.compile(r"\{(" + "|".join(re.escape(name) for name in fields) + r")\}")
+        segments: List[Segment] = []
+        cursor = 0
+        for match in pattern.finditer(text):
+            if match.start() > cursor:
+                segments.append((False, text[cursor : match.start()]))
+            segments.append((True, match.group(1)))
+            cursor = match.end()
+        if cursor < len(text):
+            segments.append((False, text[cursor:]))
+        return segments
+
+    @property
+    def placeholders(self) -> List[str]:
+        return [value for is_field, value in self.segments if is_field]
+
+    def bind(self, values: Mapping[str, Any]) -> "PromptTemplate":
+        """把整轮运行内不变的字段（规则 JSON、立场说明等）预先写入模板，并合并相邻字面量。"""
+        merged: List[Segment] = []
+        for is_field, value in self.segments:
+            if is_field and value in values:
+                is_field, value = False, str(values[value] or "")
+            if not is_field and merged and not merged[-1][0]:
+                merged[-1] = (False, merged[-1][1] + value)
+            elif is_field or value:
+                merged.append((is_field, value))
+        remaining = tuple(name for name in self.fields if name not in values)
+        return PromptTemplate(self.text, remaining, merged)
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        return "".join(
+            str(values.get(value) or "") if is_field else value
+            for is_field, value in self.segments
+        )
+
+    def static_prefix(self) -> str:
+        """第一个逐条变化的占位符之前的固定前缀，可被服务端提示词缓存复用。"""
+        prefix: List[str] = []
+        for is_field, value in self.segments:
+            if is_field:
+                break
+            prefix.append(value)
+        return "".join(prefix)
@@ -0,0 +1,292 @@
+"""AI 摘要任务的优先级队列：按规则、时效、来源与热度排序，未处理的新闻顺延到下一轮。"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import re
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from fetcher.base_fetcher import NewsRecord
+from utils.config_loader import DEFAULT_CONFIG_PATH
+from utils.settings import DEFAULT_QUEUE_WEIGHTS, AIQueueSettings, get_config
+from utils.time_utils import parse_datetime_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEIGHTS = DEFAULT_QUEUE_WEIGHTS
+_TITLE_STRIP_PATTERN = re.compile(r"[\W_]+", re.UNICODE)
+
+
+@dataclass
+class QueueItem:
+    record: NewsRecord
+    score: float
+    cluster_size: int = 1
+
+
+class AIWorkQueue:
+    """为 AI 摘要挑选优先处理的新闻，并把超出预算的新闻持久化到下一次调度。"""
+
+    def __init__(
+        self,
+        db_path: Path,
+        config_path: Optional[Path] = None,
+        *,
+        settings: Optional[AIQueueSettings] = None,
+    ) -> None:
+        cfg = settings or get_config(config_path or DEFAULT_CONFIG_PATH).ai.queue
+        self.enabled = cfg.enabled
+        self.token_budget = cfg.token_budget
+        self.time_budget_sec = cfg.time_budget_sec
+        self.recency_half_life_hours = cfg.recency_half_life_hours
+        self.cluster_threshold = cfg.cluster_threshold
+        self.max_age_hours = cfg.max_age_hours
+        self.chars_per_token = cfg.chars_per_token
+        self.completion_tokens = cfg.completion_tokens
+        self.weights = dict(cfg.weights)
+        self.source_weights = dict(cfg.source_weights)
+        self.db_path = db_path
+        if not db_path.parent.exists():
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ai_queue (
+                news_id TEXT PRIMARY KEY,
+                source TEXT,
+                title TEXT,
+                url TEXT,
+                score REAL,
+                attempts INTEGER DEFAULT 0,
+                record_json TEXT,
+                enqueued_at TEXT
+            )
+            """
+        )
+        self.conn.commit()
+        self.prune()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # ------------------------------------------------------------------ 持久化
+    def pending(self) -> List[NewsRecord]:
+        """读取上一轮顺延下来的新闻。"""
+
+        cur = self.conn.execute("SELECT record_json FROM ai_queue ORDER BY score DESC")
+        records: List[NewsRecord] = []
+        for (record_json,) in cur.fetchall():
+            record = self._decode_record(record_json)
+            if record is not None:
+                records.append(record)
+        return records
+
+    def merge_pending(self, records: Sequence[NewsRecord]) -> List[NewsRecord]:
+        """将顺延新闻并入本轮候选，按 URL/标题去重。"""
+
+        merged = list(records)
+        seen = {self._record_key(record) for record in merged}
+        carried = 0
+        for record in self.pending():
+            key = self._record_key(record)
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(record)
+            carried += 1
+        if carried:
+            logger.info("AI 队列顺延 %d 条上一轮未处理的新闻", carried)
+        return merged
+
+    def defer(self, items: Iterable[QueueItem]) -> None:
+        """保存本轮未处理的新闻，保留最初入队时间以便过期清理。"""
+
+        now = datetime.now(timezone.utc).isoformat()
+        count = 0
+        for item in items:
+            record = item.record
+            if isinstance(record.raw, dict):
+                record.raw.pop("_ai_deferred", None)
+            self.conn.execute(
+                """
+                INSERT INTO ai_queue (news_id, source, title, url, score, attempts, record_json, enqueued_at)
+                VALUES (?, ?, ?, ?, ?, 1, ?, ?)
+                ON CONFLICT(news_id) DO UPDATE SET
+                    score = excluded.score,
+                    attempts = ai_queue.attempts + 1,
+                    record_json = excluded.record_json
+                """,
+                (
+                    self._make_news_id(record),
+                    record.source,
+                    record.title,
+                    record.url,
+                    item.score,
+                    json.dumps(record.to_dict(), ensure_ascii=False, default=str),
+                    now,
+                ),
+            )
+            count += 1
+        self.conn.commit()
+        if count:
+            logger.info("AI 队列顺延 %d 条新闻到下一轮", count)
+
+    def complete(self, records: Iterable[NewsRecord]) -> None:
+        """移除已完成摘要的新闻。"""
+
+        ids = [(self._make_news_id(record),) for record in records]
+        if not ids:
+            return
+        self.conn.executemany("DELETE FROM ai_queue WHERE news_id = ?", ids)
+        self.conn.commit()
+
+    def prune(self) -> None:
+        if self.max_age_hours <= 0:
+            return
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=self.max_age_hours)
+        cur = self.conn.execute("DELETE FROM ai_queue WHERE enqueued_at < ?", (cutoff.isoformat(),))
+        if cur.rowcount:
+            logger.warning("AI 队列丢弃 %d 条超过 %.1f 小时仍未处理的新闻", cur.rowcount, self.max_age_hours)
+        self.conn.commit()
+
+    # ------------------------------------------------------------------ 排序与预算
+    def plan(
+        self,
+        records: Sequence[NewsRecord],
+        *,
+        max_items: Optional[int] = None,
+        estimate_tokens: Optional[Callable[[NewsRecord], int]] = None,
+        spent_items: int = 0,
+        spent_tokens: int = 0,
+    ) -> Tuple[List[QueueItem], List[QueueItem]]:
+        """按优先级排序，并在条数与 token 预算内挑选本轮处理的新闻。
+
+        spent_items / spent_tokens 为本轮已在合并模式中生成的摘要条数与预计 token，计入同一预算。"""
+
+        items = self.score(records)
+        selected: List[QueueItem] = []
+        leftovers: List[QueueItem] = []
+        used_tokens = spent_tokens
+        for item in items:
+            if max_items and max_items > 0 and spent_items + len(selected) >= max_items:
+                leftovers.append(item)
+                continue
+            cost = self._estimate_cost(item.record, estimate_tokens)
+            if self.token_budget > 0 and (selected or spent_items) and used_tokens + cost > self.token_budget:
+                leftovers.append(item)
+                continue
+            used_tokens += cost
+            selected.append(item)
+        if leftovers:
+            logger.info(
+                "AI 队列本轮处理 %d 条（预计 %d tokens），顺延 %d 条",
+                len(selected),
+                used_tokens,
+                len(leftovers),
+            )
+        return selected, leftovers
+
+    def score(self, records: Sequence[NewsRecord]) -> List[QueueItem]:
+        """计算优先级分数，返回按分数从高到低排序的列表（同分保持原顺序）。"""
+
+        cluster_sizes = self._cluster_sizes(records)
+        now = datetime.now(timezone.utc)
+        items: List[QueueItem] = []
+        for record, cluster_size in zip(records, cluster_sizes):
+            base = (
+                self.weights["rule"] * self._rule_score(record)
+                + self.weights["recency"] * self._recency_score(record, now)
+                + self.weights["cluster"] * self._cluster_score(cluster_size)
+            )
+            score = round(base * self.source_weights.get(record.source, 1.0), 6)
+            if isinstance(record.raw, dict):
+                record.raw["_ai_priority"] = score
+            items.append(QueueItem(record=record, score=score, cluster_size=cluster_size))
+        order = sorted(range(len(items)), key=lambda idx: (-items[idx].score, idx))
+        return [items[idx] for idx in order]
+
+    def _rule_score(self, record: NewsRecord) -> float:
+        raw = record.raw if isinstance(record.raw, dict) else {}
+        index = raw.get("_matched_rule_index")
+        if not isinstance(index, int) or index < 0:
+            return 0.0
+        return 1.0 / (1 + index)
+
+    def _recency_score(self, record: NewsRecord, now: datetime) -> float:
+        published = record.published_utc or parse_datetime_string(record.published_at)
+        if published is None:
+            return 0.0
+        age_hours = max(0.0, (now - published).total_seconds() / 3600)
+        return 0.5 ** (age_hours / self.recency_half_life_hours)
+
+    def _cluster_score(self, cluster_size: int) -> float:
+        if cluster_size <= 1:
+            return 0.0
+        return min(1.0, math.log2(cluster_size) / 3)
+
+    def _cluster_sizes(self, records: Sequence[NewsRecord]) -> List[int]:
+        """按标题三元组的 Jaccard 相似度做贪心聚类，返回每条新闻所在簇的大小。"""
+
+        shingles = [self._title_shingles(record.title) for record in records]
+        cluster_of: List[int] = []
+        representatives: List[Set[str]] = []
+        sizes: List[int] = []
+        for grams in shingles:
+            assigned = -1
+            if grams:
+                for idx, rep in enumerate(representatives):
+                    if rep and self._jaccard(grams, rep) >= self.cluster_threshold:
+                        assigned = idx
+                        break
+            if assigned < 0:
+                representatives.append(grams)
+                sizes.append(0)
+                assigned = len(representatives) - 1
+            sizes[assigned] += 1
+            cluster_of.append(assigned)
+        return [sizes[idx] for idx in cluster_of]
+
+    def _title_shingles(self, title: Optional[str]) -> Set[str]:
+        text = _TITLE_STRIP_PATTERN.sub("", (title or "").lower())
+        if len(text) < 3:
+            return {text} if text else set()
+        return {text[idx : idx + 3] for idx in range(len(text) - 2)}
+
+    def _jaccard(self, left: Set[str], right: Set[str]) -> float:
+        union = len(left | right)
+        return len(left & right) / union if union else 0.0
+
+    def _estimate_cost(self, record: NewsRecord, estimate_tokens: Optional[Callable[[NewsRecord], int]]) -> int:
+        if estimate_tokens is not None:
+            try:
+                return max(0, int(estimate_tokens(record)))
+            except Exception:  # noqa: BLE001
+                logger.debug("估算 token 失败，改用正文长度: %s", record.title)
+        text_len = len(record.title or "") + len(record.summary or "")
+        if isinstance(record.raw, dict):
+            text_len += len(str(record.raw.get("content_text") or ""))
+        return int(text_len / self.chars_per_token) + self.completion_tokens
+
+    # ------------------------------------------------------------------ 工具
+    def _record_key(self, record: NewsRecord) -> str:
+        return record.url or f"{record.source}-{record.title}"
+
+    def _make_news_id(self, record: NewsRecord) -> str:
+        base = self._record_key(record) or repr(record)
+        return hashlib.sha1(base.encode("utf-8")).hexdigest()
+
+    def _decode_record(self, record_json: Optional[str]) -> Optional[NewsRecord]:
+        if not record_json:
+            return None
+        try:
+            data: Dict[str, Any] = json.loads(record_json)
+            return NewsRecord(**data)
+        except (TypeError, ValueError) as exc:
+            logger.warning("AI 队列记录解析失败，已忽略: %s", exc)
+            return None
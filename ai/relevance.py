@@ -0,0 +1,267 @@
+"""本地轻量相关性模型：哈希 n-gram + TF-IDF + 逻辑回归，仅依赖标准库，在远端预过滤前做初筛。"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import random
+import re
+import sqlite3
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fetcher.base_fetcher import NewsRecord
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = Path("state") / "relevance_model.json"
+DEFAULT_N_FEATURES = 1 << 18
+MAX_TEXT_CHARS = 1200
+
+_LATIN_PATTERN = re.compile(r"[a-z0-9]+")
+_CJK_PATTERN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]+")
+
+
+def relevance_text(record: NewsRecord, max_chars: int = MAX_TEXT_CHARS) -> str:
+    """训练与推理共用的文本拼接方式：标题 + 摘要 + 正文开头。"""
+
+    raw = record.raw if isinstance(record.raw, dict) else {}
+    parts = [record.title or "", record.summary or "", str(raw.get("content_text") or raw.get("description") or "")]
+    text = "\n".join(part for part in parts if part)
+    return text[:max_chars]
+
+
+def extract_ngrams(text: str) -> List[str]:
+    """英文取单词 1/2-gram，中日韩文字取字符 2/3-gram。"""
+
+    lowered = (text or "").lower()
+    grams: List[str] = []
+    words = _LATIN_PATTERN.findall(lowered)
+    grams.extend(f"w:{word}" for word in words)
+    grams.extend(f"b:{left} {right}" for left, right in zip(words, words[1:]))
+    for run in _CJK_PATTERN.findall(lowered):
+        for size in (2, 3):
+            grams.extend(f"c:{run[idx : idx + size]}" for idx in range(len(run) - size + 1))
+        if len(run) == 1:
+            grams.append(f"c:{run}")
+    return grams
+
+
+@dataclass
+class LabeledSample:
+    text: str
+    relevant: bool
+
+
+@dataclass
+class EvaluationReport:
+    total: int
+    positives: int
+    accuracy: float
+    auto_rejected: int
+    false_rejects: int
+    negatives_rejected_ratio: float
+    forwarded_ratio: float
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "total": self.total,
+            "positives": self.positives,
+            "accuracy": round(self.accuracy, 4),
+            "auto_rejected": self.auto_rejected,
+            "false_rejects": self.false_rejects,
+            "negatives_rejected_ratio": round(self.negatives_rejected_ratio, 4),
+            "forwarded_ratio": round(self.forwarded_ratio, 4),
+        }
+
+
+class RelevanceModel:
+    """哈希特征的 L2 归一化 TF-IDF 逻辑回归。"""
+
+    def __init__(
+        self,
+        n_features: int = DEFAULT_N_FEATURES,
+        weights: Optional[Dict[int, float]] = None,
+        bias: float = 0.0,
+        idf: Optional[Dict[int, float]] = None,
+        default_idf: float = 1.0,
+    ) -> None:
+        self.n_features = n_features
+        self.weights: Dict[int, float] = weights or {}
+        self.bias = bias
+        self.idf: Dict[int, float] = idf or {}
+        self.default_idf = default_idf
+
+    # ------------------------------------------------------------------ 特征
+    def _hashed_counts(self, text: str) -> Counter:
+        counts: Counter = Counter()
+        for gram in extract_ngrams(text):
+            counts[zlib.crc32(gram.encode("utf-8")) % self.n_features] += 1
+        return counts
+
+    def vectorize(self, text: str) -> Dict[int, float]:
+        counts = self._hashed_counts(text)
+        vector = {
+            index: (1.0 + math.log(count)) * self.idf.get(index, self.default_idf)
+            for index, count in counts.items()
+        }
+        norm = math.sqrt(sum(value * value for value in vector.values()))
+        if norm > 0:
+            for index in vector:
+                vector[index] /= norm
+        return vector
+
+    # ------------------------------------------------------------------ 推理
+    def predict_proba(self, text: str) -> float:
+        vector = self.vectorize(text)
+        return self._sigmoid(self.bias + sum(self.weights.get(idx, 0.0) * value for idx, value in vector.items()))
+
+    def _sigmoid(self, value: float) -> float:
+        if value >= 0:
+            return 1.0 / (1.0 + math.exp(-value))
+        exp = math.exp(value)
+        return exp / (1.0 + exp)
+
+    # ------------------------------------------------------------------ 训练
+    @classmethod
+    def train(
+        cls,
+        samples: Sequence[LabeledSample],
+        *,
+        n_features: int = DEFAULT_N_FEATURES,
+        epochs: int = 8,
+        learning_rate: float = 0.5,
+        l2: float = 1e-5,
+        seed: int = 13,
+    ) -> "RelevanceModel":
+        """使用带类别权重的 SGD 训练逻辑回归。"""
+
+        model = cls(n_features=n_features)
+        if not samples:
+            return model
+        doc_freq: Counter = Counter()
+        for sample in samples:
+            doc_freq.update(model._hashed_counts(sample.text).keys())
+        total = len(samples)
+        model.idf = {index: math.log((1 + total) / (1 + df)) + 1.0 for index, df in doc_freq.items()}
+        model.default_idf = math.log(1 + total) + 1.0
+        vectors = [(model.vectorize(sample.text), 1.0 if sample.relevant else 0.0) for sample in samples]
+        positives = sum(1 for _, label in vectors if label)
+        negatives = total - positives
+        pos_weight = total / (2.0 * positives) if positives else 1.0
+        neg_weight = total / (2.0 * negatives) if negatives else 1.0
+        prior = (positives + 1.0) / (total + 2.0)
+        model.bias = math.log(prior / (1.0 - prior))
+        rng = random.Random(seed)
+        order = list(range(total))
+        for epoch in range(epochs):
+            rng.shuffle(order)
+            rate = learning_rate / (1.0 + epoch)
+            for idx in order:
+                vector, label = vectors[idx]
+                margin = model.bias + sum(model.weights.get(i, 0.0) * v for i, v in vector.items())
+                error = (model._sigmoid(margin) - label) * (pos_weight if label else neg_weight)
+                model.bias -= rate * error
+                for index, value in vector.items():
+                    weight = model.weights.get(index, 0.0)
+                    model.weights[index] = weight - rate * (error * value + l2 * weight)
+        return model
+
+    # ------------------------------------------------------------------ 持久化
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": 1,
+            "n_features": self.n_features,
+            "bias": self.bias,
+            "default_idf": self.default_idf,
+            "weights": {str(idx): round(value, 6) for idx, value in self.weights.items() if abs(value) > 1e-6},
+            "idf": {str(idx): round(value, 4) for idx, value in self.idf.items()},
+        }
+        path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> "RelevanceModel":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(
+            n_features=int(data.get("n_features", DEFAULT_N_FEATURES)),
+            weights={int(idx): float(value) for idx, value in (data.get("weights") or {}).items()},
+            bias=float(data.get("bias", 0.0)),
+            idf={int(idx): float(value) for idx, value in (data.get("idf") or {}).items()},
+            default_idf=float(data.get("default_idf", 1.0)),
+        )
+
+
+def evaluate(model: RelevanceModel, samples: Iterable[LabeledSample], reject_below: float) -> EvaluationReport:
+    """统计本地模型在给定阈值下自动拒绝的比例与误拒数。"""
+
+    total = positives = correct = auto_rejected = false_rejects = negatives = negatives_rejected = 0
+    for sample in samples:
+        total += 1
+        proba = model.predict_proba(sample.text)
+        predicted = proba >= 0.5
+        correct += int(predicted == sample.relevant)
+        if sample.relevant:
+            positives += 1
+        else:
+            negatives += 1
+        if proba < reject_below:
+            auto_rejected += 1
+            if sample.relevant:
+                false_rejects += 1
+            else:
+                negatives_rejected += 1
+    return EvaluationReport(
+        total=total,
+        positives=positives,
+        accuracy=correct / total if total else 0.0,
+        auto_rejected=auto_rejected,
+        false_rejects=false_rejects,
+        negatives_rejected_ratio=negatives_rejected / negatives if negatives else 0.0,
+        forwarded_ratio=(total - auto_rejected) / total if total else 0.0,
+    )
+
+
+def load_training_samples(db_path: Path) -> List[LabeledSample]:
+    """读取 news.db 中远端预过滤的历史判定（按时间升序）。"""
+
+    if not db_path.exists():
+        return []
+    conn = sqlite3.connect(str(db_path))
+    samples: List[Tuple[str, str, bool]] = []
+    seen: set[str] = set()
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if "prefilter_verdicts" in tables:
+            cur = conn.execute(
+                "SELECT url, text, relevant, created_at FROM prefilter_verdicts WHERE origin = 'llm' ORDER BY id"
+            )
+            for url, text, relevant, created_at in cur.fetchall():
+                key = url or text
+                if not text or key in seen:
+                    continue
+                seen.add(key)
+                samples.append((created_at or "", text, bool(relevant)))
+        if "news_records" in tables:
+            cur = conn.execute("SELECT source, title, url, summary, raw_json, created_at FROM news_records ORDER BY id")
+            for source, title, url, summary, raw_json, created_at in cur.fetchall():
+                try:
+                    raw = json.loads(raw_json or "{}")
+                except ValueError:
+                    continue
+                verdict = raw.get("_prefilter_relevant") if isinstance(raw, dict) else None
+                if verdict is None or raw.get("_prefilter_error") or raw.get("_prefilter_local"):
+                    continue
+                key = url or f"{source}-{title}"
+                if key in seen:
+                    continue
+                seen.add(key)
+                record = NewsRecord(source=source or "", title=title or "", url=url or "", summary=summary, raw=raw)
+                samples.append((created_at or "", relevance_text(record), bool(verdict)))
+    finally:
+        conn.close()
+    samples.sort(key=lambda item: item[0])
+    return [LabeledSample(text=text, relevant=relevant) for _, text, relevant in samples]
@@ -0,0 +1,97 @@
+"""解析 OpenAI 兼容接口返回的 usage 字段（含提示词缓存命中数），并汇总为运行指标。"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from utils.metrics import REGISTRY
+
+# 日志中的阶段名 -> 指标的 stage 标签
+STAGE_LABELS: Dict[str, str] = {"AI 预过滤": "prefilter", "AI 摘要": "summary", "AI 预过滤+摘要": "combined"}
+
+AI_REQUEST_SECONDS = REGISTRY.histogram("radarflow_ai_request_duration_seconds", "AI 接口单次请求耗时", ("stage",))
+AI_REQUEST_ERRORS = REGISTRY.counter("radarflow_ai_request_errors_total", "AI 接口请求失败次数", ("stage", "reason"))
+AI_TOKENS = REGISTRY.counter("radarflow_ai_tokens_total", "AI 接口返回的 token 用量", ("stage", "kind"))
+
+
+def _to_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class UsageStats:
+    prompt: Optional[int] = None
+    completion: Optional[int] = None
+    total: Optional[int] = None
+    cached: Optional[int] = None
+
+    @property
+    def empty(self) -> bool:
+        return all(value is None for value in (self.prompt, self.completion, self.total))
+
+
+def parse_usage(usage: Any) -> UsageStats:
+    """兼容 OpenAI(prompt_tokens_details.cached_tokens)、DeepSeek(prompt_cache_hit_tokens) 等格式。"""
+    if not isinstance(usage, dict):
+        return UsageStats()
+    prompt = _to_int(usage.get("prompt_tokens"))
+    completion = _to_int(usage.get("completion_tokens"))
+    total = _to_int(usage.get("total_tokens"))
+    if total is None and prompt is not None and completion is not None:
+        total = prompt + completion
+    cached = None
+    details = usage.get("prompt_tokens_details")
+    if isinstance(details, dict):
+        cached = _to_int(details.get("cached_tokens"))
+    if cached is None:
+        cached = _to_int(usage.get("prompt_cache_hit_tokens"))
+    if cached is None:
+        cached = _to_int(usage.get("cache_read_input_tokens"))
+    return UsageStats(prompt=prompt, completion=completion, total=total, cached=cached)
+
+
+def stage_label(stage: str) -> str:
+    return STAGE_LABELS.get(stage, stage)
+
+
+def record_usage(stats: UsageStats, stage: str) -> None:
+    """把单次调用的 token 用量累加到 radarflow_ai_tokens_total。"""
+    label = stage_label(stage)
+    for kind, value in (("prompt", stats.prompt), ("completion", stats.completion), ("cached", stats.cached)):
+        if value:
+            AI_TOKENS.inc(value, stage=label, kind=kind)
+
+
+class UsageTotals:
+    """线程安全地累计单次运行内的 token 用量。"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt = 0
+        self.completion = 0
+        self.cached = 0
+
+    def add(self, stats: UsageStats) -> None:
+        if stats.empty:
+            return
+        with self._lock:
+            self.calls += 1
+            self.prompt += stats.prompt or 0
+            self.completion += stats.completion or 0
+            self.cached += stats.cached or 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            hit_rate = self.cached / self.prompt if self.prompt else 0.0
+            return {
+                "calls": self.calls,
+                "prompt": self.prompt,
+                "completion": self.completion,
+                "cached": self.cached,
+                "cache_hit_rate": round(hit_rate, 4),
+            }
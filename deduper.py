@@ -8,6 +8,15 @@ from pathlib import Path
 from typing import Iterable, List, Optional
 
 from fetcher.base_fetcher import NewsRecord
+from utils.metrics import REGISTRY
+
+DEDUP_SECONDS = REGISTRY.histogram("radarflow_dedup_duration_seconds", "去重库操作耗时", ("op",))
+DEDUP_RECORDS = REGISTRY.counter("radarflow_dedup_records_total", "去重结果：new 为新增，seen 为已处理过", ("result",))
+
+
+def make_news_id(record: NewsRecord) -> str:
+    base = record.url or f"{record.source}-{record.title}" or repr(record)
+    return hashlib.sha1(base.encode("utf-8")).hexdigest()
 
 
 class SQLiteDeduper:
@@ -18,7 +27,7 @@ class SQLiteDeduper:
         self.retention_days = retention_days
         if not db_path.parent.exists():
             db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(str(db_path))
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
         self.conn.execute(
             """
             CREATE TABLE IF NOT EXISTS processed_articles (
@@ -37,8 +46,7 @@ class SQLiteDeduper:
         self.conn.close()
 
     def _make_news_id(self, record: NewsRecord) -> str:
-        base = record.url or f"{record.source}-{record.title}" or repr(record)
-        return hashlib.sha1(base.encode("utf-8")).hexdigest()
+        return make_news_id(record)
 
     def is_seen(self, record: NewsRecord) -> bool:
         news_id = self._make_news_id(record)
@@ -48,14 +56,17 @@ class SQLiteDeduper:
         return cur.fetchone() is not None
 
     def mark(self, record: NewsRecord) -> None:
-        news_id = self._make_news_id(record)
+        with DEDUP_SECONDS.time(op="mark"):
+            self.mark_id(self._make_news_id(record), record.source, record.title, record.url)
+
+    def mark_id(self, news_id: str, source: Optional[str], title: Optional[str], url: Optional[str]) -> None:
         self.conn.execute(
             "INSERT OR REPLACE INTO processed_articles (news_id, source, title, url, processed_at) VALUES (?, ?, ?, ?, ?)",
             (
                 news_id,
-                record.source,
-                record.title,
-                record.url,
+                source,
+                title,
+                url,
                 datetime.now(timezone.utc).isoformat(),
             ),
         )
@@ -63,9 +74,15 @@ class SQLiteDeduper:
 
     def filter_new(self, records: Iterable[NewsRecord]) -> List[NewsRecord]:
         fresh: List[NewsRecord] = []
-        for record in records:
-            if not self.is_seen(record):
-                fresh.append(record)
+        seen = 0
+        with DEDUP_SECONDS.time(op="filter_new"):
+            for record in records:
+                if self.is_seen(record):
+                    seen += 1
+                else:
+                    fresh.append(record)
+        DEDUP_RECORDS.inc(len(fresh), result="new")
+        DEDUP_RECORDS.inc(seen, result="seen")
         return fresh
 
     def prune(self) -> None:
@@ -1,16 +1,10 @@
 """Fetcher 层公共出口。"""
 
-from .aggregator import collect_news
+from typing import Any
+
+from .aggregator import AVAILABLE_FETCHERS, collect_news
 from .base_fetcher import BaseNewsFetcher, NewsRecord
-from .thepaper_handpick import ThePaperHandpickFetcher
-from .zaobao_realtime import ZaobaoRealtimeFetcher
-from .bbc_news import BBCNewsFetcher
-from .asahi import AsahiNewsFetcher
-from .voachinese import VOAChineseNewsFetcher
-from .rfi import RFINewsFetcher
-from .yna import YNAFetcher
-from .cna import CNAFetcher
-from .ltn import LTNFetcher
+from .registry import FETCHER_MODULES, load_fetcher
 
 __all__ = [
     "BaseNewsFetcher",
@@ -24,5 +18,14 @@ __all__ = [
     "YNAFetcher",
     "CNAFetcher",
     "LTNFetcher",
+    "AVAILABLE_FETCHERS",
     "collect_news",
+    "load_fetcher",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # 抓取器类按需导入，例如 from fetcher import BBCNewsFetcher
+    if name in FETCHER_MODULES:
+        return load_fetcher(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,7 +3,6 @@ from __future__ import annotations
 
 import json
 import logging
-from datetime import datetime
 from typing import Any, Dict, Iterable, List, Optional
 from urllib.parse import urljoin
 
@@ -11,6 +10,7 @@ import requests
 from bs4 import BeautifulSoup, Tag
 
 from .base_fetcher import BaseNewsFetcher, NewsRecord
+from utils.time_utils import to_utc_iso
 
 logger = logging.getLogger(__name__)
 
@@ -283,11 +283,7 @@ class AbsCbnNewsFetcher(BaseNewsFetcher):
         return urljoin(IMAGE_BASE, image.lstrip("/"))
 
     def _normalize_datetime(self, value: str) -> Optional[str]:
-        try:
-            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
-        except ValueError:
-            return None
-        return dt.isoformat()
+        return to_utc_iso(value, self.name)
 
     def _clean_text(self, text: Optional[str]) -> Optional[str]:
         if not text:
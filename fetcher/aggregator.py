@@ -2,109 +2,134 @@
 from __future__ import annotations
 
 import logging
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Iterable, List, Sequence, Type
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type
+
+from utils.metrics import REGISTRY
+from utils.settings import get_config
+from utils.timestamps import normalize_timestamp
 
-from .rfi import RFINewsFetcher
 from .base_fetcher import BaseNewsFetcher, NewsRecord
-from .yahoo_news import YahooNewsFetcher
-from .huanqiu import HuanqiuNewsFetcher
-from .dailymail import DailyMailNewsFetcher
-
-from .zaobao_realtime import ZaobaoRealtimeFetcher
-from .thepaper_handpick import ThePaperHandpickFetcher
-from .bbc_news import BBCNewsFetcher
-from .bbc_zhongwen_news import BBCZhongwenNewsFetcher
-from .asahi import AsahiNewsFetcher
-from .voachinese import VOAChineseNewsFetcher
-from .yna import YNAFetcher
-from .cna import CNAFetcher
-from .ltn import LTNFetcher
-from .aljazeera import AlJazeeraNewsFetcher
-from .theguardian import TheGuardianNewsFetcher
-from .abs_cbn import AbsCbnNewsFetcher
-from .vnexpress import VnExpressNewsFetcher
-from .scmp import SCMPNewsFetcher
-from .eightworld import EightWorldNewsFetcher
+from .registry import FetcherRegistry, load_fetchers
+from .sources import SourceConfig
 
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_MAX_WORKERS = 6
 
-# 默认启用的抓取器列表，后续想扩展只需添加新类
-DEFAULT_FETCHER_CLASSES: Sequence[Type[BaseNewsFetcher]] = [
+FETCH_SECONDS = REGISTRY.histogram(
+    "radarflow_fetch_duration_seconds", "抓取耗时：phase=list 为列表页，detail 为单条详情页", ("source", "phase")
+)
+FETCH_RECORDS = REGISTRY.counter("radarflow_fetch_records_total", "各新闻源抓取到的新闻条数", ("source",))
+FETCH_ERRORS = REGISTRY.counter("radarflow_fetch_errors_total", "抓取失败次数", ("source", "phase"))
+COLLECT_SECONDS = REGISTRY.histogram("radarflow_collect_duration_seconds", "collect_news 并发抓取全部新闻源的总耗时")
+
+# 默认启用的抓取器（类名）；config.yaml 中配置了 sources 段时以配置为准。模块在首次使用时才导入
+DEFAULT_FETCHER_NAMES: Sequence[str] = [
     # # 澎湃新闻
-    # ThePaperHandpickFetcher,
+    # "ThePaperHandpickFetcher",
     #
     # # 联合早报
-    # ZaobaoRealtimeFetcher,
+    # "ZaobaoRealtimeFetcher",
 
     # BBC
-    BBCNewsFetcher,
+    "BBCNewsFetcher",
 
     # BBC 中文
-    BBCZhongwenNewsFetcher,
+    "BBCZhongwenNewsFetcher",
 
     # # 朝日新闻
-    # AsahiNewsFetcher,
+    # "AsahiNewsFetcher",
     #
     # # 美国之音（中文）
-    # VOAChineseNewsFetcher,
+    # "VOAChineseNewsFetcher",
     #
     # # 韩联社
-    # YNAFetcher,
+    # "YNAFetcher",
     #
     # # 台湾中央社
-    # CNAFetcher,
+    # "CNAFetcher",
     #
     # # 台灣自由時報
-    # LTNFetcher,
+    # "LTNFetcher",
     #
     # # 环球网
-    # HuanqiuNewsFetcher,
+    # "HuanqiuNewsFetcher",
     #
     # # 英国每日邮报
-    # DailyMailNewsFetcher,
+    # "DailyMailNewsFetcher",
     #
     # # 半岛电视台
-    # AlJazeeraNewsFetcher,
+    # "AlJazeeraNewsFetcher",
     #
     # # 英国卫报
-    # TheGuardianNewsFetcher,
+    # "TheGuardianNewsFetcher",
     #
     # # ABS-CBN
-    # AbsCbnNewsFetcher,
+    # "AbsCbnNewsFetcher",
     #
     # # 越南 VnExpress
-    # VnExpressNewsFetcher,
+    # "VnExpressNewsFetcher",
     #
     # # 8视界世界
-    # EightWorldNewsFetcher,
+    # "EightWorldNewsFetcher",
     #
     # # 法国国家电视台
-    # RFINewsFetcher,
+    # "RFINewsFetcher",
     #
     # # 南华早报
-    # SCMPNewsFetcher,
+    # "SCMPNewsFetcher",
 
 ]
 
 
+# 按类名索引全部可用抓取器，供调度器按名称为单个新闻源配置独立的抓取频率；取值时才导入模块
+AVAILABLE_FETCHERS: FetcherRegistry = FetcherRegistry()
+
+
+def default_fetcher_classes(sources: Optional[SourceConfig] = None) -> List[Type[BaseNewsFetcher]]:
+    sources = sources if sources is not None else SourceConfig(get_config())
+    return load_fetchers(sources.enabled_names(DEFAULT_FETCHER_NAMES))
+
+
+def __getattr__(name: str) -> Any:
+    # DEFAULT_FETCHER_CLASSES 延迟到首次访问时才导入默认抓取器
+    if name == "DEFAULT_FETCHER_CLASSES":
+        return default_fetcher_classes()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def collect_news(
-    fetcher_classes: Iterable[Type[BaseNewsFetcher]] = DEFAULT_FETCHER_CLASSES,
+    fetcher_classes: Optional[Iterable[Type[BaseNewsFetcher]]] = None,
     max_workers: int | None = None,
+    *,
+    instances: Optional[Dict[Type[BaseNewsFetcher], BaseNewsFetcher]] = None,
+    sources: Optional[SourceConfig] = None,
 ) -> List[NewsRecord]:
-    """并发调用各个抓取器，合并为统一的新闻列表。"""
+    """并发调用各个抓取器，合并为统一的新闻列表。
 
-    fetcher_list = list(fetcher_classes)
+    传入 instances 时复用其中的抓取器实例（及其 HTTP 会话），新建的实例也会写回。
+    sources 决定构造参数、超时、详情并发与提交顺序，默认读取 config.yaml。"""
+
+    sources = sources if sources is not None else SourceConfig(get_config())
+    if fetcher_classes is None:
+        fetcher_list = default_fetcher_classes(sources)
+    else:
+        # 线程池满时优先级高的新闻源先开始
+        fetcher_list = sorted(fetcher_classes, key=lambda cls: -sources.spec(cls.__name__).priority)
     if not fetcher_list:
         return []
-    worker_count = max_workers or min(DEFAULT_MAX_WORKERS, len(fetcher_list))
+    worker_count = max_workers or sources.max_workers or min(DEFAULT_MAX_WORKERS, len(fetcher_list))
 
     news: List[NewsRecord] = []
+    started = time.perf_counter()
     with ThreadPoolExecutor(max_workers=worker_count) as executor:
-        future_map = {executor.submit(_run_fetcher_task, fetcher_cls): fetcher_cls for fetcher_cls in fetcher_list}
+        future_map = {
+            executor.submit(_run_fetcher_task, fetcher_cls, instances, sources): fetcher_cls
+            for fetcher_cls in fetcher_list
+        }
         for future in as_completed(future_map):
             fetcher_cls = future_map[future]
             try:
@@ -113,29 +138,74 @@ def collect_news(
                 logger.exception("聚合线程 %s 失败: %s", fetcher_cls.__name__, exc)
                 continue
             news.extend(records)
+    COLLECT_SECONDS.observe(time.perf_counter() - started)
     return news
 
 
-def _run_fetcher_task(fetcher_cls: Type[BaseNewsFetcher]) -> List[NewsRecord]:
+def _run_fetcher_task(
+    fetcher_cls: Type[BaseNewsFetcher],
+    instances: Optional[Dict[Type[BaseNewsFetcher], BaseNewsFetcher]] = None,
+    sources: Optional[SourceConfig] = None,
+) -> List[NewsRecord]:
     """在线程池中运行单个抓取器，返回该抓取器的全部新闻记录。"""
 
-    fetcher = fetcher_cls()
+    sources = sources if sources is not None else SourceConfig()
+    name = fetcher_cls.__name__
+    fetcher = instances.get(fetcher_cls) if instances is not None else None
+    if fetcher is None:
+        try:
+            fetcher = sources.create(fetcher_cls)
+        except TypeError as exc:
+            logger.error("新闻源 %s 的 params 与构造函数不匹配: %s", name, exc)
+            FETCH_ERRORS.inc(source=name, phase="init")
+            return []
+        if instances is not None:
+            instances[fetcher_cls] = fetcher
     try:
-        logger.info("开始抓取 %s", fetcher_cls.__name__)
-        records = fetcher.get_news_list()
-        logger.info("%s 返回 %d 条记录", fetcher_cls.__name__, len(records))
+        logger.info("开始抓取 %s", name)
+        with FETCH_SECONDS.time(source=name, phase="list"):
+            records = fetcher.get_news_list()
+        logger.info("%s 返回 %d 条记录", name, len(records))
     except Exception as exc:  # noqa: BLE001
-        logger.exception("抓取器 %s 执行失败: %s", fetcher_cls.__name__, exc)
+        logger.exception("抓取器 %s 执行失败: %s", name, exc)
+        FETCH_ERRORS.inc(source=name, phase="list")
+        if instances is not None:
+            # 丢弃可能处于异常状态的实例，下一轮重新创建
+            instances.pop(fetcher_cls, None)
         return []
 
-    enriched: List[NewsRecord] = []
-    for record in records:
-        try:
+    FETCH_RECORDS.inc(len(records), source=name)
+    concurrency = min(sources.spec(name).concurrency, len(records))
+    if concurrency <= 1:
+        return [_fetch_detail(fetcher, record) for record in records]
+    # 详情页彼此独立，按 sources.<name>.concurrency 并发请求，结果保持列表顺序
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(lambda record: _fetch_detail(fetcher, record), records))
+
+
+def _fetch_detail(fetcher: BaseNewsFetcher, record: NewsRecord) -> NewsRecord:
+    name = type(fetcher).__name__
+    try:
+        with FETCH_SECONDS.time(source=name, phase="detail"):
             detail = fetcher.get_news_detail(record)
-            if detail.raw.get("content_text"):
-                logger.debug("%s 详情解析成功: %s", fetcher_cls.__name__, record.title)
-        except Exception as detail_exc:  # noqa: BLE001
-            logger.exception("抓取器 %s 解析详情失败: %s", fetcher_cls.__name__, detail_exc)
-            detail = record
-        enriched.append(detail)
-    return enriched
+        if detail.raw.get("content_text"):
+            logger.debug("%s 详情解析成功: %s", name, record.title)
+    except Exception as detail_exc:  # noqa: BLE001
+        logger.exception("抓取器 %s 解析详情失败: %s", name, detail_exc)
+        FETCH_ERRORS.inc(source=name, phase="detail")
+        detail = record
+    if isinstance(detail.raw, dict):
+        detail.raw["_fetcher"] = name
+    _normalize_published(detail, name)
+    return detail
+
+
+def _normalize_published(record: NewsRecord, source: str) -> None:
+    """抓取时解析一次发布时间：published_utc 保存 UTC 值，published_at 统一为 UTC ISO 字符串。"""
+    if record.published_utc is None:
+        record.published_utc = normalize_timestamp(record.published_at, source)
+    if record.published_utc is not None:
+        published = record.published_utc.isoformat()
+        if record.published_at and record.published_at != published and isinstance(record.raw, dict):
+            record.raw.setdefault("original_published_at", record.published_at)
+        record.published_at = published
@@ -3,7 +3,6 @@ from __future__ import annotations
 
 import json
 import logging
-from datetime import datetime
 from typing import Any, Dict, Iterable, List, Optional
 from urllib.parse import urljoin, urlparse
 
@@ -11,6 +10,7 @@ import requests
 from bs4 import BeautifulSoup, Tag
 
 from .base_fetcher import BaseNewsFetcher, NewsRecord
+from utils.time_utils import to_utc_iso
 
 logger = logging.getLogger(__name__)
 
@@ -267,14 +267,7 @@ class AlJazeeraNewsFetcher(BaseNewsFetcher):
         return None
 
     def _normalize_datetime(self, value: str) -> Optional[str]:
-        if not value:
-            return None
-        normalized = value.strip().replace("Z", "+00:00") if value.endswith("Z") else value.strip()
-        try:
-            dt = datetime.fromisoformat(normalized)
-        except ValueError:
-            return None
-        return dt.isoformat()
+        return to_utc_iso(value, self.name)
 
     def _text_or_none(self, node: Optional[Tag]) -> Optional[str]:
         if not node:
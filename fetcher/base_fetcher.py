@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, asdict, field
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 
@@ -17,10 +18,18 @@ class NewsRecord:
     published_at: Optional[str] = None
     authors: List[str] = field(default_factory=list)
     raw: Dict[str, Any] = None  # type: ignore[assignment]
+    # 抓取时由 published_at 解析出的 UTC 时间，下游直接使用而不再重复解析
+    published_utc: Optional[datetime] = None
 
     def __post_init__(self) -> None:
         if self.raw is None:
             self.raw = {}
+        if isinstance(self.published_utc, str):
+            # 从 JSON 还原的记录
+            try:
+                self.published_utc = datetime.fromisoformat(self.published_utc)
+            except ValueError:
+                self.published_utc = None
 
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
@@ -3,7 +3,6 @@ from __future__ import annotations
 
 import json
 import logging
-from datetime import datetime
 from typing import Any, Dict, List, Optional
 from urllib.parse import urljoin, urlparse
 
@@ -11,6 +10,7 @@ import requests
 from bs4 import BeautifulSoup, Tag
 
 from .base_fetcher import BaseNewsFetcher, NewsRecord
+from utils.time_utils import to_utc_iso
 
 logger = logging.getLogger(__name__)
 
@@ -204,12 +204,7 @@ class DailyMailNewsFetcher(BaseNewsFetcher):
         return self._normalize_datetime(datetime_attr)
 
     def _normalize_datetime(self, value: str) -> Optional[str]:
-        value = value.strip()
-        try:
-            dt = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
-        except ValueError:
-            return None
-        return dt.isoformat()
+        return to_utc_iso(value, self.name)
 
     def _normalize_author(self, text: str) -> str:
         cleaned = text.replace("By", "").replace("BY", "").strip(" :")
@@ -0,0 +1,71 @@
+"""按类名登记的抓取器注册表：模块在首次使用时才导入，避免启动时加载全部新闻源及其依赖。"""
+from __future__ import annotations
+
+import importlib
+import threading
+from typing import Dict, Iterator, List, Mapping, Sequence, Type
+
+from .base_fetcher import BaseNewsFetcher
+
+# 类名 -> fetcher 包内的模块名；新增新闻源只需在此登记
+FETCHER_MODULES: Dict[str, str] = {
+    "ThePaperHandpickFetcher": "thepaper_handpick",
+    "ZaobaoRealtimeFetcher": "zaobao_realtime",
+    "BBCNewsFetcher": "bbc_news",
+    "BBCZhongwenNewsFetcher": "bbc_zhongwen_news",
+    "AsahiNewsFetcher": "asahi",
+    "VOAChineseNewsFetcher": "voachinese",
+    "YNAFetcher": "yna",
+    "CNAFetcher": "cna",
+    "LTNFetcher": "ltn",
+    "HuanqiuNewsFetcher": "huanqiu",
+    "DailyMailNewsFetcher": "dailymail",
+    "AlJazeeraNewsFetcher": "aljazeera",
+    "TheGuardianNewsFetcher": "theguardian",
+    "AbsCbnNewsFetcher": "abs_cbn",
+    "VnExpressNewsFetcher": "vnexpress",
+    "EightWorldNewsFetcher": "eightworld",
+    "RFINewsFetcher": "rfi",
+    "SCMPNewsFetcher": "scmp",
+    "YahooNewsFetcher": "yahoo_news",
+}
+
+_LOADED: Dict[str, Type[BaseNewsFetcher]] = {}
+_LOCK = threading.Lock()
+
+
+def load_fetcher(name: str) -> Type[BaseNewsFetcher]:
+    """按类名导入抓取器；未登记的名称抛出 KeyError，缺少依赖时抛出 ImportError。"""
+
+    cached = _LOADED.get(name)
+    if cached is not None:
+        return cached
+    module_name = FETCHER_MODULES[name]
+    with _LOCK:
+        if name not in _LOADED:
+            module = importlib.import_module(f".{module_name}", __package__)
+            _LOADED[name] = getattr(module, name)
+    return _LOADED[name]
+
+
+def load_fetchers(names: Sequence[str]) -> List[Type[BaseNewsFetcher]]:
+    return [load_fetcher(name) for name in names]
+
+
+class FetcherRegistry(Mapping[str, Type[BaseNewsFetcher]]):
+    """只读映射：遍历与成员判断不触发导入，取值时才加载对应模块。"""
+
+    def __getitem__(self, name: str) -> Type[BaseNewsFetcher]:
+        return load_fetcher(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FETCHER_MODULES)
+
+    def __len__(self) -> int:
+        return len(FETCHER_MODULES)
+
+    def __contains__(self, name: object) -> bool:
+        return name in FETCHER_MODULES
+
+    def loaded(self) -> List[str]:
+        return sorted(_LOADED)
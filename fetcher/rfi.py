@@ -10,11 +10,6 @@ from urllib.parse import unquote, urljoin, urlparse
 import requests
 from bs4 import BeautifulSoup, Tag
 
-try:  # pragma: no cover
-    from playwright.sync_api import sync_playwright
-except ImportError:  # pragma: no cover
-    sync_playwright = None  # type: ignore[assignment]
-
 from .base_fetcher import BaseNewsFetcher, NewsRecord
 
 logger = logging.getLogger(__name__)
@@ -167,7 +162,10 @@ class RFINewsFetcher(BaseNewsFetcher):
             return self._fetch_with_playwright(url)
 
     def _fetch_with_playwright(self, url: str) -> Optional[str]:
-        if sync_playwright is None:
+        # Playwright 较重，只在普通请求失败、确实需要浏览器渲染时才导入
+        try:
+            from playwright.sync_api import sync_playwright
+        except ImportError:
             logger.warning("Playwright 未安装，无法抓取 RFI: %s", url)
             return None
         try:
@@ -3,7 +3,6 @@ from __future__ import annotations
 
 import json
 import logging
-from datetime import datetime, timezone
 from html import unescape
 from typing import Any, Dict, Iterable, List, Optional
 from urllib.parse import urljoin
@@ -12,6 +11,7 @@ import requests
 from bs4 import BeautifulSoup
 
 from .base_fetcher import BaseNewsFetcher, NewsRecord
+from utils.time_utils import to_utc_iso
 
 logger = logging.getLogger(__name__)
 
@@ -307,13 +307,4 @@ class SCMPNewsFetcher(BaseNewsFetcher):
         return cleaned or None
 
     def _normalize_timestamp(self, raw: Any) -> Optional[str]:
-        if isinstance(raw, (int, float)):
-            dt = datetime.fromtimestamp(raw / 1000, tz=timezone.utc)
-            return dt.isoformat()
-        if isinstance(raw, str):
-            try:
-                # Some API responses already return ISO 格式
-                return datetime.fromisoformat(raw).astimezone(timezone.utc).isoformat()
-            except ValueError:
-                return None
-        return None
+        return to_utc_iso(raw, self.name)
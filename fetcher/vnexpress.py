@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
 from typing import List, Optional
 from urllib.parse import urljoin
 
@@ -10,6 +9,7 @@ import requests
 from bs4 import BeautifulSoup, Tag
 
 from .base_fetcher import BaseNewsFetcher, NewsRecord
+from utils.time_utils import to_utc_iso
 
 logger = logging.getLogger(__name__)
 
@@ -151,11 +151,7 @@ class VnExpressNewsFetcher(BaseNewsFetcher):
         return "\n\n".join(paragraphs).strip() if paragraphs else None
 
     def _normalize_datetime(self, value: str) -> Optional[str]:
-        try:
-            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
-        except ValueError:
-            return None
-        return dt.isoformat()
+        return to_utc_iso(value, self.name)
 
     def _extract_author(self, soup: BeautifulSoup) -> Optional[str]:
         node = soup.select_one(".author span, .author strong, .sidebar-1 .author")
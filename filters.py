@@ -2,15 +2,23 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass, field
+import time
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import AbstractSet, Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
 
 from fetcher.base_fetcher import NewsRecord
-from utils.config_loader import DEFAULT_CONFIG_PATH, load_settings
+from utils.aho_corasick import AhoCorasick
+from utils.config_loader import DEFAULT_CONFIG_PATH
+from utils.metrics import REGISTRY
+from utils.settings import resolve_settings
+from utils.text_index import DEFAULT_MATCH_MODE, TokenIndex, keyword_key, normalize_match_mode
 
 logger = logging.getLogger(__name__)
 
+FILTER_SECONDS = REGISTRY.histogram("radarflow_filter_duration_seconds", "关键词过滤一批新闻的耗时")
+FILTER_RECORDS = REGISTRY.counter("radarflow_filter_records_total", "关键词过滤结果", ("action",))
+
 DEFAULT_FILTER_PATH = DEFAULT_CONFIG_PATH
 
 
@@ -22,24 +30,44 @@ class FilterRule:
     any_of: List[Any] = field(default_factory=list)
     none_of: List[Any] = field(default_factory=list)
     enabled: bool = True
+    match: str = DEFAULT_MATCH_MODE  # substring / word / stem / segment
 
     def __post_init__(self) -> None:
-        self._all_groups = self._prepare_groups(self.all_of)
-        self._any_tokens = self._prepare_tokens(self.any_of)
-        self._none_tokens = self._prepare_tokens(self.none_of)
+        self.match = normalize_match_mode(self.match)
+        self.span = 1
+        self._all_groups = [group for group in map(self._to_keys, self._prepare_groups(self.all_of)) if group]
+        self._any_tokens = self._to_keys(self._prepare_tokens(self.any_of))
+        self._none_tokens = self._to_keys(self._prepare_tokens(self.none_of))
 
     def matches(self, text: str) -> bool:
         if not self.enabled:
             return False
         lowered = text.lower()
-        if self._all_groups and any(not self._group_matches(group, lowered) for group in self._all_groups):
+        if self.match == DEFAULT_MATCH_MODE:
+            present: Callable[[str], bool] = lowered.__contains__
+        else:
+            index = TokenIndex(lowered, {self.match: self.span})
+            present = lambda key: index.contains(self.match, key)  # noqa: E731
+        if self._all_groups and any(not any(map(present, group)) for group in self._all_groups):
             return False
-        if self._any_tokens and not any(token in lowered for token in self._any_tokens):
+        if self._any_tokens and not any(map(present, self._any_tokens)):
             return False
-        if self._none_tokens and any(token in lowered for token in self._none_tokens):
+        if self._none_tokens and any(map(present, self._none_tokens)):
             return False
         return True
 
+    def _to_keys(self, tokens: List[str]) -> List[str]:
+        """按匹配模式把关键词转换为索引键，并记录多词关键词的最大跨度。"""
+        if self.match == DEFAULT_MATCH_MODE:
+            return tokens
+        keys: List[str] = []
+        for token in tokens:
+            key, span = keyword_key(token, self.match)
+            if key:
+                keys.append(key)
+                self.span = max(self.span, span)
+        return keys
+
     def _prepare_groups(self, values: Iterable[Any]) -> List[List[str]]:
         groups: List[List[str]] = []
         for raw in values or []:
@@ -79,30 +107,119 @@ class FilterRule:
                     tokens.append(token)
         return tokens
 
-    def _group_matches(self, group: List[str], lowered_text: str) -> bool:
-        return any(token in lowered_text for token in group)
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """规则在 FilterSet 自动机中的关键词 ID 表示。"""
+
+    all_groups: Tuple[FrozenSet[int], ...]
+    any_ids: FrozenSet[int]
+    none_ids: FrozenSet[int]
+
+    @classmethod
+    def from_rule(cls, rule: FilterRule, resolve: Callable[[str], int]) -> "CompiledRule":
+        return cls(
+            all_groups=tuple(frozenset(resolve(token) for token in group) for group in rule._all_groups),
+            any_ids=frozenset(resolve(token) for token in rule._any_tokens),
+            none_ids=frozenset(resolve(token) for token in rule._none_tokens),
+        )
+
+    def matches(self, hits: AbstractSet[int]) -> bool:
+        """与 FilterRule.matches 语义一致，但基于已命中的关键词 ID 判定。"""
+        return self.failed_clause(hits) is None
+
+    def failed_clause(self, hits: AbstractSet[int]) -> Optional[str]:
+        """返回导致不匹配的子句（all_of/any_of/none_of），匹配时返回 None。"""
+        if any(hits.isdisjoint(group) for group in self.all_groups):
+            return "all_of"
+        if self.any_ids and hits.isdisjoint(self.any_ids):
+            return "any_of"
+        if self.none_ids and not hits.isdisjoint(self.none_ids):
+            return "none_of"
+        return None
+
+    def trigger_ids(self, hits: AbstractSet[int], clause: Optional[str]) -> List[int]:
+        """返回决定判定结果的关键词 ID：匹配时为命中的 all_of/any_of 关键词，
+        none_of 失败时为命中的排除词，all_of 失败时为未命中的那一组。"""
+        if clause == "none_of":
+            return sorted(hits & self.none_ids)
+        if clause == "all_of":
+            missing = next(group for group in self.all_groups if hits.isdisjoint(group))
+            return sorted(missing)
+        if clause == "any_of":
+            return sorted(self.any_ids)
+        triggered: set[int] = set()
+        for group in self.all_groups:
+            triggered |= hits & group
+        triggered |= hits & self.any_ids
+        return sorted(triggered)
+
+
+@dataclass
+class RuleStats:
+    """单条规则在 profile 模式下的统计。"""
+
+    name: str
+    evaluations: int = 0
+    hits: int = 0
+    skipped: int = 0  # 前序规则已命中，未轮到本规则
+    failed_all_of: int = 0
+    failed_any_of: int = 0
+    failed_none_of: int = 0
+    cost_ns: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["cost_ms"] = round(data.pop("cost_ns") / 1e6, 3)
+        return data
+
+
+@dataclass
+class FilterExplanation:
+    """单条新闻的过滤判定说明。"""
+
+    source: str
+    title: str
+    action: str
+    via: str  # prefilter / rule / default
+    rule: Optional[str] = None
+    rule_index: Optional[int] = None
+    tokens: List[str] = field(default_factory=list)
+    trace: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
 
 
 class FilterSet:
     """根据配置文件过滤新闻。"""
 
-    def __init__(self, path: Optional[Path] = None) -> None:
+    def __init__(self, path: Optional[Path] = None, *, settings: Optional[Dict[str, Any]] = None) -> None:
         self.path = path or DEFAULT_FILTER_PATH
+        self._settings = settings
         self.enabled = False
         self.default_action = "allow"
         self.rules: List[FilterRule] = []
         self._rule_index_map: Dict[str, int] = {}
+        self._automaton = AhoCorasick([])
+        self._indexed_terms: List[Tuple[int, str, str]] = []
+        self._index_spans: Dict[str, int] = {}
+        self._compiled: List[Tuple[int, FilterRule, CompiledRule]] = []
+        self._token_names: List[str] = []
+        self.profile = False
+        self.rule_stats: List[RuleStats] = []
+        self.scan_stats: Dict[str, int] = {}
         self._load()
 
     def _load(self) -> None:
-        settings = load_settings(self.path)
-        config = settings.get("filters", {})
-        if not config:
+        config = resolve_settings(self.path, self._settings).filters
+        if not config.configured:
             logger.info("未在 %s 中找到 filters 配置，默认不过滤", self.path)
             return
-        self.enabled = config.get("enabled", False)
-        self.default_action = config.get("default_action", "allow")
-        for rule_cfg in config.get("rules", []):
+        self.enabled = config.enabled
+        self.default_action = config.default_action
+        self.profile = config.profile
+        for rule_cfg in config.rules:
             rule = FilterRule(
                 name=rule_cfg.get("name", "unnamed"),
                 action=rule_cfg.get("action", "allow"),
@@ -110,21 +227,61 @@ class FilterSet:
                 any_of=rule_cfg.get("any_of", []) or [],
                 none_of=rule_cfg.get("none_of", []) or [],
                 enabled=rule_cfg.get("enabled", True),
+                match=rule_cfg.get("match", config.match),
             )
             self.rules.append(rule)
         self._rule_index_map = {rule.name: idx for idx, rule in enumerate(self.rules)}
+        self._compile()
+
+    def _compile(self) -> None:
+        """把所有启用规则的关键词编译为统一的 ID：substring 关键词进入同一个自动机，
+        其余模式的关键词在每篇新闻的分词索引中查找，每篇新闻只扫描、切分一次。"""
+        active = [(idx, rule) for idx, rule in enumerate(self.rules) if rule.enabled]
+        substring_tokens: List[str] = []
+        indexed: Dict[Tuple[str, str], int] = {}
+        self._index_spans = {}
+        for _, rule in active:
+            tokens = [token for group in rule._all_groups for token in group]
+            tokens += rule._any_tokens + rule._none_tokens
+            if rule.match == DEFAULT_MATCH_MODE:
+                substring_tokens.extend(tokens)
+                continue
+            self._index_spans[rule.match] = max(self._index_spans.get(rule.match, 1), rule.span)
+            for token in tokens:
+                indexed.setdefault((rule.match, token), len(indexed))
+        self._automaton = AhoCorasick(substring_tokens)
+        offset = len(self._automaton)
+        self._indexed_terms = [(offset + term_id, mode, key) for (mode, key), term_id in indexed.items()]
+        self._token_names = list(self._automaton.patterns) + [key for _, key in indexed]
+
+        def resolver(rule: FilterRule) -> Callable[[str], int]:
+            if rule.match == DEFAULT_MATCH_MODE:
+                return self._automaton.id_of
+            return lambda token: offset + indexed[(rule.match, token)]
+
+        self._compiled = [(idx, rule, CompiledRule.from_rule(rule, resolver(rule))) for idx, rule in active]
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.rule_stats = [RuleStats(name=rule.name) for _, rule, _ in self._compiled]
+        self.scan_stats = {"records": 0, "prefilter_overrides": 0, "default_action": 0, "scan_ns": 0}
 
     def apply(self, records: Iterable[NewsRecord]) -> List[NewsRecord]:
         if not self.enabled or not self.rules:
             return list(records)
+        started = time.perf_counter()
         allowed: List[NewsRecord] = []
+        denied = 0
         for record in records:
             prefilter_override = self._prefilter_override(record)
             if prefilter_override is not None:
                 action, rule_name, rule_index = prefilter_override
+                if self.profile:
+                    self.scan_stats["prefilter_overrides"] += 1
             else:
                 text = self._combine_text(record)
-                action, rule_name, rule_index = self._evaluate(text)
+                evaluate = self._evaluate_profiled if self.profile else self._evaluate
+                action, rule_name, rule_index = evaluate(text)
             if action == "allow":
                 if isinstance(record.raw, dict):
                     if rule_name:
@@ -133,16 +290,112 @@ class FilterSet:
                         record.raw["_matched_rule_index"] = rule_index
                 allowed.append(record)
             else:
+                denied += 1
                 logger.debug("新闻被过滤: %s - %s", record.source, record.title)
+        FILTER_SECONDS.observe(time.perf_counter() - started)
+        FILTER_RECORDS.inc(len(allowed), action="allow")
+        FILTER_RECORDS.inc(denied, action="deny")
         logger.info("过滤后剩余 %d 条新闻", len(allowed))
+        if self.profile:
+            self.log_profile()
         return allowed
 
+    def _scan(self, text: str) -> set[int]:
+        lowered = text.lower()
+        hits = self._automaton.search(lowered)
+        if self._indexed_terms:
+            index = TokenIndex(lowered, self._index_spans)
+            hits.update(term_id for term_id, mode, key in self._indexed_terms if index.contains(mode, key))
+        return hits
+
     def _evaluate(self, text: str) -> Tuple[str, Optional[str], Optional[int]]:
-        for idx, rule in enumerate(self.rules):
-            if rule.matches(text):
+        hits = self._scan(text)
+        for idx, rule, compiled in self._compiled:
+            if compiled.matches(hits):
                 return rule.action, rule.name, idx
         return self.default_action, None, None
 
+    def _evaluate_profiled(self, text: str) -> Tuple[str, Optional[str], Optional[int]]:
+        started = time.perf_counter_ns()
+        hits = self._scan(text)
+        self.scan_stats["records"] += 1
+        self.scan_stats["scan_ns"] += time.perf_counter_ns() - started
+        result: Optional[Tuple[str, Optional[str], Optional[int]]] = None
+        for position, (idx, rule, compiled) in enumerate(self._compiled):
+            stats = self.rule_stats[position]
+            if result is not None:
+                stats.skipped += 1
+                continue
+            started = time.perf_counter_ns()
+            clause = compiled.failed_clause(hits)
+            stats.cost_ns += time.perf_counter_ns() - started
+            stats.evaluations += 1
+            if clause is None:
+                stats.hits += 1
+                result = (rule.action, rule.name, idx)
+            else:
+                setattr(stats, f"failed_{clause}", getattr(stats, f"failed_{clause}") + 1)
+        if result is None:
+            self.scan_stats["default_action"] += 1
+            return self.default_action, None, None
+        return result
+
+    def profile_report(self) -> Dict[str, Any]:
+        scan = dict(self.scan_stats)
+        scan["scan_ms"] = round(scan.pop("scan_ns", 0) / 1e6, 3)
+        return {"scan": scan, "rules": [stats.to_dict() for stats in self.rule_stats]}
+
+    def log_profile(self) -> None:
+        report = self.profile_report()
+        logger.info(
+            "关键词过滤 profile：扫描 %d 条，耗时 %.1fms，预过滤直接判定 %d 条，默认动作 %d 条",
+            report["scan"]["records"],
+            report["scan"]["scan_ms"],
+            report["scan"]["prefilter_overrides"],
+            report["scan"]["default_action"],
+        )
+        for stats in report["rules"]:
+            logger.info(
+                "  规则 %s：评估 %d 命中 %d 跳过 %d | 未满足 all_of %d / any_of %d / 命中 none_of %d | %.3fms",
+                stats["name"],
+                stats["evaluations"],
+                stats["hits"],
+                stats["skipped"],
+                stats["failed_all_of"],
+                stats["failed_any_of"],
+                stats["failed_none_of"],
+                stats["cost_ms"],
+            )
+
+    def explain(self, record: NewsRecord) -> FilterExplanation:
+        """说明单条新闻为何被放行或拦截，以及由哪些关键词触发。"""
+        explanation = FilterExplanation(
+            source=record.source,
+            title=record.title,
+            action=self.default_action if self.enabled else "allow",
+            via="default",
+        )
+        if not self.enabled or not self.rules:
+            return explanation
+        override = self._prefilter_override(record)
+        if override is not None:
+            explanation.action, explanation.rule, explanation.rule_index = override
+            explanation.via = "prefilter"
+            return explanation
+        hits = self._scan(self._combine_text(record))
+        for idx, rule, compiled in self._compiled:
+            clause = compiled.failed_clause(hits)
+            tokens = [self._token_names[token_id] for token_id in compiled.trigger_ids(hits, clause)]
+            explanation.trace.append({"rule": rule.name, "result": clause or "matched", "tokens": tokens})
+            if clause is None:
+                explanation.action = rule.action
+                explanation.via = "rule"
+                explanation.rule = rule.name
+                explanation.rule_index = idx
+                explanation.tokens = tokens
+                break
+        return explanation
+
     def _prefilter_override(self, record: NewsRecord) -> Optional[Tuple[str, Optional[str], Optional[int]]]:
         if not isinstance(record.raw, dict):
             return None
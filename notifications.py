@@ -3,27 +3,276 @@ from __future__ import annotations
 
 import html
 import json
-import os
 import re
 import smtplib
+import socket
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from dataclasses import dataclass, field
 from datetime import datetime
+from email.message import Message
 from email.mime.text import MIMEText
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import requests
 from ai import AISummary
 from fetcher.base_fetcher import NewsRecord
-from utils.config_loader import DEFAULT_CONFIG_PATH as GLOBAL_CONFIG_PATH, load_settings
+from utils.config_loader import DEFAULT_CONFIG_PATH as GLOBAL_CONFIG_PATH
+from utils.message_split import MEASURES, Measure, split_message
+from utils.metrics import REGISTRY
+from utils.settings import get_config
 from utils.time_utils import get_timezone_helper
 
-try:  # pragma: no cover - optional dependency
-    from jieba import analyse as jieba_analyse
-except ImportError:  # pragma: no cover
-    jieba_analyse = None
-
 DEFAULT_CONFIG_PATH = GLOBAL_CONFIG_PATH
+DEFAULT_CHANNEL_TIMEOUT_SEC = 120.0
+SMTP_NOOP_AFTER_SEC = 30.0
+# 各渠道单条消息上限：(度量方式, 上限)；未列出的渠道不限长度
+DEFAULT_MESSAGE_LIMITS: Dict[str, Tuple[str, Optional[int]]] = {
+    "telegram": ("chars", 4096),
+    "wechat_work": ("bytes", 2048),
+    "dingtalk": ("bytes", 20000),
+    "feishu": ("json", 19000),  # 请求体上限 20KB，预留 JSON 包装
+}
+WEWORK_MARKDOWN_LIMIT = 4096
+
+NOTIFY_SECONDS = REGISTRY.histogram("radarflow_notify_duration_seconds", "单个渠道发送本轮全部消息的耗时", ("channel",))
+NOTIFY_MESSAGES = REGISTRY.counter(
+    "radarflow_notify_messages_total", "通知消息数：delivered 成功，failed 失败，timeout 因超时未发送", ("channel", "status")
+)
+
+
+@dataclass
+class MessageResult:
+    index: int
+    delivered: bool
+    latency: float
+    error: Optional[str] = None
+
+
+@dataclass
+class ChannelResult:
+    """单个渠道的发送结果，messages 按发送顺序记录每条消息的耗时。"""
+
+    channel: str
+    total: int = 0
+    messages: List[MessageResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    timed_out: bool = False
+
+    @property
+    def success(self) -> bool:
+        return any(message.delivered for message in self.messages)
+
+    @property
+    def delivered(self) -> int:
+        return sum(1 for message in self.messages if message.delivered)
+
+
+@dataclass
+class DispatchResult:
+    """一次推送在所有渠道上的汇总结果。"""
+
+    channels: Dict[str, ChannelResult] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    def __bool__(self) -> bool:
+        return bool(self.channels)
+
+    def summary(self) -> Dict[str, bool]:
+        return {name: result.success for name, result in self.channels.items()}
+
+    def describe(self) -> str:
+        parts = []
+        for name, result in self.channels.items():
+            latencies = [message.latency for message in result.messages]
+            text = f"{name} {result.delivered}/{result.total} 成功，耗时 {result.elapsed:.1f}s"
+            if latencies:
+                text += f"，单条最长 {max(latencies):.1f}s"
+            if result.timed_out:
+                text += "（超时）"
+            parts.append(text)
+        return f"总耗时 {self.elapsed:.1f}s；" + "；".join(parts)
+
+
+def _record_channel(result: ChannelResult) -> None:
+    NOTIFY_SECONDS.observe(result.elapsed, channel=result.channel)
+    delivered = result.delivered
+    NOTIFY_MESSAGES.inc(delivered, channel=result.channel, status="delivered")
+    NOTIFY_MESSAGES.inc(len(result.messages) - delivered, channel=result.channel, status="failed")
+    NOTIFY_MESSAGES.inc(max(0, result.total - len(result.messages)), channel=result.channel, status="timeout")
+
+
+@dataclass
+class NewsView:
+    """单条新闻与样式无关的展示字段，每轮只计算一次，再由各样式序列化。"""
+
+    item: NewsRecord
+    group_key: Tuple[int, str]
+    category: Optional[str]
+    display_title: str
+    keywords_text: str
+    publish_time: Optional[str]
+    source: str
+    summary_text: str
+    sentiment_line: Optional[str]
+    entity_items: List[str]
+
+
+class EmailTransport:
+    """持有一个已登录的 SMTP 连接并在多封邮件间复用，连接失效时重连一次。"""
+
+    RETRYABLE = (smtplib.SMTPServerDisconnected, ConnectionError, socket.timeout)
+
+    def __init__(
+        self,
+        server: str,
+        port: int,
+        sender: str,
+        password: str,
+        *,
+        timeout: float = DEFAULT_CHANNEL_TIMEOUT_SEC,
+        noop_after: float = SMTP_NOOP_AFTER_SEC,
+    ) -> None:
+        self.server = server
+        self.port = port
+        self.sender = sender
+        self.password = password
+        self.timeout = timeout
+        self.noop_after = noop_after
+        self.connects = 0
+        self._conn: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+
+    def send(self, message: Message, recipients: Sequence[str]) -> None:
+        """发送邮件；连接被服务器断开时重连后重试一次，其余错误直接抛出。"""
+        with self._lock:
+            for attempt in range(2):
+                conn = self._connection()
+                try:
+                    conn.sendmail(self.sender, list(recipients), message.as_string())
+                except self.RETRYABLE as exc:
+                    self._drop()
+                    if attempt:
+                        raise
+                    logging.info("SMTP 连接已断开，重新连接: %s", exc)
+                    continue
+                self._last_used = time.monotonic()
+                return
+
+    def close(self) -> None:
+        with self._lock:
+            self._drop()
+
+    def _connection(self) -> smtplib.SMTP:
+        conn = self._conn
+        if conn is not None and time.monotonic() - self._last_used > self.noop_after:
+            # 空闲较久的连接可能已被服务器关闭，先用 NOOP 探测
+            try:
+                code = conn.noop()[0]
+            except (smtplib.SMTPException, OSError):
+                code = -1
+            if code != 250:
+                self._drop()
+                conn = None
+        if conn is None:
+            conn = self._connect()
+        return conn
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.port == 465:
+            conn = smtplib.SMTP_SSL(self.server, self.port, timeout=self.timeout)
+        else:
+            conn = smtplib.SMTP(self.server, self.port, timeout=self.timeout)
+        try:
+            if self.port != 465:
+                conn.starttls()
+            conn.login(self.sender, self.password)
+        except Exception:
+            self._quit(conn)
+            raise
+        self.connects += 1
+        self._conn = conn
+        self._last_used = time.monotonic()
+        return conn
+
+    def _drop(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._quit(conn)
+
+    @staticmethod
+    def _quit(conn: smtplib.SMTP) -> None:
+        try:
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+
+_KEYWORD_EXTRACTOR: Any = None
+_KEYWORD_WARMUP: Optional[threading.Thread] = None
+_KEYWORD_WARMUP_LOCK = threading.Lock()
+
+
+def warm_up_keywords() -> None:
+    """在后台线程导入 jieba 并加载词典（约 2 秒），不阻塞抓取与过滤；重复调用无副作用。"""
+    global _KEYWORD_WARMUP
+    with _KEYWORD_WARMUP_LOCK:
+        if _KEYWORD_WARMUP is None:
+            _KEYWORD_WARMUP = threading.Thread(target=_load_keyword_extractor, name="jieba-warmup", daemon=True)
+            _KEYWORD_WARMUP.start()
+
+
+def _load_keyword_extractor() -> None:
+    global _KEYWORD_EXTRACTOR
+    try:  # pragma: no cover - optional dependency
+        import jieba
+        from jieba import analyse
+    except ImportError:  # pragma: no cover
+        return
+    jieba.initialize()
+    _KEYWORD_EXTRACTOR = analyse
+
+
+def keyword_extractor() -> Any:
+    """返回 jieba.analyse；未预热时在此触发加载并等待完成，未安装时返回 None。"""
+    warm_up_keywords()
+    if _KEYWORD_WARMUP is not None:
+        _KEYWORD_WARMUP.join()
+    return _KEYWORD_EXTRACTOR
+
+
+_EMAIL_TRANSPORTS: Dict[Tuple[str, int, str], EmailTransport] = {}
+_EMAIL_TRANSPORTS_LOCK = threading.Lock()
+
+
+def shared_email_transport(server: str, port: int, sender: str, password: str, timeout: float) -> EmailTransport:
+    """返回进程内共享的 SMTP 连接，调度模式下多轮运行复用；密码变更时重建。"""
+    key = (server, port, sender)
+    with _EMAIL_TRANSPORTS_LOCK:
+        transport = _EMAIL_TRANSPORTS.get(key)
+        if transport is not None and transport.password != password:
+            transport.close()
+            transport = None
+        if transport is None:
+            transport = EmailTransport(server, port, sender, password, timeout=timeout)
+            _EMAIL_TRANSPORTS[key] = transport
+        transport.timeout = timeout
+        return transport
+
+
+def close_email_transports() -> None:
+    with _EMAIL_TRANSPORTS_LOCK:
+        transports = list(_EMAIL_TRANSPORTS.values())
+        _EMAIL_TRANSPORTS.clear()
+    for transport in transports:
+        transport.close()
 
 
 class NotificationClient:
@@ -31,145 +280,314 @@ class NotificationClient:
 
     def __init__(self, config_path: Optional[Path] = None) -> None:
         self.config_path = config_path or DEFAULT_CONFIG_PATH
-        self.config = self._load_config()
-        self.enabled = self.config.get("enable", False)
-        self.feishu = self.config.get("feishu", {})
-        self.dingtalk = self.config.get("dingtalk", {})
-        self.wechat_work = self.config.get("wechat_work", {})
-        self.telegram = self.config.get("telegram", {})
-        self.email = self.config.get("email", {})
-        self.display_summary = bool(self.config.get("display_summary", True))
+        self.config = get_config(self.config_path).notification
+        self.enabled = self.config.enabled
+        self.feishu = self.config.channel("feishu")
+        self.dingtalk = self.config.channel("dingtalk")
+        self.wechat_work = self.config.channel("wechat_work")
+        self.telegram = self.config.channel("telegram")
+        self.email = self.config.channel("email")
+        self.display_summary = self.config.display_summary
+        self.parallel = self.config.parallel
+        self.channel_timeout = self.config.channel_timeout_sec
+        self.channel_timeouts = dict(self.config.channel_timeouts or {})
+        self.items_per_message = self.config.items_per_message
+        self.message_limits = dict(self.config.message_limits or {})
+        self.email_digest = bool(self.email.get("digest", False))
+        self.email_keep_alive = bool(self.email.get("keep_alive", False))
+        self._email_transport: Optional[EmailTransport] = None
         self.tz_helper = get_timezone_helper(self.config_path)
 
-    def _load_config(self) -> Dict[str, any]:  # type: ignore[override]
-        settings = load_settings(self.config_path)
-        cfg = settings.get("notification", {}) or {}
-        # 兼容配置既能放在 notification 内，也能放在顶层
-        cfg.setdefault("feishu", settings.get("feishu", {}))
-        cfg.setdefault("dingtalk", settings.get("dingtalk", {}))
-        cfg.setdefault("wechat_work", settings.get("wechat_work", {}))
-        cfg.setdefault("telegram", settings.get("telegram", {}))
-        cfg.setdefault("email", settings.get("email", {}))
-
-        env_map = {
-            ("feishu", "webhook_url"): os.environ.get("FEISHU_WEBHOOK", "").strip(),
-            ("dingtalk", "webhook_url"): os.environ.get("DINGTALK_WEBHOOK", "").strip(),
-            ("wechat_work", "webhook_url"): os.environ.get("WEWORK_WEBHOOK", "").strip(),
-            ("telegram", "bot_token"): os.environ.get("TELEGRAM_BOT_TOKEN", "").strip(),
-            ("telegram", "chat_id"): os.environ.get("TELEGRAM_CHAT_ID", "").strip(),
-            ("email", "from"): os.environ.get("EMAIL_FROM", "").strip(),
-            ("email", "password"): os.environ.get("EMAIL_PASSWORD", "").strip(),
-            ("email", "to"): os.environ.get("EMAIL_TO", "").strip(),
-            ("email", "smtp_server"): os.environ.get("EMAIL_SMTP_SERVER", "").strip(),
-            ("email", "smtp_port"): os.environ.get("EMAIL_SMTP_PORT", "").strip(),
-        }
-        for (section, key), value in env_map.items():
-            if value:
-                cfg[section][key] = value
-        return cfg
+    def close(self) -> None:
+        """结束本轮发送；开启 keep_alive 时保留 SMTP 连接供下一轮复用。"""
+        transport, self._email_transport = self._email_transport, None
+        if transport is not None and not self.email_keep_alive:
+            transport.close()
 
     def send(
         self,
         news: Iterable[NewsRecord],
         summaries: Optional[Dict[str, AISummary]] = None,
-    ) -> Dict[str, bool]:
+    ) -> DispatchResult:
         records = list(news)
-        results: Dict[str, bool] = {}
         if not self.enabled or not records:
-            return results
-        default_messages = self._format_messages(records, summaries or {})
-        title = self.config.get("title", "News Digest")
-
+            return DispatchResult()
+        jobs = [
+            (channel, [text for text, _ in messages], self.channel_sender(channel))
+            for channel, messages in self.render(records, summaries or {}).items()
+        ]
+        return self.dispatch(jobs)
+
+    def channels(self) -> List[str]:
+        """返回已配置的渠道，顺序即发送顺序。"""
+        enabled: List[str] = []
         if self.feishu.get("webhook_url"):
-            results["feishu"] = self._send_messages(
-                default_messages,
-                lambda text: self._send_feishu(self.feishu["webhook_url"], text),
-            )
+            enabled.append("feishu")
         if self.dingtalk.get("webhook_url"):
-            results["dingtalk"] = self._send_messages(
-                default_messages,
-                lambda text: self._send_dingtalk(self.dingtalk["webhook_url"], text),
-            )
+            enabled.append("dingtalk")
         if self.wechat_work.get("webhook_url"):
-            msgtype = self.wechat_work.get("msgtype", "text").lower()
-            wechat_style = "markdown" if msgtype == "markdown" else "text"
-            wechat_messages = default_messages if wechat_style == "text" else self._format_messages(records, summaries or {}, style=wechat_style)
-
-            def _wechat_sender(text: str) -> bool:
-                return self._send_wework(self.wechat_work["webhook_url"], text, msgtype)
-
-            results["wechat_work"] = self._send_messages(wechat_messages, _wechat_sender)
+            enabled.append("wechat_work")
         if self.telegram.get("bot_token") and self.telegram.get("chat_id"):
-            telegram_messages = self._format_messages(records, summaries or {}, style="telegram")
-            results["telegram"] = self._send_messages(
-                telegram_messages,
-                lambda text: self._send_telegram(
-                    self.telegram["bot_token"],
-                    self.telegram["chat_id"],
-                    text,
-                ),
-            )
+            enabled.append("telegram")
         if self.email.get("from") and self.email.get("to"):
-            results["email"] = self._send_messages(
-                default_messages,
-                lambda text: self._send_email(title, text),
-            )
-        return results
+            enabled.append("email")
+        return enabled
 
-    def _send_messages(self, messages: List[str], sender) -> bool:
-        success = False
+    def render(
+        self,
+        records: List[NewsRecord],
+        summaries: Dict[str, AISummary],
+    ) -> Dict[str, List[Tuple[str, List[NewsRecord]]]]:
+        """按渠道渲染消息，返回 {渠道: [(消息文本, 消息包含的新闻)]}。
+
+        每条新闻的展示字段只计算一次（NewsView），同一样式的新闻块只序列化一次，
+        再按各渠道的长度上限分别打包。"""
+        rendered: Dict[str, List[Tuple[str, List[NewsRecord]]]] = {}
+        if not records:
+            return rendered
+        views = self._build_views(records, summaries)
+        blocks_by_style: Dict[str, List[Tuple[Tuple[int, str], str, NewsRecord]]] = {}
+        packed: Dict[Tuple[str, Measure, Optional[int]], List[Tuple[str, List[NewsRecord]]]] = {}
+        for channel in self.channels():
+            style = self._channel_style(channel)
+            if style == "email_digest":
+                rendered[channel] = self._format_email_digest(views)
+                continue
+            measure, limit = self._message_limit(channel)
+            key = (style, measure, limit)
+            if key not in packed:
+                if style not in blocks_by_style:
+                    blocks_by_style[style] = self._render_blocks(views, style=style)
+                packed[key] = self._pack_blocks(blocks_by_style[style], style=style, measure=measure, limit=limit)
+            rendered[channel] = packed[key]
+        return rendered
+
+    def _channel_style(self, channel: str) -> str:
+        if channel == "telegram":
+            return "telegram"
+        if channel == "wechat_work" and self.wechat_work.get("msgtype", "text").lower() == "markdown":
+            return "markdown"
+        if channel == "email" and self.email_digest:
+            return "email_digest"
+        return "text"
+
+    def channel_sender(self, channel: str) -> Optional[Callable[[str], bool]]:
+        """返回发送单条消息的函数；渠道未配置时返回 None。"""
+        if channel not in self.channels():
+            return None
+        if channel == "feishu":
+            return lambda text: self._send_feishu(self.feishu["webhook_url"], text)
+        if channel == "dingtalk":
+            return lambda text: self._send_dingtalk(self.dingtalk["webhook_url"], text)
+        if channel == "wechat_work":
+            msgtype = self.wechat_work.get("msgtype", "text").lower()
+            return lambda text: self._send_wework(self.wechat_work["webhook_url"], text, msgtype)
+        if channel == "telegram":
+            return lambda text: self._send_telegram(self.telegram["bot_token"], self.telegram["chat_id"], text)
+        title = self.config.title
+        subtype = "html" if self.email_digest else "plain"
+        return lambda text: self._send_email(title, text, subtype)
+
+    def dispatch(self, jobs: Sequence[Tuple[str, Sequence[Any], Callable[[Any], bool]]]) -> DispatchResult:
+        """各渠道由独立线程按顺序发送，互不阻塞；每个渠道有独立的超时。
+
+        jobs 中的消息可以是文本或其他对象，由对应的 sender 负责投递。"""
+        started = time.monotonic()
+        dispatch = DispatchResult()
+        if not jobs:
+            return dispatch
+        pending = []
+        for channel, messages, _ in jobs:
+            result = ChannelResult(channel=channel, total=sum(1 for message in messages if message))
+            deadline = started + self.channel_timeouts.get(channel, self.channel_timeout)
+            dispatch.channels[channel] = result
+            pending.append((result, messages, deadline))
+        if not self.parallel or len(jobs) == 1:
+            for (_, _, sender), (result, messages, deadline) in zip(jobs, pending):
+                self._send_messages(result, messages, sender, deadline)
+        else:
+            executor = ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="notify")
+            futures = [
+                (executor.submit(self._send_messages, result, messages, sender, deadline), result, deadline)
+                for (_, _, sender), (result, messages, deadline) in zip(jobs, pending)
+            ]
+            for future, result, deadline in futures:
+                try:
+                    future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except FuturesTimeout:
+                    result.timed_out = True
+                    result.elapsed = time.monotonic() - started
+                    logging.warning("通知渠道 %s 超时，已放弃等待剩余消息", result.channel)
+                except Exception as exc:  # noqa: BLE001
+                    logging.warning("通知渠道 %s 发送异常: %s", result.channel, exc)
+            # 超时渠道的线程不再开始新消息，但可能仍在发送当前这条；经发件箱发送时，
+            # 该消息在结果记录之前不会被重试，迟到的成功同样会记录为已发送
+            executor.shutdown(wait=False)
+        dispatch.elapsed = time.monotonic() - started
+        for result in dispatch.channels.values():
+            _record_channel(result)
+        return dispatch
+
+    def _send_messages(
+        self,
+        result: ChannelResult,
+        messages: Sequence[Any],
+        sender: Callable[[Any], bool],
+        deadline: float,
+    ) -> ChannelResult:
+        started = time.monotonic()
         for idx, text in enumerate(messages, start=1):
             if not text:
                 continue
+            if result.timed_out or time.monotonic() >= deadline:
+                result.timed_out = True
+                logging.warning("通知渠道 %s 超时，剩余 %d 条消息未发送", result.channel, len(messages) - idx + 1)
+                break
+            sent_at = time.monotonic()
             try:
-                delivery = sender(text)
-                success = delivery or success
-                logging.info("通知消息(%d/%d)发送结果: %s", idx, len(messages), "成功" if delivery else "失败")
+                delivery = bool(sender(text))
+                result.messages.append(MessageResult(idx, delivery, time.monotonic() - sent_at))
+                logging.info(
+                    "通知[%s]消息(%d/%d)发送结果: %s", result.channel, idx, len(messages), "成功" if delivery else "失败"
+                )
             except Exception as exc:  # noqa: BLE001
-                logging.warning("通知消息(%d/%d)发送异常: %s", idx, len(messages), exc)
-        return success
-
-    def _format_messages(
+                result.messages.append(MessageResult(idx, False, time.monotonic() - sent_at, str(exc)))
+                logging.warning("通知[%s]消息(%d/%d)发送异常: %s", result.channel, idx, len(messages), exc)
+        if not result.timed_out:
+            result.elapsed = time.monotonic() - started
+        return result
+
+    def _message_limit(self, channel: str) -> Tuple[Measure, Optional[int]]:
+        """返回渠道的长度度量方式与单条消息上限；None 表示不限长度。"""
+        unit, limit = DEFAULT_MESSAGE_LIMITS.get(channel, ("chars", None))
+        if channel == "wechat_work" and self._channel_style(channel) == "markdown":
+            limit = WEWORK_MARKDOWN_LIMIT
+        override = self.message_limits.get(channel)
+        if override:
+            limit = override
+        return MEASURES[unit], limit
+
+    def _build_views(self, news: List[NewsRecord], summaries: Dict[str, AISummary]) -> List[NewsView]:
+        return [self._build_view(item, self._lookup_summary(summaries, item)) for item in self._sort_records_by_rule(news)]
+
+    def _render_blocks(self, views: Sequence[NewsView], *, style: str) -> List[Tuple[Tuple[int, str], str, NewsRecord]]:
+        return [
+            (view.group_key, self._serialize_view(view, style=style, show_category_line=False), view.item)
+            for view in views
+        ]
+
+    def _format_batches(
         self,
         news: List[NewsRecord],
         summaries: Dict[str, AISummary],
         *,
         style: str = "text",
-    ) -> List[str]:
+        measure: Measure = len,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, List[NewsRecord]]]:
         if not news:
             return []
-        batch_size = max(1, int(self.config.get("items_per_message", 3)))
-        batches: List[str] = []
-        current: List[str] = []
-        count = 0
-        sorted_news = self._sort_records_by_rule(news)
-        last_group: Optional[Tuple[int, str]] = None
+        return self._pack_blocks(
+            self._render_blocks(self._build_views(news, summaries), style=style),
+            style=style,
+            measure=measure,
+            limit=limit,
+        )
+
+    def _pack_blocks(
+        self,
+        blocks: Sequence[Tuple[Tuple[int, str], str, NewsRecord]],
+        *,
+        style: str,
+        measure: Measure = len,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, List[NewsRecord]]]:
+        """贪心地把新闻块装入消息，直到达到渠道长度上限或 items_per_message。
+
+        每条消息都以推送时间和当前分组标题开头；单个新闻块超长时按行安全切分为多条消息。"""
+        if not blocks:
+            return []
         separator = "\n\n\n" if style in {"text", "markdown"} else "\n\n"
-        dispatch_header = ""
-        for item in sorted_news:
-            if count == 0:
-                dispatch_header = self._format_dispatch_header(style=style)
-            summary = self._lookup_summary(summaries, item)
-            group_key = self._group_key(item)
-            header = ""
-            if group_key != last_group:
-                header = self._format_group_header(group_key, style=style)
-            block = self._render_block(item, summary, style=style, show_category_line=False)
-            if header:
-                block = f"{header}\n\n{block}" if block else header
-            if count == 0 and dispatch_header:
-                block = f"{dispatch_header}\n\n{block}" if block else dispatch_header
+        separator_size = measure(separator)
+        dispatch_header = self._format_dispatch_header(style=style)
+        batches: List[Tuple[str, List[NewsRecord]]] = []
+        parts: List[str] = []
+        records: List[NewsRecord] = []
+        size = 0
+        last_group: Optional[Tuple[int, str]] = None
+        for group_key, block, item in blocks:
+            header = self._format_group_header(group_key, style=style)
+            piece = block if parts and group_key == last_group else f"{header}\n\n{block}"
+            full = (
+                (self.items_per_message and len(records) >= self.items_per_message)
+                or (limit is not None and size + separator_size + measure(piece) > limit)
+            )
+            if parts and full:
+                batches.append((separator.join(parts), records))
+                parts, records, size = [], [], 0
+                piece = f"{header}\n\n{block}"
+            if not parts:
+                piece = f"{dispatch_header}\n\n{piece}"
+                piece_size = measure(piece)
+                if limit is not None and piece_size > limit:
+                    batches.extend(
+                        (chunk, [item])
+                        for chunk in split_message(piece, limit, measure, html_safe=style == "telegram")
+                    )
+                    last_group = None
+                    continue
+                size = piece_size
+            else:
+                size += separator_size + measure(piece)
+            parts.append(piece)
+            records.append(item)
             last_group = group_key
-            current.append(block)
-            count += 1
-            if count >= batch_size:
-                batches.append(separator.join(current))
-                current = []
-                count = 0
-        if current:
-            batches.append(separator.join(current))
+        if parts:
+            batches.append((separator.join(parts), records))
         return batches
 
+    def _format_email_digest(self, views: Sequence[NewsView]) -> List[Tuple[str, List[NewsRecord]]]:
+        """把全部新闻渲染成一封带目录的 HTML 邮件，按规则分组，目录项链接到正文锚点。"""
+        if not views:
+            return []
+        groups: List[Tuple[str, List[Tuple[int, NewsView]]]] = []
+        last_group: Optional[Tuple[int, str]] = None
+        for idx, view in enumerate(views, start=1):
+            if view.group_key != last_group:
+                groups.append((view.group_key[1] or "未分类", []))
+                last_group = view.group_key
+            groups[-1][1].append((idx, view))
+
+        title = html.escape(str(self.config.title))
+        toc: List[str] = []
+        body: List[str] = []
+        for group_idx, (name, entries) in enumerate(groups, start=1):
+            display = html.escape(name)
+            links = "".join(
+                f'<li><a href="#news-{idx}">{html.escape(view.display_title or view.item.title or "未命名")}</a></li>'
+                for idx, view in entries
+            )
+            toc.append(f'<li><a href="#group-{group_idx}">{display}</a>（{len(entries)}）<ol>{links}</ol></li>')
+            body.append(f'<h2 id="group-{group_idx}">[{display}]</h2>')
+            for idx, view in entries:
+                block = self._render_block_telegram(view, show_category_line=False)
+                body.append(
+                    f'<div id="news-{idx}">{block.replace(chr(10), "<br>" + chr(10))}'
+                    '<p><a href="#toc">↑ 返回目录</a></p></div><hr>'
+                )
+        document = "\n".join(
+            [
+                "<html><body>",
+                f"<h1>{title}</h1>",
+                f"<p>{self._format_dispatch_header(style='telegram')}</p>",
+                f'<h2 id="toc">目录（共 {len(views)} 条）</h2>',
+                f"<ol>{''.join(toc)}</ol><hr>",
+                *body,
+                "</body></html>",
+            ]
+        )
+        return [(document, [view.item for view in views])]
+
     def _group_key(self, record: NewsRecord) -> Tuple[int, str]:
         raw = record.raw if isinstance(record.raw, dict) else {}
         idx = raw.get("_matched_rule_index")
@@ -212,6 +630,9 @@ class NotificationClient:
         style: str = "text",
         show_category_line: bool = True,
     ) -> str:
+        return self._serialize_view(self._build_view(item, summary), style=style, show_category_line=show_category_line)
+
+    def _build_view(self, item: NewsRecord, summary: AISummary) -> NewsView:
         category = None
         if isinstance(item.raw, dict):
             category = item.raw.get("_matched_rule")
@@ -229,48 +650,47 @@ class NotificationClient:
         meta = summary.meta or {}
         publish_time = meta.get("publish_time")
         if not publish_time:
-            publish_time = getattr(item, "published_at", None)
+            publish_time = getattr(item, "published_utc", None) or getattr(item, "published_at", None)
         if not publish_time and isinstance(item.raw, dict):
             publish_time = item.raw.get("published_at") or item.raw.get("timestamp")
-        publish_time_display = self.tz_helper.to_display(publish_time)
-        source = meta.get("source") or item.source or "Unknown"
         has_ai = self._has_ai_payload(summary)
         sentiment = self._extract_sentiment(summary) if has_ai else None
-        sentiment_line = self._format_sentiment_line(sentiment)
-        entity_items = self._collect_entity_strings(summary) if has_ai else []
-        display_title = self._display_title(summary, item)
+        return NewsView(
+            item=item,
+            group_key=self._group_key(item),
+            category=category,
+            display_title=self._display_title(summary, item),
+            keywords_text=keywords_text,
+            publish_time=self.tz_helper.to_display(publish_time),
+            source=meta.get("source") or item.source or "Unknown",
+            summary_text=summary_text,
+            sentiment_line=self._format_sentiment_line(sentiment),
+            entity_items=self._collect_entity_strings(summary) if has_ai else [],
+        )
+
+    def _serialize_view(self, view: NewsView, *, style: str, show_category_line: bool = True) -> str:
         if style == "telegram":
-            return self._render_block_telegram(
-                item=item,
-                category=category,
-                keywords_text=keywords_text,
-                publish_time=publish_time_display,
-                source=source,
-                sentiment_line=sentiment_line,
-                entity_items=entity_items,
-                summary_text=summary_text,
-                display_title=display_title,
-                show_category_line=show_category_line,
-            )
+            return self._render_block_telegram(view, show_category_line=show_category_line)
+        return self._render_block_text(view, show_category_line=show_category_line)
 
+    def _render_block_text(self, view: NewsView, *, show_category_line: bool) -> str:
         block: List[str] = []
-        if show_category_line and category:
-            block.append(f"[{category}]")
-        title_line = self._render_plain_title_with_link(item, display_title)
+        if show_category_line and view.category:
+            block.append(f"[{view.category}]")
         block.extend(
             [
-                title_line,
-                f"🌍 关键词：{keywords_text or '未标注'}",
-                f"🕒 {publish_time_display or '未知时间'} | 🏷 {source}",
+                self._render_plain_title_with_link(view.item, view.display_title),
+                f"🌍 关键词：{view.keywords_text or '未标注'}",
+                f"🕒 {view.publish_time or '未知时间'} | 🏷 {view.source}",
             ]
         )
         if self.display_summary:
-            block.extend(["", "摘要：", summary_text])
+            block.extend(["", "摘要：", view.summary_text])
         block.extend(
             [
                 "",
-                sentiment_line or "",
-                f"*实体*: {'、'.join(entity_items)}" if entity_items else "",
+                view.sentiment_line or "",
+                f"*实体*: {'、'.join(view.entity_items)}" if view.entity_items else "",
             ]
         )
         block_lines = [line for line in block if line]
@@ -324,40 +744,27 @@ class NotificationClient:
             payload = {"msgtype": "text", "text": {"content": text}}
         return self._post_json(webhook, payload)
 
-    def _render_block_telegram(
-        self,
-        *,
-        item: NewsRecord,
-        category: Optional[str],
-        keywords_text: str,
-        publish_time: Optional[str],
-        source: str,
-        sentiment_line: Optional[str],
-        entity_items: List[str],
-        summary_text: str,
-        display_title: str,
-        show_category_line: bool,
-    ) -> str:
+    def _render_block_telegram(self, view: NewsView, *, show_category_line: bool) -> str:
         def esc(value: Optional[str]) -> str:
             return html.escape(value or "")
 
         lines: List[str] = []
-        if show_category_line and category:
-            lines.append(f"[{esc(category)}]")
+        if show_category_line and view.category:
+            lines.append(f"[{esc(view.category)}]")
         lines.extend(
             [
-                self._render_title_with_link(item, esc, display_title),
-                f"🌍 关键词：{esc(keywords_text) or '未标注'}",
-                f"🕒 {esc(publish_time or '未知时间')} | 🏷 {esc(source)}",
+                self._render_title_with_link(view.item, esc, view.display_title),
+                f"🌍 关键词：{esc(view.keywords_text) or '未标注'}",
+                f"🕒 {esc(view.publish_time or '未知时间')} | 🏷 {esc(view.source)}",
             ]
         )
         if self.display_summary:
-            lines.extend(["", "<b>摘要：</b>", esc(summary_text)])
+            lines.extend(["", "<b>摘要：</b>", esc(view.summary_text)])
         lines.extend(
             [
                 "",
-                sentiment_line or "",
-                f"<b>实体</b>: {'、'.join(esc(item) for item in entity_items)}" if entity_items else "",
+                view.sentiment_line or "",
+                f"<b>实体</b>: {'、'.join(esc(item) for item in view.entity_items)}" if view.entity_items else "",
             ]
         )
         return "\n".join(filter(None, lines))
@@ -438,9 +845,10 @@ class NotificationClient:
         if not text:
             return []
         keywords: List[str] = []
-        if jieba_analyse is not None:
+        extractor = keyword_extractor()
+        if extractor is not None:
             try:
-                keywords = [kw for kw in jieba_analyse.extract_tags(text, topK=max_keywords) if kw]
+                keywords = [kw for kw in extractor.extract_tags(text, topK=max_keywords) if kw]
             except Exception:  # pragma: no cover
                 keywords = []
         if keywords:
@@ -481,7 +889,7 @@ class NotificationClient:
             logging.warning("通知 webhook(%s) 请求失败: %s", url, exc)
             return False
 
-    def _send_email(self, subject: str, body: str) -> bool:
+    def _send_email(self, subject: str, body: str, subtype: str = "plain") -> bool:
         smtp_server = self.email.get("smtp_server") or "smtp.qq.com"
         smtp_port = int(self.email.get("smtp_port") or 465)
         sender = self.email.get("from")
@@ -489,21 +897,21 @@ class NotificationClient:
         recipients = [addr.strip() for addr in self.email.get("to", "").split(",") if addr.strip()]
         if not sender or not password or not recipients:
             return False
-        message = MIMEText(body, "plain", "utf-8")
+        message = MIMEText(body, subtype, "utf-8")
         message["Subject"] = subject
         message["From"] = sender
         message["To"] = ", ".join(recipients)
-        try:
-            if smtp_port == 465:
-                server = smtplib.SMTP_SSL(smtp_server, smtp_port)
+        timeout = self.channel_timeouts.get("email", self.channel_timeout)
+        if self._email_transport is None:
+            if self.email_keep_alive:
+                self._email_transport = shared_email_transport(smtp_server, smtp_port, sender, password, timeout)
             else:
-                server = smtplib.SMTP(smtp_server, smtp_port)
-                server.starttls()
-            with server:
-                server.login(sender, password)
-                server.sendmail(sender, recipients, message.as_string())
+                self._email_transport = EmailTransport(smtp_server, smtp_port, sender, password, timeout=timeout)
+        try:
+            self._email_transport.send(message, recipients)
             return True
-        except Exception:
+        except Exception as exc:  # noqa: BLE001
+            logging.warning("邮件发送失败: %s", exc)
             return False
 
     def _post_json(self, url: str, payload: dict) -> bool:
@@ -0,0 +1,380 @@
+"""持久化的通知发件箱：消息先落库再发送，支持渠道限流、指数退避重试与崩溃后续发。"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from deduper import SQLiteDeduper, make_news_id
+from fetcher.base_fetcher import NewsRecord
+from notifications import DispatchResult, NotificationClient
+from utils.config_loader import DEFAULT_CONFIG_PATH
+from utils.settings import OutboxSettings, get_config
+
+logger = logging.getLogger(__name__)
+
+# 每分钟条数与突发容量，参考各平台机器人的频率限制
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    "telegram": (20.0, 3.0),
+    "wechat_work": (20.0, 5.0),
+    "dingtalk": (20.0, 5.0),
+    "feishu": (100.0, 5.0),
+}
+
+
+class TokenBucket:
+    """令牌桶限流；acquire 在等待会超过 deadline 时直接返回 False。"""
+
+    def __init__(
+        self,
+        per_minute: float,
+        burst: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = max(per_minute, 0.0) / 60.0
+        self.capacity = max(burst, 1.0)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline: Optional[float] = None) -> bool:
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            self.tokens -= 1
+        if wait > 0:
+            self.sleep(wait)
+        return True
+
+
+@dataclass
+class OutboxMessage:
+    id: int
+    channel: str
+    body: str
+    attempts: int
+    idempotency_key: str
+
+    def __bool__(self) -> bool:
+        return bool(self.body)
+
+
+class NotificationOutbox:
+    """把渲染好的消息写入 state 数据库，再按渠道限流发送；只有投递确认后新闻才会被标记为已处理。"""
+
+    def __init__(
+        self,
+        db_path: Path,
+        config_path: Optional[Path] = None,
+        *,
+        settings: Optional[OutboxSettings] = None,
+    ) -> None:
+        cfg = settings or get_config(config_path or DEFAULT_CONFIG_PATH).notification.outbox
+        self.enabled = cfg.enabled
+        self.max_attempts = cfg.max_attempts
+        self.base_delay_sec = cfg.base_delay_sec
+        self.max_delay_sec = cfg.max_delay_sec
+        self.drain_timeout_sec = cfg.drain_timeout_sec
+        self.retention_days = cfg.retention_days
+        self.buckets: Dict[str, TokenBucket] = {}
+        for channel in set(DEFAULT_RATE_LIMITS) | set(cfg.rate_limits):
+            per_minute, burst = DEFAULT_RATE_LIMITS.get(channel, (0.0, 1.0))
+            override = cfg.rate_limits.get(channel)
+            if override is not None:
+                per_minute = per_minute if override.per_minute is None else override.per_minute
+                burst = burst if override.burst is None else override.burst
+            self.buckets[channel] = TokenBucket(per_minute, burst)
+        self.db_path = db_path
+        if not db_path.parent.exists():
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # 正在发送、结果尚未记录的消息；渠道超时后发送线程可能仍在进行，期间不得重试以免重复投递
+        self._in_flight: Set[int] = set()
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS notification_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                idempotency_key TEXT UNIQUE,
+                channel TEXT,
+                body TEXT,
+                status TEXT DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                next_attempt_at REAL DEFAULT 0,
+                last_error TEXT,
+                created_at TEXT,
+                updated_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS notification_outbox_news (
+                idempotency_key TEXT,
+                news_id TEXT,
+                source TEXT,
+                title TEXT,
+                url TEXT,
+                settled INTEGER DEFAULT 0,
+                PRIMARY KEY (idempotency_key, news_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_outbox_status ON notification_outbox(status, next_attempt_at);
+            """
+        )
+        self.conn.commit()
+        self.prune()
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    # ------------------------------------------------------------------ 入队
+    def enqueue(self, rendered: Dict[str, List[Tuple[str, List[NewsRecord]]]]) -> Set[str]:
+        """写入各渠道的消息，返回仍在等待投递的新闻 ID。
+
+        幂等键由渠道、消息包含的新闻以及该组新闻的分片序号决定：同一批新闻重复入队不会重复发送，
+        超长新闻切分出的多条消息各自入队。
+        """
+
+        now = datetime.now(timezone.utc).isoformat()
+        added = 0
+        with self._lock:
+            for channel, messages in rendered.items():
+                parts: Dict[Tuple[str, ...], int] = {}
+                for body, records in messages:
+                    if not body:
+                        continue
+                    news = [(make_news_id(record), record) for record in records]
+                    news_ids = tuple(sorted(news_id for news_id, _ in news))
+                    part = parts.get(news_ids, 0)
+                    parts[news_ids] = part + 1
+                    key = self._idempotency_key(channel, news_ids, part)
+                    cur = self.conn.execute(
+                        """
+                        INSERT OR IGNORE INTO notification_outbox
+                            (idempotency_key, channel, body, created_at, updated_at)
+                        VALUES (?, ?, ?, ?, ?)
+                        """,
+                        (key, channel, body, now, now),
+                    )
+                    added += cur.rowcount
+                    self.conn.executemany(
+                        """
+                        INSERT OR IGNORE INTO notification_outbox_news (idempotency_key, news_id, source, title, url)
+                        VALUES (?, ?, ?, ?, ?)
+                        """,
+                        [(key, news_id, record.source, record.title, record.url) for news_id, record in news],
+                    )
+            self.conn.commit()
+        if added:
+            logger.info("通知发件箱新增 %d 条消息", added)
+        return self.pending_news_ids()
+
+    def pending_news_ids(self) -> Set[str]:
+        with self._lock:
+            cur = self.conn.execute("SELECT DISTINCT news_id FROM notification_outbox_news WHERE settled = 0")
+            return {row[0] for row in cur.fetchall()}
+
+    # ------------------------------------------------------------------ 发送
+    def drain(self, notifier: NotificationClient) -> DispatchResult:
+        """发送所有到期消息；在 drain_timeout_sec 内等待退避中的消息重试。"""
+
+        started = time.monotonic()
+        deadline = started + self.drain_timeout_sec
+        total = DispatchResult()
+        while True:
+            due = self._due_messages()
+            attempted = [0]
+            if due:
+                jobs = []
+                for channel, messages in due.items():
+                    sender = notifier.channel_sender(channel)
+                    if sender is None:
+                        self._give_up(messages, "渠道未配置")
+                        continue
+                    jobs.append((channel, messages, self._outbox_sender(channel, sender, deadline, attempted)))
+                self._merge(total, notifier.dispatch(jobs))
+            wait = self._next_due_in()
+            if not attempted[0] or wait is None or time.monotonic() + wait > deadline:
+                break
+            if wait > 0:
+                time.sleep(wait)
+        total.elapsed = time.monotonic() - started
+        remaining = self._count_pending()
+        if remaining:
+            logger.warning("通知发件箱仍有 %d 条消息待发送，将在下次运行时重试", remaining)
+        return total
+
+    def _outbox_sender(
+        self,
+        channel: str,
+        sender: Callable[[str], bool],
+        deadline: float,
+        attempted: List[int],
+    ) -> Callable[[OutboxMessage], bool]:
+        bucket = self.buckets.get(channel)
+
+        def send(message: OutboxMessage) -> bool:
+            if bucket is not None and not bucket.acquire(deadline):
+                raise RuntimeError("限流等待超过发送时限，留待下次发送")
+            attempted[0] += 1
+            with self._lock:
+                self._in_flight.add(message.id)
+            error: Optional[str] = None
+            try:
+                delivered = bool(sender(message.body))
+                if not delivered:
+                    error = "发送失败"
+            except Exception as exc:  # noqa: BLE001
+                delivered = False
+                error = str(exc) or exc.__class__.__name__
+            try:
+                self._record_attempt(message, delivered, error)
+            finally:
+                with self._lock:
+                    self._in_flight.discard(message.id)
+            return delivered
+
+        return send
+
+    def _record_attempt(self, message: OutboxMessage, delivered: bool, error: Optional[str]) -> None:
+        now_iso = datetime.now(timezone.utc).isoformat()
+        attempts = message.attempts + 1
+        if delivered:
+            status, next_attempt_at = "sent", 0.0
+        elif attempts >= self.max_attempts:
+            status, next_attempt_at = "failed", 0.0
+            logger.error(
+                "通知[%s]消息 #%d 重试 %d 次仍失败，已放弃: %s", message.channel, message.id, attempts, error
+            )
+        else:
+            status = "pending"
+            next_attempt_at = time.time() + min(self.max_delay_sec, self.base_delay_sec * 2 ** (attempts - 1))
+        with self._lock:
+            try:
+                self.conn.execute(
+                    """
+                    UPDATE notification_outbox
+                    SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (status, attempts, next_attempt_at, error, now_iso, message.id),
+                )
+                self.conn.commit()
+            except sqlite3.ProgrammingError:
+                logger.warning("通知发件箱已关闭，消息 #%d 的发送结果未能记录", message.id)
+
+    def _give_up(self, messages: Sequence[OutboxMessage], reason: str) -> None:
+        for message in messages:
+            logger.warning("通知[%s]消息 #%d 无法发送: %s", message.channel, message.id, reason)
+        with self._lock:
+            self.conn.executemany(
+                "UPDATE notification_outbox SET status = 'failed', last_error = ? WHERE id = ?",
+                [(reason, message.id) for message in messages],
+            )
+            self.conn.commit()
+
+    def _due_messages(self) -> "OrderedDict[str, List[OutboxMessage]]":
+        with self._lock:
+            cur = self.conn.execute(
+                """
+                SELECT id, channel, body, attempts, idempotency_key FROM notification_outbox
+                WHERE status = 'pending' AND next_attempt_at <= ?
+                ORDER BY id
+                """,
+                (time.time(),),
+            )
+            rows = [row for row in cur.fetchall() if row[0] not in self._in_flight]
+        grouped: "OrderedDict[str, List[OutboxMessage]]" = OrderedDict()
+        for row in rows:
+            message = OutboxMessage(*row)
+            grouped.setdefault(message.channel, []).append(message)
+        return grouped
+
+    def _next_due_in(self) -> Optional[float]:
+        with self._lock:
+            cur = self.conn.execute("SELECT id, next_attempt_at FROM notification_outbox WHERE status = 'pending'")
+            due = [next_attempt_at for message_id, next_attempt_at in cur.fetchall() if message_id not in self._in_flight]
+        if not due:
+            return None
+        return max(0.0, min(due) - time.time())
+
+    def _count_pending(self) -> int:
+        with self._lock:
+            row = self.conn.execute("SELECT COUNT(*) FROM notification_outbox WHERE status = 'pending'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _merge(self, total: DispatchResult, result: DispatchResult) -> None:
+        for channel, channel_result in result.channels.items():
+            existing = total.channels.get(channel)
+            if existing is None:
+                total.channels[channel] = channel_result
+                continue
+            existing.total += channel_result.total
+            existing.messages.extend(channel_result.messages)
+            existing.elapsed += channel_result.elapsed
+            existing.timed_out = existing.timed_out or channel_result.timed_out
+
+    # ------------------------------------------------------------------ 结算
+    def settle(self, deduper: SQLiteDeduper) -> int:
+        """把所有消息都已投递（或已放弃）的新闻标记为已处理，返回标记数量。"""
+
+        with self._lock:
+            cur = self.conn.execute(
+                """
+                SELECT news_id, MAX(source), MAX(title), MAX(url) FROM notification_outbox_news
+                WHERE settled = 0 AND news_id NOT IN (
+                    SELECT n.news_id FROM notification_outbox_news n
+                    JOIN notification_outbox o ON o.idempotency_key = n.idempotency_key
+                    WHERE o.status = 'pending'
+                )
+                GROUP BY news_id
+                """
+            )
+            rows = cur.fetchall()
+            for news_id, source, title, url in rows:
+                deduper.mark_id(news_id, source, title, url)
+            self.conn.executemany(
+                "UPDATE notification_outbox_news SET settled = 1 WHERE news_id = ?",
+                [(row[0],) for row in rows],
+            )
+            self.conn.commit()
+        return len(rows)
+
+    def prune(self) -> None:
+        if self.retention_days <= 0:
+            return
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=self.retention_days)).isoformat()
+        with self._lock:
+            self.conn.execute(
+                """
+                DELETE FROM notification_outbox_news WHERE settled = 1 AND idempotency_key IN (
+                    SELECT idempotency_key FROM notification_outbox WHERE status != 'pending' AND updated_at < ?
+                )
+                """,
+                (cutoff,),
+            )
+            self.conn.execute(
+                "DELETE FROM notification_outbox WHERE status != 'pending' AND updated_at < ?",
+                (cutoff,),
+            )
+            self.conn.commit()
+
+    # ------------------------------------------------------------------ 工具
+    def _idempotency_key(self, channel: str, news_ids: Sequence[str], part: int = 0) -> str:
+        base = channel + "\n" + ",".join(sorted(news_ids))
+        if part:
+            base += f"\n#{part}"
+        return hashlib.sha1(base.encode("utf-8")).hexdigest()
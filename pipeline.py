@@ -0,0 +1,592 @@
+"""常驻流水线：在调度的多次执行之间复用数据库连接、过滤规则、AI 客户端与抓取器实例。"""
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Type
+
+from aggregator import NotificationAggregator
+from ai import AIClient, AICombinedProcessor, AISummary, AISummaryFilter, AIPreFilter, AIWorkQueue
+from ai.usage import UsageTotals
+from deduper import SQLiteDeduper, make_news_id
+from fetcher import BaseNewsFetcher, NewsRecord, collect_news
+from fetcher.sources import SourceConfig
+from filters import FilterSet
+from notifications import NotificationClient, warm_up_keywords
+from outbox import NotificationOutbox
+from utils.config_loader import DEFAULT_CONFIG_PATH, load_settings
+from utils.metrics import REGISTRY
+from utils.settings import Settings, get_config
+from utils.storage import SQLiteStorage
+from utils.time_utils import get_timezone_helper
+from utils.timestamps import normalize_timestamp
+
+DEFAULT_DB_PATH = Path("state") / "news.db"
+
+# 阶段标题 -> 指标的 stage 标签
+STAGE_LABELS: Dict[str, str] = {
+    "抓取": "fetch",
+    "去重": "dedup",
+    "AI 预过滤": "prefilter",
+    "关键词过滤": "filter",
+    "AI 摘要": "summary",
+    "AI 后置过滤": "postfilter",
+    "通知推送": "notify",
+}
+STAGE_SECONDS = REGISTRY.histogram("radarflow_stage_duration_seconds", "流水线各阶段耗时", ("stage",))
+STAGE_ITEMS = REGISTRY.gauge("radarflow_stage_items", "最近一轮进入各阶段的新闻条数", ("stage",))
+PIPELINE_RUNS = REGISTRY.counter("radarflow_pipeline_runs_total", "流水线运行次数", ("status",))
+LAST_RUN = REGISTRY.gauge("radarflow_pipeline_last_run_timestamp_seconds", "最近一轮流水线结束的 Unix 时间", ("status",))
+
+
+# 组件 -> 其依赖的配置段；热更新时只有取值发生变化的组件会被重建
+COMPONENT_SECTIONS: Dict[str, Callable[[Settings], Any]] = {
+    "outbox": lambda config: config.notification.outbox,
+    "aggregator": lambda config: config.notification.aggregation,
+    "ai_queue": lambda config: config.ai.queue,
+    "filter_set": lambda config: config.filters,
+    "ai_prefilter": lambda config: config.ai_prefilter,
+    "ai_filter": lambda config: config.ai_filter,
+    "ai_client": lambda config: (replace(config.ai, queue=None), config.timezone),
+    "notifier": lambda config: (replace(config.notification, outbox=None, aggregation=None), config.timezone),
+}
+
+
+def _fetcher_sections(config: Settings) -> Tuple[Any, ...]:
+    """抓取器实例（及其 HTTP 会话）只在这些配置段变化时丢弃。"""
+    return config.sources, config.sources_configured, config.fetching
+
+
+class RunCancelled(RuntimeError):
+    """调度器的看门狗要求取消本轮任务。"""
+
+
+def log_section(title: str) -> None:
+    logging.info("%s %s %s", "=" * 12, title, "=" * 12)
+
+
+def _check_cancel(cancel: Optional[threading.Event], stage: str) -> None:
+    if cancel is not None and cancel.is_set():
+        raise RunCancelled(f"任务在「{stage}」阶段前被取消")
+
+
+class StageTimer:
+    """依次进入各阶段：进入前检查取消，进入下一阶段或结束时记录上一阶段的耗时。"""
+
+    def __init__(self, cancel: Optional[threading.Event] = None) -> None:
+        self.cancel = cancel
+        self.durations: Dict[str, float] = {}
+        self._current: Optional[Tuple[str, float]] = None
+
+    def enter(self, title: str, items: int) -> None:
+        _check_cancel(self.cancel, title)
+        self.finish()
+        log_section(title)
+        STAGE_ITEMS.set(items, stage=STAGE_LABELS.get(title, title))
+        self._current = (title, time.perf_counter())
+
+    def finish(self) -> None:
+        if self._current is None:
+            return
+        title, started = self._current
+        self._current = None
+        elapsed = time.perf_counter() - started
+        self.durations[title] = elapsed
+        STAGE_SECONDS.observe(elapsed, stage=STAGE_LABELS.get(title, title))
+
+    def describe(self) -> str:
+        return "，".join(f"{title} {elapsed:.2f}s" for title, elapsed in self.durations.items())
+
+
+@dataclass
+class PipelineComponents:
+    """一次构建、多轮复用的流水线组件。"""
+
+    deduper: SQLiteDeduper
+    storage: SQLiteStorage
+    outbox: NotificationOutbox
+    aggregator: NotificationAggregator
+    ai_queue: AIWorkQueue
+    filter_set: FilterSet
+    ai_prefilter: AIPreFilter
+    ai_filter: AISummaryFilter
+    ai_client: AIClient
+    combined: AICombinedProcessor
+    notifier: NotificationClient
+
+    @classmethod
+    def build(
+        cls,
+        db_path: Path,
+        config: Settings,
+        notifier: Optional[NotificationClient] = None,
+    ) -> "PipelineComponents":
+        ai_prefilter = AIPreFilter()
+        ai_client = AIClient()
+        return cls(
+            deduper=SQLiteDeduper(db_path, retention_days=3),
+            storage=SQLiteStorage(db_path),
+            outbox=NotificationOutbox(db_path, settings=config.notification.outbox),
+            aggregator=NotificationAggregator(db_path, settings=config.notification.aggregation),
+            ai_queue=AIWorkQueue(db_path, settings=config.ai.queue),
+            filter_set=FilterSet(),
+            ai_prefilter=ai_prefilter,
+            ai_filter=AISummaryFilter(),
+            ai_client=ai_client,
+            combined=AICombinedProcessor(ai_prefilter, ai_client),
+            notifier=notifier or NotificationClient(),
+        )
+
+    def refresh(
+        self,
+        db_path: Path,
+        previous: Settings,
+        config: Settings,
+        *,
+        keep_notifier: bool = False,
+    ) -> List[str]:
+        """配置热更新后只重建所依赖配置段有变化的组件，返回被重建的组件名。
+
+        去重与存储只依赖数据库，不随配置重建；注入的通知客户端由调用方管理，同样保留。"""
+        factories: Dict[str, Callable[[], Any]] = {
+            "outbox": lambda: NotificationOutbox(db_path, settings=config.notification.outbox),
+            "aggregator": lambda: NotificationAggregator(db_path, settings=config.notification.aggregation),
+            "ai_queue": lambda: AIWorkQueue(db_path, settings=config.ai.queue),
+            "filter_set": FilterSet,
+            "ai_prefilter": AIPreFilter,
+            "ai_filter": AISummaryFilter,
+            "ai_client": AIClient,
+            "notifier": NotificationClient,
+        }
+        rebuilt: List[str] = []
+        for name, sections in COMPONENT_SECTIONS.items():
+            if name == "notifier" and keep_notifier:
+                continue
+            if sections(previous) == sections(config):
+                continue
+            stale = getattr(self, name)
+            setattr(self, name, factories[name]())
+            close = getattr(stale, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as exc:  # noqa: BLE001
+                    logging.debug("关闭流水线组件失败: %s", exc)
+            rebuilt.append(name)
+        if "ai_prefilter" in rebuilt or "ai_client" in rebuilt:
+            self.combined = AICombinedProcessor(self.ai_prefilter, self.ai_client)
+            rebuilt.append("combined")
+        return rebuilt
+
+    def connections(self) -> List[sqlite3.Connection]:
+        return [self.deduper.conn, self.storage.conn, self.outbox.conn, self.aggregator.conn, self.ai_queue.conn]
+
+    def begin_run(self) -> None:
+        """每轮开始时清理过期记录，并清空按轮统计的 token 用量与过滤统计。"""
+        self.deduper.prune()
+        self.outbox.prune()
+        self.ai_queue.prune()
+        self.ai_prefilter.usage_totals = UsageTotals()
+        self.ai_client.usage_totals = UsageTotals()
+        self.filter_set.reset_stats()
+
+    def close(self) -> None:
+        self.notifier.close()
+        for closer in (
+            self.ai_client.close,
+            self.ai_prefilter.close,
+            self.ai_queue.close,
+            self.aggregator.close,
+            self.outbox.close,
+            self.storage.close,
+            self.deduper.close,
+        ):
+            try:
+                closer()
+            except Exception as exc:  # noqa: BLE001
+                logging.debug("关闭流水线组件失败: %s", exc)
+
+
+class NewsPipeline:
+    """调度器持有的常驻流水线。
+
+    组件在首次运行时构建，之后每轮先做健康检查；数据库连接失效或某轮执行异常时整体重建，
+    抓取器实例（及其 HTTP 会话）也随之丢弃。配置热更新时只重建依赖配置段有变化的组件，
+    抓取器仅在 sources/fetching 变化时丢弃。"""
+
+    def __init__(
+        self,
+        db_path: Path = DEFAULT_DB_PATH,
+        config_path: Optional[Path] = None,
+        *,
+        notifier: Optional[NotificationClient] = None,
+    ) -> None:
+        self.db_path = db_path
+        self.config_path = config_path or DEFAULT_CONFIG_PATH
+        self._notifier = notifier
+        self._components: Optional[PipelineComponents] = None
+        self._settings: Optional[Dict[str, Any]] = None
+        self._config: Optional[Settings] = None
+        self._fetchers: Dict[Type[BaseNewsFetcher], BaseNewsFetcher] = {}
+        self.builds = 0
+
+    def run(
+        self,
+        fetcher_classes: Optional[Sequence[Type[BaseNewsFetcher]]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> List[NewsRecord]:
+        """抓取指定的新闻源（默认全部默认抓取器）并交给流水线处理，返回本轮去重后的新增新闻。"""
+        components = self.components()
+        if components.notifier.enabled:
+            # jieba 词典加载较慢，在抓取期间于后台线程预热
+            warm_up_keywords()
+        sources = SourceConfig(get_config(self.config_path))
+        with STAGE_SECONDS.time(stage=STAGE_LABELS["抓取"]):
+            news = collect_news(fetcher_classes, instances=self._fetchers, sources=sources)
+        logging.info("共拉取 %d 条新闻", len(news))
+        return self.process(news, cancel)
+
+    def components(self) -> PipelineComponents:
+        """返回可用的组件；首次调用、配置已热更新或健康检查失败时重新构建。"""
+        settings = load_settings(self.config_path)
+        # 配置不合法时在抓取之前失败，并列出全部问题
+        config = get_config(self.config_path)
+        if self._components is not None and settings is not self._settings and self._config is not None:
+            rebuilt = self._components.refresh(
+                self.db_path, self._config, config, keep_notifier=self._notifier is not None
+            )
+            if _fetcher_sections(self._config) != _fetcher_sections(config):
+                self._close_fetchers()
+                rebuilt.append("fetchers")
+            logging.info("配置已更新，重建流水线组件: %s", "、".join(rebuilt) or "无")
+            self._settings, self._config = settings, config
+        if self._components is not None and not self.healthy():
+            logging.warning("流水线健康检查失败，重建组件。")
+            self.reset()
+        if self._components is None:
+            self._components = PipelineComponents.build(self.db_path, config, self._notifier)
+            self._settings, self._config = settings, config
+            self.builds += 1
+        return self._components
+
+    def healthy(self) -> bool:
+        if self._components is None:
+            return False
+        try:
+            for conn in self._components.connections():
+                conn.execute("SELECT 1").fetchone()
+        except sqlite3.Error as exc:
+            logging.warning("数据库连接不可用: %s", exc)
+            return False
+        return True
+
+    def reset(self) -> None:
+        """关闭全部组件与抓取器会话，下一轮重新构建。"""
+        components, self._components = self._components, None
+        self._settings = self._config = None
+        if components is not None:
+            components.close()
+        self._close_fetchers()
+
+    def _close_fetchers(self) -> None:
+        fetchers, self._fetchers = self._fetchers, {}
+        for fetcher in fetchers.values():
+            close = getattr(getattr(fetcher, "session", None), "close", None)
+            if callable(close):
+                close()
+
+    def close(self) -> None:
+        self.reset()
+
+    def process(self, news: List[NewsRecord], cancel: Optional[threading.Event] = None) -> List[NewsRecord]:
+        """去重→AI 预过滤→关键词过滤→AI 摘要→AI 后置过滤→通知，各新闻源的调度共用这一流水线。"""
+        components = self.components()
+        components.begin_run()
+        deduper = components.deduper
+        storage = components.storage
+        outbox = components.outbox
+        aggregator = components.aggregator
+        ai_queue = components.ai_queue
+        filter_set = components.filter_set
+        ai_prefilter = components.ai_prefilter
+        ai_filter = components.ai_filter
+        ai_client = components.ai_client
+        combined = components.combined
+        notifier = components.notifier
+        tz_helper = get_timezone_helper()
+        for item in news:
+            if item.published_utc is None and item.published_at:
+                # 未经 collect_news 抓取的记录在此补做解析
+                item.published_utc = normalize_timestamp(item.published_at, item.source)
+            if item.published_utc is not None:
+                converted = tz_helper.to_iso(item.published_utc)
+                if isinstance(item.raw, dict):
+                    item.raw.setdefault("original_published_at", item.published_at)
+                    item.raw["published_at"] = converted
+                item.published_at = converted
+        for item in news:
+            timestamp_raw = item.published_at or (item.raw.get("timestamp") if isinstance(item.raw, dict) else None)
+            timestamp = tz_helper.to_display(item.published_utc or timestamp_raw) or timestamp_raw or "未知时间"
+            authors = ", ".join(item.authors) if getattr(item, "authors", None) else None
+            logging.info(
+                "%s - %s | 📅 %s | ✍️ %s",
+                item.source,
+                item.title,
+                timestamp,
+                authors or "未知作者",
+            )
+
+        stages = StageTimer(cancel)
+        try:
+            stages.enter("去重", len(news))
+            fresh_news = deduper.filter_new(news)
+            awaiting_ids: Set[str] = set()
+            if outbox.enabled:
+                awaiting_ids |= outbox.pending_news_ids()
+            if aggregator.enabled:
+                awaiting_ids |= aggregator.pending_news_ids()
+            if awaiting_ids:
+                fresh_news = [item for item in fresh_news if make_news_id(item) not in awaiting_ids]
+            logging.info("去重后新增 %d/%d 条新闻", len(fresh_news), len(news))
+
+            has_active_rules = any(rule.enabled for rule in filter_set.rules)
+            stages.enter("AI 预过滤", len(fresh_news))
+            prefilter_active = (
+                ai_prefilter.enabled
+                and bool(ai_prefilter.api_key)
+                and filter_set.enabled
+                and has_active_rules
+            )
+            precomputed_summaries: Dict[str, AISummary] = {}
+            if prefilter_active and combined.enabled:
+                logging.info("AI 预过滤(合并模式)输入 %d 条新闻", len(fresh_news))
+                prefiltered_news, precomputed_summaries = combined.apply(
+                    fresh_news,
+                    filter_set.rules,
+                    summary_targets=_combined_summary_targets(ai_client, ai_queue, fresh_news),
+                )
+                logging.info(
+                    "AI 预过滤(合并模式)输出 %d 条新闻，其中 %d 条已生成摘要",
+                    len(prefiltered_news),
+                    len(precomputed_summaries),
+                )
+                storage.save_prefilter_verdicts(fresh_news)
+            elif prefilter_active:
+                logging.info("AI 预过滤输入 %d 条新闻", len(fresh_news))
+                prefiltered_news = ai_prefilter.apply(fresh_news, filter_set.rules, filter_set.enabled)
+                logging.info("AI 预过滤输出 %d 条新闻", len(prefiltered_news))
+                storage.save_prefilter_verdicts(fresh_news)
+            else:
+                logging.info("AI 预过滤未启用或缺少必要配置，跳过。")
+                prefiltered_news = list(fresh_news)
+
+            stages.enter("关键词过滤", len(prefiltered_news))
+            logging.info("关键词过滤输入 %d 条新闻", len(prefiltered_news))
+            filtered_news = filter_set.apply(prefiltered_news)
+
+            summaries: List[AISummary] = []
+            stages.enter("AI 摘要", len(filtered_news))
+            ready_news = [record for record in filtered_news if _record_key(record) in precomputed_summaries]
+            summaries.extend(precomputed_summaries[_record_key(record)] for record in ready_news)
+            pending_news = [
+                record
+                for record in filtered_news
+                if _record_key(record) not in precomputed_summaries
+                and not (isinstance(record.raw, dict) and record.raw.get("_ai_summary_blocked"))
+            ]
+            blocked_news = [
+                record
+                for record in filtered_news
+                if isinstance(record.raw, dict) and record.raw.get("_ai_summary_blocked")
+            ]
+            if ready_news:
+                logging.info("合并模式已生成 %d 条摘要，无需再次调用 AI", len(ready_news))
+            if ai_client.enabled and ai_client.api_key:
+                if ai_queue.enabled:
+                    pending_news, pending_summaries = _summarize_with_queue(
+                        ai_client, ai_queue, pending_news, summarized=ready_news
+                    )
+                    summaries.extend(pending_summaries)
+                elif pending_news:
+                    max_items = getattr(ai_client, "max_items", len(pending_news)) or len(pending_news)
+                    if max_items <= 0:
+                        target_count = len(pending_news)
+                    else:
+                        # 合并模式已生成的摘要计入同一上限
+                        target_count = max(0, min(max_items - len(ready_news), len(pending_news)))
+                    ai_targets = pending_news[:target_count]
+                    logging.info("AI 将处理 %d 条新闻", len(ai_targets))
+                    summaries.extend(ai_client.summarize_news(ai_targets))
+            else:
+                logging.info("AI 摘要未启用或无可处理新闻，跳过。")
+            filtered_news = ready_news + pending_news + blocked_news
+            for stage, totals in (("AI 预过滤", ai_prefilter.usage_totals), ("AI 摘要", ai_client.usage_totals)):
+                snapshot = totals.snapshot()
+                if snapshot["calls"]:
+                    logging.info(
+                        "%s token 用量: 调用 %d 次 prompt=%d completion=%d cached=%d (缓存命中率 %.0f%%)",
+                        stage,
+                        snapshot["calls"],
+                        snapshot["prompt"],
+                        snapshot["completion"],
+                        snapshot["cached"],
+                        snapshot["cache_hit_rate"] * 100,
+                    )
+
+            blocked_by_ai = [
+                record
+                for record in filtered_news
+                if isinstance(record.raw, dict) and record.raw.get("_ai_summary_blocked")
+            ]
+            if blocked_by_ai:
+                filtered_news = [
+                    record
+                    for record in filtered_news
+                    if not (isinstance(record.raw, dict) and record.raw.get("_ai_summary_blocked"))
+                ]
+                logging.warning("AI 摘要阶段拦截 %d 条新闻，已跳过后续流程。", len(blocked_by_ai))
+
+            summary_map = {
+                (summary.url or f"{summary.source}-{summary.title}"): summary
+                for summary in (summaries or [])
+            }
+            stages.enter("AI 后置过滤", len(filtered_news))
+            logging.info("AI 后置过滤输入 %d 条新闻", len(filtered_news))
+            post_filtered_news, post_filtered_summary_map = ai_filter.apply(filtered_news, summary_map)
+            logging.info("AI 后置过滤输出 %d 条新闻", len(post_filtered_news))
+
+            storage.save_news(filtered_news, summary_map)
+
+            stages.enter("通知推送", len(post_filtered_news))
+            to_notify, to_notify_summaries = post_filtered_news, post_filtered_summary_map
+            buffered_ids: Set[str] = set()
+            if aggregator.enabled and notifier.enabled:
+                added = aggregator.add(post_filtered_news, post_filtered_summary_map)
+                reason = aggregator.flush_reason()
+                if reason:
+                    to_notify, to_notify_summaries = aggregator.take()
+                    logging.info("聚合窗口触发推送(%s)，合并 %d 条新闻", reason, len(to_notify))
+                else:
+                    to_notify, to_notify_summaries = [], {}
+                    buffered_ids = aggregator.pending_news_ids()
+                    logging.info("聚合窗口未结束，本轮缓冲 %d 条，累计 %d 条", added, len(buffered_ids))
+            logging.info("将推送 %d 条新闻", len(to_notify))
+            try:
+                if outbox.enabled and notifier.enabled:
+                    awaiting_ids = set(buffered_ids)
+                    if to_notify:
+                        awaiting_ids |= outbox.enqueue(notifier.render(to_notify, to_notify_summaries))
+                        if aggregator.enabled:
+                            aggregator.discard(to_notify)
+                    results = outbox.drain(notifier)
+                    for item in fresh_news:
+                        if make_news_id(item) not in awaiting_ids:
+                            deduper.mark(item)
+                    settled = outbox.settle(deduper)
+                    if settled:
+                        logging.info("通知发件箱确认投递 %d 条新闻", settled)
+                else:
+                    results = notifier.send(to_notify, to_notify_summaries)
+                    if aggregator.enabled:
+                        aggregator.discard(to_notify)
+                    for item in [*fresh_news, *to_notify]:
+                        if make_news_id(item) not in buffered_ids:
+                            deduper.mark(item)
+                if results:
+                    logging.info("通知发送结果: %s", results.summary())
+                    logging.info("通知发送耗时: %s", results.describe())
+            finally:
+                notifier.close()
+        except RunCancelled:
+            _record_run("cancelled")
+            raise
+        except Exception:
+            _record_run("error")
+            logging.warning("流水线执行失败，常驻组件将在下一轮重建。")
+            self.reset()
+            raise
+        finally:
+            stages.finish()
+            if stages.durations:
+                logging.info("各阶段耗时: %s", stages.describe())
+        _record_run("ok")
+        return fresh_news
+
+
+def _record_run(status: str) -> None:
+    PIPELINE_RUNS.inc(status=status)
+    LAST_RUN.set(time.time(), status=status)
+
+
+def _record_key(record: NewsRecord) -> str:
+    return record.url or f"{record.source}-{record.title}"
+
+
+def _estimate_tokens(ai_client: AIClient, ai_queue: AIWorkQueue) -> Callable[[NewsRecord], int]:
+    return lambda record: ai_client.estimate_tokens(record, ai_queue.chars_per_token, ai_queue.completion_tokens)
+
+
+def _combined_summary_targets(
+    ai_client: AIClient,
+    ai_queue: AIWorkQueue,
+    records: Sequence[NewsRecord],
+) -> Optional[Set[int]]:
+    """挑选合并模式中允许顺带生成摘要的新闻，使其受 ai.max_items 与 AI 队列预算约束；None 表示不限制。"""
+
+    if ai_queue.enabled:
+        selected, leftovers = ai_queue.plan(
+            records, max_items=ai_client.max_items, estimate_tokens=_estimate_tokens(ai_client, ai_queue)
+        )
+        if not leftovers:
+            return None
+        targets = {id(item.record) for item in selected}
+    elif ai_client.max_items > 0 and len(records) > ai_client.max_items:
+        targets = {id(record) for record in records[: ai_client.max_items]}
+    else:
+        return None
+    logging.info("AI 预过滤(合并模式)只为 %d/%d 条新闻请求摘要，其余只做相关性判定", len(targets), len(records))
+    return targets
+
+
+def _summarize_with_queue(
+    ai_client: AIClient,
+    ai_queue: AIWorkQueue,
+    filtered_news: List[NewsRecord],
+    summarized: Sequence[NewsRecord] = (),
+) -> Tuple[List[NewsRecord], List[AISummary]]:
+    """按优先级处理 AI 摘要，超出预算的新闻顺延到下一轮，不参与本轮推送。
+
+    summarized 为合并模式本轮已生成摘要的新闻，计入同一条数与 token 预算。"""
+
+    candidates = ai_queue.merge_pending(filtered_news)
+    if not candidates:
+        logging.info("AI 摘要无可处理新闻，跳过。")
+        return [], []
+    estimate_tokens = _estimate_tokens(ai_client, ai_queue)
+    selected, leftovers = ai_queue.plan(
+        candidates,
+        max_items=ai_client.max_items,
+        estimate_tokens=estimate_tokens,
+        spent_items=len(summarized),
+        spent_tokens=sum(estimate_tokens(record) for record in summarized),
+    )
+    ai_targets = [item.record for item in selected]
+    logging.info("AI 将处理 %d 条新闻", len(ai_targets))
+    deadline = time.monotonic() + ai_queue.time_budget_sec if ai_queue.time_budget_sec > 0 else None
+    summaries = ai_client.summarize_news(ai_targets, deadline=deadline)
+    deferred_keys = {
+        id(item.record)
+        for item in selected
+        if isinstance(item.record.raw, dict) and item.record.raw.get("_ai_deferred")
+    }
+    if deferred_keys:
+        logging.info("AI 摘要超出时间预算，%d 条新闻顺延到下一轮", len(deferred_keys))
+    processed = [record for record in ai_targets if id(record) not in deferred_keys]
+    leftovers.extend(item for item in selected if id(item.record) in deferred_keys)
+    ai_queue.complete(processed)
+    ai_queue.defer(leftovers)
+    return processed, summaries
@@ -1,26 +1,52 @@
 """简单的调度器，按 cron 规则执行抓取任务。"""
 from __future__ import annotations
 
+import argparse
+import calendar
 import logging
+import threading
 import time
-from dataclasses import dataclass
-from datetime import datetime, timedelta, tzinfo
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone, tzinfo
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Type
 
+from fetcher.aggregator import AVAILABLE_FETCHERS, DEFAULT_FETCHER_NAMES
+from fetcher.registry import load_fetchers
+from fetcher.sources import SourceConfig
+from fetcher.base_fetcher import BaseNewsFetcher, NewsRecord
 from main import main as run_once
-from utils.config_loader import DEFAULT_CONFIG_PATH, load_settings
+from notifications import close_email_transports
+from pipeline import NewsPipeline, RunCancelled
+from utils.config_loader import DEFAULT_CONFIG_PATH
+from utils.config_watcher import ConfigWatcher, validate_components
+from utils.metrics import REGISTRY, MetricsRegistry, MetricsServer
+from utils.poll_stats import PollStats
+from utils.run_lock import RunLease
+from utils.settings import (
+    AdaptiveSettings,
+    SchedulerSettings,
+    SettingsError,
+    SourceScheduleSettings,
+    get_config,
+    parse_settings,
+)
+from utils.startup_profile import print_startup_profile
 from utils.time_utils import get_timezone_helper
 
 DEFAULT_RUNTIME_CONFIG = DEFAULT_CONFIG_PATH
+DEFAULT_RELOAD_POLL_SEC = 30.0
+POLL_STATS_DB = Path("state") / "news.db"
+DEFAULT_MAX_QUEUE = 3
+CANCEL_GRACE_SEC = 30.0
+# 追赶错过的触发时最多回溯的次数，防止间隔很短的任务在长时间停机后空转
+MAX_MISSED_SCAN = 1000
+# 公历日期与星期的组合每 400 年循环一次，超过该范围仍无匹配说明表达式永远不会触发
+CRON_SEARCH_YEARS = 400
 logger = logging.getLogger(__name__)
 
 
-def load_scheduler_config(path: Path = DEFAULT_RUNTIME_CONFIG) -> Dict[str, Any]:
-    settings = load_settings(path)
-    return settings.get("scheduler", {})
-
-
 @dataclass
 class CronSchedule:
     """最简单版 cron 解析器，仅支持 5 段表达式（分 时 日 月 周）。"""
@@ -52,6 +78,10 @@ class CronSchedule:
         self.days = self._parse_field(parts[2], 1, 31)
         self.months = self._parse_field(parts[3], 1, 12)
         self.weekdays = self._parse_field(parts[4], 0, 6, self._WEEKDAY_MAP)
+        self._sorted_minutes = tuple(sorted(self.minutes))
+        self._sorted_hours = tuple(sorted(self.hours))
+        self._sorted_days = tuple(sorted(self.days))
+        self._sorted_months = tuple(sorted(self.months))
 
     def _parse_field(
         self,
@@ -118,7 +148,65 @@ class CronSchedule:
         return value
 
     def next_run(self, after: datetime) -> datetime:
-        """返回严格大于 after 的下一个触发时间（向上取整到分钟）。"""
+        """返回严格大于 after 的下一个触发时间（向上取整到分钟）。
+
+        按 月 → 日 → 时 → 分 逐段跳转求解。带时区时按当地挂钟时间匹配：
+        夏令时跳过的时刻不会触发，回拨时重复的时刻只在第一次出现时触发。"""
+
+        wall = after.replace(tzinfo=None, second=0, microsecond=0) + timedelta(minutes=1)
+        zone = after.tzinfo
+        while True:
+            candidate = self._next_wall_time(wall)
+            if zone is None:
+                return candidate
+            moment = candidate.replace(tzinfo=zone)
+            instant = moment.astimezone(timezone.utc)
+            exists = instant.astimezone(zone).replace(tzinfo=None) == candidate
+            if exists and instant > after.astimezone(timezone.utc):
+                return moment
+            wall = candidate + timedelta(minutes=1)
+
+    def _next_wall_time(self, start: datetime) -> datetime:
+        """返回不早于 start 的第一个匹配的挂钟时间（不含时区）。"""
+
+        year, month, day, hour, minute = start.year, start.month, start.day, start.hour, start.minute
+        while year <= start.year + CRON_SEARCH_YEARS:
+            next_month = _ceil(self._sorted_months, month)
+            if next_month is None:
+                year, month, day, hour, minute = year + 1, 1, 1, 0, 0
+                continue
+            if next_month != month:
+                month, day, hour, minute = next_month, 1, 0, 0
+            next_day = self._next_day(year, month, day)
+            if next_day is None:
+                month, day, hour, minute = month + 1, 1, 0, 0
+                continue
+            if next_day != day:
+                day, hour, minute = next_day, 0, 0
+            next_hour = _ceil(self._sorted_hours, hour)
+            if next_hour is None:
+                day, hour, minute = day + 1, 0, 0
+                continue
+            if next_hour != hour:
+                hour, minute = next_hour, 0
+            next_minute = _ceil(self._sorted_minutes, minute)
+            if next_minute is None:
+                hour, minute = hour + 1, 0
+                continue
+            return datetime(year, month, day, hour, next_minute)
+        raise ValueError(f"cron 表达式永远不会触发: {self.expression!r}")
+
+    def _next_day(self, year: int, month: int, day: int) -> Optional[int]:
+        last = calendar.monthrange(year, month)[1]
+        for value in self._sorted_days[bisect_left(self._sorted_days, day) :]:
+            if value > last:
+                return None
+            if (date(year, month, value).weekday() + 1) % 7 in self.weekdays:
+                return value
+        return None
+
+    def _scan_next_run(self, after: datetime) -> datetime:
+        """逐分钟扫描的参考实现，仅用于测试与基准对比。"""
 
         candidate = after.replace(second=0, microsecond=0)
         if candidate <= after:
@@ -139,24 +227,283 @@ class CronSchedule:
         )
 
 
+def _ceil(values: Tuple[int, ...], value: int) -> Optional[int]:
+    index = bisect_left(values, value)
+    return values[index] if index < len(values) else None
+
+
+@dataclass
+class IntervalSchedule:
+    """按固定间隔（秒）触发。"""
+
+    seconds: float
+
+    @property
+    def expression(self) -> str:
+        return f"every {self.seconds:g}s"
+
+    def next_run(self, after: datetime) -> datetime:
+        return after + timedelta(seconds=self.seconds)
+
+
+@dataclass
+class AdaptiveSchedule:
+    """按新闻源到达速率自适应调整的轮询间隔：突发时加速，安静时退避，始终限制在上下限之间。"""
+
+    seconds: float
+    min_seconds: float
+    max_seconds: float
+    target_items: float = 1.0
+    burst_factor: float = 2.0
+    backoff: float = 1.5
+    predicted: float = 0.0
+
+    @property
+    def expression(self) -> str:
+        return f"adaptive {self.min_seconds:g}-{self.max_seconds:g}s (当前 {self.seconds:.0f}s)"
+
+    def next_run(self, after: datetime) -> datetime:
+        return after + timedelta(seconds=self.seconds)
+
+    def update(self, new_items: int, rate: float) -> float:
+        """根据本次实际新增条数与当前时段的估计速率（条/小时）调整间隔，返回下一次的预测新增条数。"""
+        base = self.max_seconds if rate <= 0 else 3600 * self.target_items / rate
+        if new_items > self.burst_factor * max(self.predicted, self.target_items):
+            seconds = min(base, self.seconds) / 2
+        elif new_items == 0:
+            seconds = max(base, self.seconds * self.backoff)
+        else:
+            seconds = base
+        self.seconds = min(self.max_seconds, max(self.min_seconds, seconds))
+        self.predicted = rate * self.seconds / 3600
+        return self.predicted
+
+
+@dataclass
+class SourceJob:
+    """一组共用同一调度规则的抓取器；到期后抓取结果交给共享的下游流水线。"""
+
+    name: str
+    schedules: List[Any]
+    fetchers: List[Type[BaseNewsFetcher]]
+    next_time: Optional[datetime] = None
+    source_names: Set[str] = field(default_factory=set)
+
+    @property
+    def adaptive(self) -> Optional[AdaptiveSchedule]:
+        return next((schedule for schedule in self.schedules if isinstance(schedule, AdaptiveSchedule)), None)
+
+    def advance(self, now: datetime, policy: str = "skip", max_queue: int = DEFAULT_MAX_QUEUE) -> int:
+        """计算下一次触发时间，返回按错过策略丢弃的触发次数。
+
+        skip：跳过全部错过的触发；coalesce：错过的触发合并为立即执行一次；
+        queue：最多保留最近 max_queue 次错过的触发，逐次补跑。"""
+        missed: List[datetime] = []
+        candidate = self._next(self.next_time or now)
+        while candidate <= now and len(missed) < MAX_MISSED_SCAN:
+            missed.append(candidate)
+            candidate = self._next(candidate)
+        if not missed:
+            self.next_time = candidate
+            return 0
+        if policy == "coalesce":
+            self.next_time = missed[-1]
+            return len(missed) - 1
+        if policy == "queue" and max_queue > 0:
+            kept = missed[-max_queue:]
+            self.next_time = kept[0]
+            return len(missed) - len(kept)
+        self.next_time = self._next(now)
+        return len(missed)
+
+    def _next(self, after: datetime) -> datetime:
+        return min(schedule.next_run(after) for schedule in self.schedules)
+
+    def describe(self) -> str:
+        return f"{self.name}[{' | '.join(schedule.expression for schedule in self.schedules)}]"
+
+
+@dataclass
+class RunMetrics:
+    """调度运行指标：触发延迟、错过的触发与因重叠/锁/超时被跳过或取消的次数。"""
+
+    runs: int = 0
+    misfires: int = 0
+    lock_skipped: int = 0
+    overlap_skipped: int = 0
+    cancelled: int = 0
+    lag_total: float = 0.0
+    lag_max: float = 0.0
+    last_duration: float = 0.0
+    max_duration: float = 0.0
+
+    def observe_lag(self, seconds: float) -> None:
+        self.lag_total += max(0.0, seconds)
+        self.lag_max = max(self.lag_max, seconds)
+
+    def export(self, registry: MetricsRegistry) -> None:
+        """导出为 radarflow_scheduler_* 仪表盘，由指标端点在每次抓取前调用。"""
+        gauge = registry.gauge("radarflow_scheduler_events", "调度器累计事件数", ("event",))
+        for event in ("runs", "misfires", "lock_skipped", "overlap_skipped", "cancelled"):
+            gauge.set(getattr(self, event), event=event)
+        seconds = registry.gauge("radarflow_scheduler_seconds", "调度器触发延迟与运行耗时（秒）", ("kind",))
+        seconds.set(self.lag_total / self.runs if self.runs else 0.0, kind="lag_avg")
+        seconds.set(self.lag_max, kind="lag_max")
+        seconds.set(self.last_duration, kind="last_duration")
+        seconds.set(self.max_duration, kind="max_duration")
+
+    def summary(self) -> str:
+        lag_avg = self.lag_total / self.runs if self.runs else 0.0
+        return (
+            f"运行 {self.runs} 次，触发延迟 平均 {lag_avg:.1f}s / 最大 {self.lag_max:.1f}s，"
+            f"错过触发 {self.misfires} 次，锁占用跳过 {self.lock_skipped} 次，重叠跳过 {self.overlap_skipped} 次，"
+            f"超时取消 {self.cancelled} 次，本次耗时 {self.last_duration:.1f}s / 最长 {self.max_duration:.1f}s"
+        )
+
+
+class RunCoordinator:
+    """在工作线程中执行一轮抓取：持有运行租约防止多实例重叠，并由看门狗取消超时的任务。"""
+
+    def __init__(
+        self,
+        lease: Optional[RunLease] = None,
+        *,
+        runner: Optional[Callable[..., List[NewsRecord]]] = None,
+        max_runtime_sec: float = 0.0,
+        grace_sec: float = CANCEL_GRACE_SEC,
+    ) -> None:
+        self.lease = lease
+        self.runner = runner
+        self.max_runtime_sec = max(0.0, max_runtime_sec)
+        self.grace_sec = grace_sec
+        self.metrics = RunMetrics()
+        self._orphan: Optional[threading.Thread] = None
+
+    def run(self, fetchers: Optional[Sequence[Type[BaseNewsFetcher]]]) -> Optional[List[NewsRecord]]:
+        """执行一轮抓取并返回新增新闻；被跳过或取消时返回 None，任务内的异常原样抛出。"""
+        if self._orphan is not None:
+            if self._orphan.is_alive():
+                self.metrics.overlap_skipped += 1
+                logger.warning("上一轮被取消的任务仍未退出，跳过本次触发。")
+                return None
+            self._orphan = None
+        if self.lease is not None and not self.lease.acquire():
+            self.metrics.lock_skipped += 1
+            holder = self.lease.holder()
+            logger.warning("运行租约被其他实例持有（%s），跳过本次触发。", holder[0] if holder else "未知")
+            return None
+
+        cancel = threading.Event()
+        outcome: Dict[str, Any] = {}
+
+        def worker() -> None:
+            try:
+                outcome["fresh"] = (self.runner or run_once)(fetchers, cancel=cancel)
+            except BaseException as exc:  # noqa: BLE001
+                outcome["error"] = exc
+
+        thread = threading.Thread(target=worker, name="radarflow-run", daemon=True)
+        started = time.monotonic()
+        deadline = started + self.max_runtime_sec if self.max_runtime_sec else None
+        give_up: Optional[float] = None
+        thread.start()
+        while thread.is_alive():
+            step = self.lease.ttl_sec / 3 if self.lease is not None else CANCEL_GRACE_SEC
+            wake = give_up if give_up is not None else deadline
+            if wake is not None:
+                step = min(step, max(0.1, wake - time.monotonic()))
+            thread.join(step)
+            if not thread.is_alive():
+                break
+            if self.lease is not None and not self.lease.renew():
+                logger.warning("运行租约续约失败，可能已被其他实例接管，正在取消本轮任务。")
+                cancel.set()
+            now = time.monotonic()
+            if deadline is not None and give_up is None and now >= deadline:
+                logger.warning("本轮任务运行超过 %.0f 秒，正在取消。", self.max_runtime_sec)
+                cancel.set()
+                self.metrics.cancelled += 1
+                give_up = now + self.grace_sec
+            elif give_up is not None and now >= give_up:
+                logger.error("任务在取消后 %.0f 秒内仍未退出，放弃等待；其退出前的触发将被跳过。", self.grace_sec)
+                self._orphan = thread
+                break
+        self._finish(time.monotonic() - started)
+        if thread.is_alive():
+            return None
+        error = outcome.get("error")
+        if isinstance(error, RunCancelled):
+            logger.warning("%s", error)
+            return None
+        if error is not None:
+            raise error
+        return outcome.get("fresh")
+
+    def close(self) -> None:
+        if self.lease is not None:
+            self.lease.close()
+
+    def _finish(self, duration: float) -> None:
+        self.metrics.runs += 1
+        self.metrics.last_duration = duration
+        self.metrics.max_duration = max(self.metrics.max_duration, duration)
+        if self.lease is not None and self._orphan is None:
+            self.lease.release()
+
+
 def run_scheduler(config_path: Optional[Path] = None) -> None:
     runtime_path = Path(config_path) if config_path else DEFAULT_RUNTIME_CONFIG
-    cfg = load_scheduler_config(runtime_path)
-    enabled = bool(cfg.get("enabled", False))
-    cron_schedules = _load_cron_schedules(cfg)
-    max_runs = cfg.get("max_runs")
-    run_on_start = bool(cfg.get("run_on_start", False))
+    config = get_config(runtime_path)
+    cfg = config.scheduler
+    jobs = _load_jobs(cfg, SourceConfig(config))
     tz_helper = get_timezone_helper(runtime_path)
     tz = tz_helper.tzinfo
 
     logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    # 常驻流水线：数据库连接、过滤规则、AI 客户端与抓取器会话在各轮之间复用
+    pipeline = NewsPipeline(config_path=runtime_path)
+    coordinator = _load_coordinator(cfg, pipeline.run)
+    server = _start_metrics_server(config.metrics.host, config.metrics.port, coordinator)
+    try:
+        _run_scheduled(cfg, jobs, coordinator, runtime_path, tz)
+    finally:
+        if server is not None:
+            server.close()
+            REGISTRY.remove_collector(coordinator.metrics.export)
+        coordinator.close()
+        pipeline.close()
+
+
+def _start_metrics_server(host: str, port: int, coordinator: RunCoordinator) -> Optional[MetricsServer]:
+    """metrics.port 非 0 时启动 Prometheus 文本格式的 /metrics 端点；端口修改需重启生效。"""
+    if not port:
+        return None
+    try:
+        server = MetricsServer(host, port).start()
+    except OSError as exc:
+        logger.error("指标端点启动失败（%s:%d）: %s", host, port, exc)
+        return None
+    REGISTRY.add_collector(coordinator.metrics.export)
+    return server
+
+
+def _run_scheduled(
+    cfg: SchedulerSettings,
+    jobs: List[SourceJob],
+    coordinator: RunCoordinator,
+    runtime_path: Path,
+    tz: tzinfo,
+) -> None:
+    enabled = cfg.enabled
+    max_runs = cfg.max_runs
+    run_on_start = cfg.run_on_start
 
     if not enabled:
         logger.info("调度器未启用，直接运行一次抓取任务。")
-        run_once()
+        coordinator.run(_job_fetchers(jobs) if jobs else None)
         return
 
-    if not cron_schedules:
+    if not jobs:
         logger.error("已启用调度，但未配置 cron 表达式。请在 config/config.yaml 中填写 scheduler.cron。")
         return
 
@@ -164,83 +511,275 @@ def run_scheduler(config_path: Optional[Path] = None) -> None:
     if run_on_start:
         logger.info("启动后立即执行一次抓取任务。")
         try:
-            run_once()
+            coordinator.run(_job_fetchers(jobs))
         except Exception:  # noqa: BLE001
             logger.exception("启动阶段执行失败，将继续按照 cron 调度。")
         run_count = 1
-        if isinstance(max_runs, int) and run_count >= max_runs:
+        if max_runs is not None and run_count >= max_runs:
             logger.info("达到配置的最大执行次数(%d)，自动退出。", max_runs)
             return
 
     logger.info(
-        "按 cron 规则执行，共 %d 条表达式，使用时区：%s。",
-        len(cron_schedules),
+        "共 %d 个调度任务，使用时区：%s。",
+        len(jobs),
         tz.tzname(datetime.now(tz)) if hasattr(tz, "tzname") else tz,
     )
-    _run_with_cron(cron_schedules, max_runs, tz=tz, initial_runs=run_count)
+    for job in jobs:
+        logger.info("调度任务 %s：%s", job.describe(), ", ".join(cls.__name__ for cls in job.fetchers))
+    watcher: Optional[ConfigWatcher] = None
+    if cfg.hot_reload:
+        watcher = ConfigWatcher(runtime_path, validators=(validate_components, _validate_scheduler))
+    stats = PollStats(POLL_STATS_DB, history_days=cfg.adaptive.history_days, tz=tz)
+    try:
+        _run_with_cron(
+            jobs,
+            max_runs,
+            tz=tz,
+            initial_runs=run_count,
+            watcher=watcher,
+            poll_interval=cfg.reload_poll_sec,
+            config_path=runtime_path,
+            stats=stats,
+            coordinator=coordinator,
+            misfire_policy=cfg.misfire_policy,
+            max_queue=cfg.max_queue,
+        )
+    finally:
+        stats.close()
 
 
 def _run_with_cron(
-    schedules: Sequence[CronSchedule],
+    jobs: Sequence[SourceJob],
     max_runs: Optional[int],
     *,
     tz: tzinfo,
     initial_runs: int = 0,
+    watcher: Optional[ConfigWatcher] = None,
+    poll_interval: float = DEFAULT_RELOAD_POLL_SEC,
+    config_path: Path = DEFAULT_RUNTIME_CONFIG,
+    stats: Optional[PollStats] = None,
+    coordinator: Optional[RunCoordinator] = None,
+    misfire_policy: str = "skip",
+    max_queue: int = DEFAULT_MAX_QUEUE,
 ) -> None:
+    coordinator = coordinator or RunCoordinator()
+    metrics = coordinator.metrics
     run_count = initial_runs
     if isinstance(max_runs, int) and run_count >= max_runs:
         logger.info("达到配置的最大执行次数(%d)，自动退出。", max_runs)
         return
-    next_time = _next_cron_run(schedules, datetime.now(tz))
+    now = datetime.now(tz)
+    for job in jobs:
+        job.next_time = None
+        job.advance(now)
+    next_time = min(job.next_time for job in jobs)
     logger.info("下次执行时间：%s", next_time.isoformat(" ", "seconds"))
     try:
         while True:
             now = datetime.now(tz)
+            next_time = min(job.next_time for job in jobs)
             wait_seconds = max(0.0, (next_time - now).total_seconds())
             if wait_seconds > 0:
-                time.sleep(wait_seconds)
+                time.sleep(min(wait_seconds, poll_interval) if watcher else wait_seconds)
+                reloaded = _poll_config(watcher, config_path)
+                if reloaded:
+                    jobs = _carry_over(jobs, reloaded)
+                    now = datetime.now(tz)
+                    for job in jobs:
+                        metrics.misfires += job.advance(now, misfire_policy, max_queue)
+                    next_time = min(job.next_time for job in jobs)
+                    logger.info("调度规则已更新，下次执行时间：%s", next_time.isoformat(" ", "seconds"))
+                continue
+            due = [job for job in jobs if job.next_time <= now]
             run_count += 1
-            logger.info("达成第 %d 次 cron 触发 (%s)。", run_count, next_time.isoformat(" ", "seconds"))
+            logger.info(
+                "达成第 %d 次触发 (%s)：%s",
+                run_count,
+                next_time.isoformat(" ", "seconds"),
+                ", ".join(job.name for job in due),
+            )
+            metrics.observe_lag(max((now - job.next_time).total_seconds() for job in due))
+            fresh: Optional[List[NewsRecord]] = None
             try:
-                run_once()
+                fresh = coordinator.run(_job_fetchers(due))
             except Exception:  # noqa: BLE001
                 logger.exception("本次执行发生异常，将继续下一轮。")
+            logger.info("调度指标：%s", metrics.summary())
+            if fresh is not None:
+                _observe_yield(due, fresh, stats, datetime.now(tz))
             if isinstance(max_runs, int) and run_count >= max_runs:
                 logger.info("达到配置的最大执行次数(%d)，自动退出。", max_runs)
                 break
-            next_time = _next_cron_run(schedules, next_time)
+            now = datetime.now(tz)
+            for job in due:
+                dropped = job.advance(now, misfire_policy, max_queue)
+                if dropped:
+                    logger.warning("调度任务 %s 错过了 %d 次触发（策略：%s）", job.name, dropped, misfire_policy)
+                metrics.misfires += dropped
+            reloaded = _poll_config(watcher, config_path)
+            if reloaded:
+                jobs = _carry_over(jobs, reloaded)
+                for job in jobs:
+                    metrics.misfires += job.advance(now, misfire_policy, max_queue)
+            next_time = min(job.next_time for job in jobs)
             logger.info("下一次执行时间：%s", next_time.isoformat(" ", "seconds"))
     except KeyboardInterrupt:
         logger.info("收到中断信号，调度器退出。")
+    finally:
+        close_email_transports()
 
 
-def _next_cron_run(schedules: Sequence[CronSchedule], after: datetime) -> datetime:
-    return min(schedule.next_run(after) for schedule in schedules)
+def _observe_yield(
+    jobs: Sequence[SourceJob],
+    fresh: Sequence[NewsRecord],
+    stats: Optional[PollStats],
+    now: datetime,
+) -> None:
+    """记录自适应任务本次的预测与实际新增条数，并据此调整下一次的轮询间隔。"""
 
+    for job in jobs:
+        schedule = job.adaptive
+        if schedule is None:
+            continue
+        names = {fetcher_cls.__name__ for fetcher_cls in job.fetchers}
+        records = [record for record in fresh if isinstance(record.raw, dict) and record.raw.get("_fetcher") in names]
+        job.source_names.update(record.source for record in records if record.source)
+        predicted = schedule.predicted
+        rate = 0.0
+        if stats is not None:
+            stats.record(job.name, interval_sec=schedule.seconds, predicted=predicted, new_items=len(records))
+            rate = stats.hourly_rates(job.name, job.source_names)[now.hour]
+        schedule.update(len(records), rate)
+        logger.info(
+            "新闻源 %s：预测新增 %.1f 条，实际 %d 条，估计速率 %.1f 条/小时，下次间隔 %.0f 秒",
+            job.name,
+            predicted,
+            len(records),
+            rate,
+            schedule.seconds,
+        )
 
-def _load_cron_schedules(cfg: Dict[str, Any]) -> List[CronSchedule]:
-    cron_field = cfg.get("cron")
-    if not cron_field:
-        return []
-    expressions: Iterable[str]
-    if isinstance(cron_field, str):
-        expressions = [cron_field]
-    elif isinstance(cron_field, list):
-        expressions = [str(expr) for expr in cron_field if str(expr).strip()]
-    else:
-        logger.warning("cron 配置格式不正确: %r", cron_field)
-        return []
+
+def _carry_over(previous: Sequence[SourceJob], jobs: List[SourceJob]) -> List[SourceJob]:
+    """热更新后保留同名自适应任务已学到的间隔与来源名称。"""
+
+    old = {job.name: job for job in previous}
+    for job in jobs:
+        schedule, before = job.adaptive, old.get(job.name)
+        if schedule is None or before is None:
+            continue
+        job.source_names = before.source_names
+        if before.adaptive is not None:
+            schedule.seconds = min(schedule.max_seconds, max(schedule.min_seconds, before.adaptive.seconds))
+            schedule.predicted = before.adaptive.predicted
+    return jobs
+
+
+def _poll_config(watcher: Optional[ConfigWatcher], config_path: Path) -> Optional[List[SourceJob]]:
+    """检查配置热更新；scheduler、sources 或 fetching 段变化时返回新的调度任务。"""
+
+    if watcher is None:
+        return None
+    change = watcher.poll()
+    if change is None or not {"scheduler", "sources", "fetching"} & set(change.sections):
+        return None
+    config = get_config(config_path)
+    return _load_jobs(config.scheduler, SourceConfig(config)) or None
+
+
+def _validate_scheduler(settings: Dict[str, Any]) -> None:
+    config = parse_settings(settings)
+    if config.scheduler.enabled and not _load_jobs(config.scheduler, SourceConfig(config)):
+        raise ValueError("scheduler.cron 中没有可用的 cron 表达式")
+
+
+def _load_jobs(cfg: SchedulerSettings, source_config: Optional[SourceConfig] = None) -> List[SourceJob]:
+    """scheduler.sources 中单独配置的新闻源各自成为一个任务，其余启用的新闻源沿用 scheduler.cron。"""
+
+    source_config = source_config if source_config is not None else SourceConfig()
+    jobs: List[SourceJob] = []
+    claimed: Set[str] = set()
+    for name, spec in cfg.sources.items():
+        if name not in AVAILABLE_FETCHERS:
+            logger.warning("scheduler.sources 中的新闻源 %r 不存在，已忽略", name)
+            continue
+        if not source_config.allows(name):
+            logger.info("新闻源 %s 未启用或不属于本节点的分组，跳过其调度", name)
+            continue
+        schedules = _load_source_schedules(spec, cfg.adaptive)
+        if not schedules:
+            logger.warning("新闻源 %s 未配置有效的 cron 或 interval_sec，沿用全局调度", name)
+            continue
+        try:
+            fetcher_cls = AVAILABLE_FETCHERS[name]
+        except ImportError as exc:
+            logger.warning("新闻源 %s 导入失败，已忽略: %s", name, exc)
+            continue
+        jobs.append(SourceJob(name, schedules, [fetcher_cls]))
+        claimed.add(name)
+    schedules = _load_cron_schedules(cfg.cron)
+    remaining = [name for name in source_config.enabled_names(DEFAULT_FETCHER_NAMES) if name not in claimed]
+    if remaining and schedules:
+        jobs.insert(0, SourceJob("default", schedules, load_fetchers(remaining)))
+    return jobs
+
+
+def _load_source_schedules(spec: SourceScheduleSettings, adaptive: AdaptiveSettings) -> List[Any]:
+    if spec.adaptive:
+        initial = spec.interval_sec or spec.min_interval_sec
+        return [
+            AdaptiveSchedule(
+                seconds=min(spec.max_interval_sec, max(spec.min_interval_sec, initial)),
+                min_seconds=spec.min_interval_sec,
+                max_seconds=spec.max_interval_sec,
+                target_items=adaptive.target_items,
+                burst_factor=adaptive.burst_factor,
+                backoff=adaptive.backoff,
+            )
+        ]
+    schedules: List[Any] = _load_cron_schedules(spec.cron)
+    if spec.interval_sec is not None:
+        schedules.append(IntervalSchedule(spec.interval_sec))
+    return schedules
+
+
+def _load_coordinator(cfg: SchedulerSettings, runner: Callable[..., List[NewsRecord]]) -> RunCoordinator:
+    lease = RunLease(POLL_STATS_DB, ttl_sec=cfg.lock_ttl_sec)
+    return RunCoordinator(lease, runner=runner, max_runtime_sec=cfg.max_runtime_sec)
+
+
+def _job_fetchers(jobs: Sequence[SourceJob]) -> List[Type[BaseNewsFetcher]]:
+    fetchers: List[Type[BaseNewsFetcher]] = []
+    for job in jobs:
+        for fetcher_cls in job.fetchers:
+            if fetcher_cls not in fetchers:
+                fetchers.append(fetcher_cls)
+    return fetchers
+
+
+def _load_cron_schedules(expressions: Iterable[str]) -> List[CronSchedule]:
     schedules: List[CronSchedule] = []
     for expr in expressions:
-        expr = expr.strip()
-        if not expr:
-            continue
         try:
-            schedules.append(CronSchedule(expr))
+            schedule = CronSchedule(expr)
+            schedule.next_run(datetime.now())
         except ValueError as exc:
             logger.warning("忽略无效 cron 表达式 %r: %s", expr, exc)
+            continue
+        schedules.append(schedule)
     return schedules
 
 
 if __name__ == "__main__":
-    run_scheduler()
+    parser = argparse.ArgumentParser(description="按 cron / 间隔调度抓取任务。")
+    parser.add_argument("--config", type=Path, default=None, help="配置文件路径（默认 config/config.yaml）")
+    parser.add_argument("--profile-startup", action="store_true", help="输出导入各模块的耗时（-X importtime）后退出")
+    parser.add_argument("--top", type=int, default=25, help="--profile-startup 时显示的模块数")
+    args = parser.parse_args()
+    if args.profile_startup:
+        print_startup_profile("scheduler", args.top)
+    else:
+        try:
+            run_scheduler(args.config)
+        except SettingsError as exc:
+            raise SystemExit(str(exc)) from exc
@@ -0,0 +1,107 @@
+"""Backtest ai_filter settings against AI summaries archived in news.db."""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from ai.predicates import CompiledSummaryFilter, SummaryColumns  # noqa: E402
+from ai.types import AISummary  # noqa: E402
+from utils.config_loader import DEFAULT_CONFIG_PATH, load_settings  # noqa: E402
+
+
+def iter_batches(db_path: Path, batch_size: int, since: str, limit: int) -> Iterator[List[Tuple[str, AISummary]]]:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        query = "SELECT source, ai_summary FROM news_records WHERE ai_summary IS NOT NULL"
+        params: List[object] = []
+        if since:
+            query += " AND created_at >= ?"
+            params.append(since)
+        query += " ORDER BY id DESC"
+        if limit > 0:
+            query += " LIMIT ?"
+            params.append(limit)
+        cur = conn.execute(query, params)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            batch: List[Tuple[str, AISummary]] = []
+            for source, payload in rows:
+                try:
+                    batch.append((source or "", AISummary(**json.loads(payload))))
+                except (TypeError, ValueError):
+                    continue
+            yield batch
+    finally:
+        conn.close()
+
+
+def backtest(config_path: Path, args: argparse.Namespace) -> Dict[str, object]:
+    settings = load_settings(config_path)
+    compiled = CompiledSummaryFilter.from_config(settings.get("ai_filter", {}) or {})
+    total = kept = 0
+    rejections: Counter = Counter()
+    kept_by_source: Counter = Counter()
+    total_by_source: Counter = Counter()
+    for batch in iter_batches(args.db, args.batch_size, args.since, args.limit):
+        columns = SummaryColumns.from_summaries([summary for _, summary in batch])
+        mask, counts = compiled.evaluate_detailed(columns)
+        rejections.update(counts)
+        for (source, _), keep in zip(batch, mask):
+            total += 1
+            total_by_source[source] += 1
+            if keep:
+                kept += 1
+                kept_by_source[source] += 1
+    return {
+        "config": str(config_path),
+        "predicates": [name for name, _ in compiled.predicates],
+        "total": total,
+        "kept": kept,
+        "kept_ratio": round(kept / total, 4) if total else 0.0,
+        "rejected_by_predicate": dict(rejections),
+        "by_source": {
+            source: {"total": count, "kept": kept_by_source[source]}
+            for source, count in total_by_source.most_common()
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay archived AI summaries through ai_filter settings.")
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=Path("state") / "news.db",
+        help="Path to SQLite database (default: state/news.db)",
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        action="append",
+        help=f"Config file to evaluate; repeat to compare variants (default: {DEFAULT_CONFIG_PATH})",
+    )
+    parser.add_argument("--since", default="", help="Only use records created at or after this ISO timestamp")
+    parser.add_argument("--limit", type=int, default=0, help="Only use the newest N records")
+    parser.add_argument("--batch-size", type=int, default=2000, help="Rows evaluated per columnar batch")
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        print(f"Database {args.db} does not exist")
+        return
+    for config_path in args.config or [DEFAULT_CONFIG_PATH]:
+        print(json.dumps(backtest(config_path, args), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compare field-wise CronSchedule.next_run against the minute-scan reference implementation."""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, List
+from zoneinfo import ZoneInfo
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scheduler import CronSchedule  # noqa: E402
+
+DEFAULT_EXPRESSIONS = [
+    "*/5 * * * *",
+    "0 * * * *",
+    "30 9-20 * * *",
+    "0 9 * * mon-fri",
+    "0 8 1 * *",
+    "0 9 29 2 *",
+]
+
+
+def time_calls(func: Callable[[datetime], datetime], starts: List[datetime]) -> float:
+    started = time.perf_counter()
+    for moment in starts:
+        func(moment)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark cron next-fire computation.")
+    parser.add_argument("expressions", nargs="*", default=DEFAULT_EXPRESSIONS, help="Cron expressions to time")
+    parser.add_argument("--calls", type=int, default=50, help="next_run calls per expression")
+    parser.add_argument("--timezone", default="Asia/Shanghai", help="IANA time zone for the start times")
+    parser.add_argument("--skip-scan", action="store_true", help="Only time the field-wise implementation")
+    args = parser.parse_args()
+
+    tz = ZoneInfo(args.timezone)
+    origin = datetime(2025, 1, 1, tzinfo=tz)
+    starts = [origin + timedelta(hours=7 * index, minutes=13 * index) for index in range(max(1, args.calls))]
+    for expression in args.expressions:
+        schedule = CronSchedule(expression)
+        mismatches = 0 if args.skip_scan else sum(
+            schedule.next_run(moment) != schedule._scan_next_run(moment) for moment in starts[:5]
+        )
+        fast = time_calls(schedule.next_run, starts)
+        row = {
+            "expression": expression,
+            "calls": len(starts),
+            "field_us_per_call": round(fast / len(starts) * 1e6, 1),
+        }
+        if not args.skip_scan:
+            scan = time_calls(schedule._scan_next_run, starts)
+            row["scan_us_per_call"] = round(scan / len(starts) * 1e6, 1)
+            row["speedup"] = round(scan / fast, 1) if fast else None
+            row["mismatches"] = mismatches
+        print(json.dumps(row, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Replay stored news_records through FilterSet to measure throughput and per-rule stats."""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from fetcher.base_fetcher import NewsRecord  # noqa: E402
+from filters import FilterSet  # noqa: E402
+from utils.config_loader import DEFAULT_CONFIG_PATH  # noqa: E402
+
+
+def load_records(db_path: Path, limit: int) -> List[NewsRecord]:
+    """Load archived records, dropping prefilter verdicts so every record hits the keyword rules."""
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        query = "SELECT source, title, url, summary, published_at, raw_json FROM news_records ORDER BY id DESC"
+        params: List[object] = []
+        if limit > 0:
+            query += " LIMIT ?"
+            params.append(limit)
+        records: List[NewsRecord] = []
+        for source, title, url, summary, published_at, raw_json in conn.execute(query, params):
+            try:
+                raw = json.loads(raw_json or "{}")
+            except ValueError:
+                raw = {}
+            if not isinstance(raw, dict):
+                raw = {}
+            raw = {key: value for key, value in raw.items() if not key.startswith(("_prefilter", "_matched_rule"))}
+            records.append(
+                NewsRecord(
+                    source=source or "",
+                    title=title or "",
+                    url=url or "",
+                    summary=summary,
+                    published_at=published_at,
+                    raw=raw,
+                )
+            )
+        return records
+    finally:
+        conn.close()
+
+
+def benchmark(config_path: Path, records: List[NewsRecord], repeat: int) -> dict:
+    filter_set = FilterSet(config_path)
+    filter_set.profile = True
+    filter_set.reset_stats()
+    allowed = 0
+    started = time.perf_counter()
+    texts = [filter_set._combine_text(record) for record in records]
+    for _ in range(repeat):
+        for text in texts:
+            action, _, _ = filter_set._evaluate_profiled(text)
+            allowed += action == "allow"
+    elapsed = time.perf_counter() - started
+    evaluated = len(records) * repeat
+    return {
+        "config": str(config_path),
+        "rule_count": len(filter_set.rules),
+        "records": evaluated,
+        "allowed": allowed // max(1, repeat),
+        "seconds": round(elapsed, 4),
+        "records_per_sec": round(evaluated / elapsed, 1) if elapsed else None,
+        **filter_set.profile_report(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark keyword filter rules against news.db.")
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=Path("state") / "news.db",
+        help="Path to SQLite database (default: state/news.db)",
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        action="append",
+        help=f"Config file with filters; repeat to compare rule sets (default: {DEFAULT_CONFIG_PATH})",
+    )
+    parser.add_argument("--limit", type=int, default=0, help="Only replay the newest N records")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay the records N times")
+    parser.add_argument("--explain", type=int, default=0, help="Print explain output for the first N records")
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        print(f"Database {args.db} does not exist")
+        return
+    records = load_records(args.db, args.limit)
+    print(f"Loaded {len(records)} records from {args.db}")
+    for config_path in args.config or [DEFAULT_CONFIG_PATH]:
+        print(json.dumps(benchmark(config_path, records, max(1, args.repeat)), ensure_ascii=False, indent=2))
+        if args.explain:
+            filter_set = FilterSet(config_path)
+            for record in records[: args.explain]:
+                print(json.dumps(filter_set.explain(record).to_dict(), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Summarize adaptive polling: predicted vs actual new items per source from poll_stats."""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils.poll_stats import PollStats  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report predicted vs actual poll yield per source.")
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=Path("state") / "news.db",
+        help="Path to SQLite database (default: state/news.db)",
+    )
+    parser.add_argument("--days", type=int, default=7, help="Only include polls from the last N days")
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        print(f"Database {args.db} does not exist")
+        return
+    stats = PollStats(args.db)
+    try:
+        for row in stats.report(args.days):
+            print(json.dumps(row, ensure_ascii=False))
+    finally:
+        stats.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Train and evaluate the local relevance model from news.db prefilter history."""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from ai.relevance import (  # noqa: E402
+    DEFAULT_MODEL_PATH,
+    RelevanceModel,
+    evaluate,
+    load_training_samples,
+)
+
+
+def train(args: argparse.Namespace) -> None:
+    samples = load_training_samples(args.db)
+    if not samples:
+        print(f"No prefilter verdicts found in {args.db}")
+        return
+    split = int(len(samples) * (1 - args.holdout)) if 0 < args.holdout < 1 else len(samples)
+    train_set, holdout_set = samples[:split], samples[split:]
+    positives = sum(1 for sample in train_set if sample.relevant)
+    print(f"Training on {len(train_set)} samples ({positives} relevant), holdout {len(holdout_set)}")
+    model = RelevanceModel.train(train_set, epochs=args.epochs)
+    model.save(args.model)
+    print(f"Saved model to {args.model}")
+    if holdout_set:
+        report = evaluate(model, holdout_set, args.reject_below)
+        print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+
+
+def evaluate_command(args: argparse.Namespace) -> None:
+    if not args.model.exists():
+        print(f"Model file {args.model} does not exist, run `train` first")
+        return
+    samples = load_training_samples(args.db)
+    if args.last:
+        samples = samples[-args.last :]
+    model = RelevanceModel.load(args.model)
+    for threshold in args.reject_below_grid or [args.reject_below]:
+        report = evaluate(model, samples, threshold)
+        print(json.dumps({"reject_below": threshold, **report.to_dict()}, ensure_ascii=False))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local relevance model for the AI prefilter.")
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=Path("state") / "news.db",
+        help="Path to SQLite database (default: state/news.db)",
+    )
+    parser.add_argument(
+        "--model",
+        type=Path,
+        default=DEFAULT_MODEL_PATH,
+        help=f"Path to the model file (default: {DEFAULT_MODEL_PATH})",
+    )
+    parser.add_argument("--reject-below", type=float, default=0.05, help="Auto-reject threshold on P(relevant)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = sub.add_parser("train", help="Train on stored prefilter verdicts")
+    train_parser.add_argument("--epochs", type=int, default=8)
+    train_parser.add_argument("--holdout", type=float, default=0.2, help="Fraction of newest samples kept for evaluation")
+    train_parser.set_defaults(func=train)
+
+    eval_parser = sub.add_parser("evaluate", help="Evaluate a saved model against stored verdicts")
+    eval_parser.add_argument("--last", type=int, default=0, help="Only use the newest N samples")
+    eval_parser.add_argument(
+        "--reject-below-grid",
+        type=float,
+        nargs="*",
+        help="Evaluate several thresholds, e.g. --reject-below-grid 0.02 0.05 0.1",
+    )
+    eval_parser.set_defaults(func=evaluate_command)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
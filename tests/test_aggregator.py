@@ -0,0 +1,62 @@
+"""Notification aggregation window tests."""
+from __future__ import annotations
+
+import yaml
+
+from aggregator import NotificationAggregator
+from ai import AISummary
+from fetcher.base_fetcher import NewsRecord
+
+
+def _setup(tmp_path, clock, **aggregation):
+    path = tmp_path / "config.yaml"
+    notification = {"aggregation": {"enabled": True, "window_min": 10, "max_items": 5, **aggregation}}
+    path.write_text(yaml.safe_dump({"notification": notification}, allow_unicode=True), encoding="utf-8")
+    return NotificationAggregator(tmp_path / "news.db", path, clock=lambda: clock[0]), path
+
+
+def _record(idx: int, rule: str = "常规") -> NewsRecord:
+    return NewsRecord(
+        source="s",
+        title=f"title {idx}",
+        url=f"https://x/{idx}",
+        raw={"_matched_rule": rule, "_matched_rule_index": 0},
+    )
+
+
+def test_buffer_survives_restart_and_flushes_when_window_closes(tmp_path) -> None:
+    clock = [1_000.0]
+    aggregator, path = _setup(tmp_path, clock)
+    first = _record(1)
+    summary = AISummary(source="s", title="title 1", url=first.url, summary="摘要", keywords=["k"], is_ai=True)
+    assert aggregator.add([first], {first.url: summary}) == 1
+    clock[0] += 300
+    assert aggregator.add([first, _record(2)], {}) == 1
+    assert aggregator.flush_reason() is None
+    aggregator.close()
+
+    reopened = NotificationAggregator(tmp_path / "news.db", path, clock=lambda: clock[0])
+    assert len(reopened.pending_news_ids()) == 2
+    clock[0] += 300
+    assert reopened.flush_reason() == "window"
+
+    records, summaries = reopened.take()
+    assert [record.title for record in records] == ["title 1", "title 2"]
+    assert records[0].raw["_matched_rule"] == "常规"
+    assert summaries[first.url].keywords == ["k"] and summaries[first.url].is_ai
+    reopened.discard(records)
+    assert reopened.pending_news_ids() == set()
+    assert reopened.flush_reason() is None
+
+
+def test_size_threshold_and_urgent_rules_flush_immediately(tmp_path) -> None:
+    clock = [0.0]
+    aggregator, _ = _setup(tmp_path, clock, max_items=3, urgent_rules=["突发"])
+    aggregator.add([_record(1), _record(2)], {})
+    assert aggregator.flush_reason() is None
+    aggregator.add([_record(3)], {})
+    assert aggregator.flush_reason() == "size"
+
+    aggregator.discard(aggregator.take()[0])
+    aggregator.add([_record(4, rule="突发")], {})
+    assert aggregator.flush_reason() == "urgent"
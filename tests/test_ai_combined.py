@@ -0,0 +1,104 @@
+"""Combined prefilter + summary mode tests."""
+from __future__ import annotations
+
+import json
+
+import yaml
+
+from ai import AIClient, AICombinedProcessor, AIPreFilter, AIWorkQueue
+from ai.prefilter import PrefilterResult
+from fetcher.base_fetcher import NewsRecord
+from filters import FilterSet
+from pipeline import _combined_summary_targets
+from utils.settings import AIQueueSettings
+
+
+def _write_config(tmp_path, **ai):
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        yaml.safe_dump(
+            {
+                "ai_prefilter": {"enabled": True, "mode": "combined", "max_workers": 1},
+                "ai": {"enabled": True, "api_key": "test", "max_workers": 1, **ai},
+                "filters": {
+                    "enabled": True,
+                    "default_action": "deny",
+                    "rules": [{"name": "china-us", "all_of": ["china"]}],
+                },
+            }
+        ),
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_combined_mode_maps_verdicts_and_summaries(tmp_path, monkeypatch) -> None:
+    config_path = _write_config(tmp_path)
+    client = AIClient(config_path)
+    processor = AICombinedProcessor(AIPreFilter(config_path), client)
+    assert processor.enabled
+
+    responses = {
+        "China tariffs": {
+            "relevant": True,
+            "matched_rules": ["china-us"],
+            "reason": "mentions both",
+            "skip_summary": False,
+            "summary": "中美关税摘要",
+            "topics": ["经济"],
+            "sentiment": {"label": "negative", "score": -4},
+        },
+        "Football": {"relevant": False, "matched_rules": [], "reason": "sports", "skip_summary": True},
+    }
+
+    def fake_post_chat(prompt, title, stage):
+        content = json.dumps(responses[title], ensure_ascii=False)
+        return {"choices": [{"message": {"content": content}}]}, None
+
+    monkeypatch.setattr(client, "_post_chat", fake_post_chat)
+    records = [
+        NewsRecord(source="s", title="China tariffs", url="https://a"),
+        NewsRecord(source="s", title="Football", url="https://b"),
+    ]
+    filter_set = FilterSet(config_path)
+    kept, summaries = processor.apply(records, filter_set.rules)
+
+    assert [record.title for record in kept] == ["China tariffs"]
+    assert records[1].raw["_prefilter_relevant"] is False
+    assert summaries["https://a"].summary == "中美关税摘要"
+    assert summaries["https://a"].sentiment["label"] == "negative"
+
+    allowed = filter_set.apply(kept)
+    assert allowed[0].raw["_matched_rule"] == "china-us"
+
+
+def test_combined_mode_summarizes_only_within_max_items(tmp_path, monkeypatch) -> None:
+    config_path = _write_config(tmp_path, max_items=1)
+    client = AIClient(config_path)
+    prefilter = AIPreFilter(config_path)
+    processor = AICombinedProcessor(prefilter, client)
+    queue = AIWorkQueue(tmp_path / "news.db", settings=AIQueueSettings(enabled=False))
+    summarized, judged = [], []
+
+    def fake_post_chat(prompt, title, stage):
+        summarized.append(title)
+        content = json.dumps({"relevant": True, "matched_rules": ["china-us"], "summary": f"{title} 摘要"})
+        return {"choices": [{"message": {"content": content}}]}, None
+
+    def fake_prefilter(record, rules):
+        judged.append(record.title)
+        return PrefilterResult(True, ["china-us"], "")
+
+    monkeypatch.setattr(client, "_post_chat", fake_post_chat)
+    monkeypatch.setattr(prefilter, "_evaluate_record", fake_prefilter)
+    records = [NewsRecord(source="s", title=f"China {idx}", url=f"https://x/{idx}") for idx in range(3)]
+    try:
+        targets = _combined_summary_targets(client, queue, records)
+        kept, summaries = processor.apply(records, FilterSet(config_path).rules, summary_targets=targets)
+    finally:
+        queue.close()
+
+    assert len(kept) == 3
+    assert summarized == ["China 0"]
+    assert judged == ["China 1", "China 2"]
+    assert list(summaries) == ["https://x/0"]
@@ -0,0 +1,78 @@
+"""AI post-filter predicate tests."""
+from __future__ import annotations
+
+import yaml
+
+from ai import AISummary, AISummaryFilter
+from fetcher.base_fetcher import NewsRecord
+
+
+def _summary(title: str, **fields) -> AISummary:
+    return AISummary(source="s", title=title, url=f"https://x/{title}", summary="", is_ai=True, **fields)
+
+
+def _build_filter(tmp_path, ai_filter) -> AISummaryFilter:
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump({"ai": {"enabled": True}, "ai_filter": {"enabled": True, **ai_filter}}), encoding="utf-8")
+    return AISummaryFilter(path)
+
+
+def test_existing_include_exclude_semantics(tmp_path) -> None:
+    ai_filter = _build_filter(
+        tmp_path,
+        {"categories": {"include": ["政治"], "exclude": ["娱乐"]}, "sentiments": {"include": ["Negative"]}},
+    )
+    summaries = {
+        "keep": _summary("keep", topics=[" 政治 "], sentiment={"label": "negative"}),
+        "wrong-topic": _summary("wrong-topic", topics=["科技"], sentiment={"label": "negative"}),
+        "excluded": _summary("excluded", topics=["政治", "娱乐"], sentiment={"label": "negative"}),
+        "positive": _summary("positive", topics=["政治"], sentiment={"label": "positive"}),
+        "fallback": _summary("fallback", meta={"_fallback_no_ai": True}),
+    }
+    records = [NewsRecord(source="s", title=title, url=f"https://x/{title}") for title in summaries]
+    records.append(NewsRecord(source="s", title="no-summary", url="https://x/no-summary"))
+    summary_map = {summary.url: summary for summary in summaries.values()}
+
+    kept, kept_map = ai_filter.apply(records, summary_map)
+
+    assert [record.title for record in kept] == ["keep", "fallback"]
+    assert set(kept_map) == {"https://x/keep", "https://x/fallback"}
+
+
+def test_score_level_entity_and_keyword_predicates(tmp_path) -> None:
+    ai_filter = _build_filter(
+        tmp_path,
+        {
+            "sentiments": {"max_score": -2},
+            "levels": {"include": ["high"]},
+            "entities": {"include_types": ["人物"]},
+            "keywords": {"include": ["制裁"], "exclude": ["演习"]},
+        },
+    )
+    base = {"sentiment": {"label": "negative", "score": -4, "level": "高"}, "entities": [{"text": "甲", "type": "人物"}]}
+    summaries = [
+        _summary("keep", keywords=["对华制裁"], **base),
+        _summary("mild", keywords=["制裁"], **{**base, "sentiment": {"score": -1, "level": "高"}}),
+        _summary("low", keywords=["制裁"], **{**base, "sentiment": {"score": -4, "level": "低"}}),
+        _summary("no-person", keywords=["制裁"], sentiment=base["sentiment"], entities=[{"text": "乙", "type": "机构"}]),
+        _summary("drill", keywords=["制裁", "军事演习"], **base),
+    ]
+    records = [NewsRecord(source="s", title=summary.title, url=summary.url) for summary in summaries]
+    records.append(NewsRecord(source="s", title="no-summary", url="https://x/no-summary"))
+
+    kept, _ = ai_filter.apply(records, {summary.url: summary for summary in summaries})
+
+    assert [record.title for record in kept] == ["keep"]
+
+
+def test_unhashable_model_output_does_not_abort_filtering(tmp_path) -> None:
+    ai_filter = _build_filter(tmp_path, {"categories": {"include": ["政治"]}, "entities": {"include_types": ["org"]}})
+    summaries = [
+        _summary("odd", topics=[{"name": "x"}, "政治"], sentiment={"label": ["neg"]}, entities=[{"text": "甲", "type": ["ORG"]}]),
+        _summary("keep", topics=["政治"], entities=[{"text": "乙", "type": "ORG"}]),
+    ]
+    records = [NewsRecord(source="s", title=summary.title, url=summary.url) for summary in summaries]
+
+    kept, _ = ai_filter.apply(records, {summary.url: summary for summary in summaries})
+
+    assert [record.title for record in kept] == ["keep"]
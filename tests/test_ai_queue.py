@@ -0,0 +1,81 @@
+"""AI work queue priority and carry-over tests."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from ai.queue import AIWorkQueue
+from fetcher.base_fetcher import NewsRecord
+
+
+def _record(title: str, rule_index: int | None = None, hours_ago: float = 1.0, source: str = "src") -> NewsRecord:
+    published = datetime.now(timezone.utc) - timedelta(hours=hours_ago)
+    raw = {"_matched_rule_index": rule_index} if rule_index is not None else {}
+    return NewsRecord(
+        source=source,
+        title=title,
+        url=f"https://example.com/{title}",
+        published_at=published.isoformat(),
+        raw=raw,
+    )
+
+
+def test_plan_orders_by_rule_rank_and_recency(tmp_path) -> None:
+    queue = AIWorkQueue(tmp_path / "news.db", config_path=tmp_path / "missing.yaml")
+    try:
+        records = [
+            _record("old-unmatched", hours_ago=48),
+            _record("fresh-rule-two", rule_index=2),
+            _record("fresh-rule-zero", rule_index=0),
+        ]
+        selected, leftovers = queue.plan(records, max_items=2)
+        assert [item.record.title for item in selected] == ["fresh-rule-zero", "fresh-rule-two"]
+        assert [item.record.title for item in leftovers] == ["old-unmatched"]
+    finally:
+        queue.close()
+
+
+def test_plan_counts_items_already_summarized_this_run(tmp_path) -> None:
+    queue = AIWorkQueue(tmp_path / "news.db", config_path=tmp_path / "missing.yaml")
+    try:
+        records = [_record("a", rule_index=0), _record("b", rule_index=1), _record("c", rule_index=2)]
+        selected, leftovers = queue.plan(records, max_items=2, spent_items=1)
+        assert [item.record.title for item in selected] == ["a"]
+        selected, leftovers = queue.plan(records, max_items=2, spent_items=2)
+        assert selected == [] and len(leftovers) == 3
+    finally:
+        queue.close()
+
+
+def test_leftovers_carry_over_until_completed(tmp_path) -> None:
+    db_path = tmp_path / "news.db"
+    queue = AIWorkQueue(db_path, config_path=tmp_path / "missing.yaml")
+    records = [_record("a", rule_index=0), _record("b", rule_index=1)]
+    _, leftovers = queue.plan(records, max_items=1)
+    queue.defer(leftovers)
+    queue.close()
+
+    reopened = AIWorkQueue(db_path, config_path=tmp_path / "missing.yaml")
+    try:
+        merged = reopened.merge_pending([_record("c", rule_index=3)])
+        assert [record.title for record in merged] == ["c", "b"]
+        reopened.complete(merged)
+        assert reopened.pending() == []
+    finally:
+        reopened.close()
+
+
+def test_near_duplicate_titles_form_one_cluster(tmp_path) -> None:
+    queue = AIWorkQueue(tmp_path / "news.db", config_path=tmp_path / "missing.yaml")
+    try:
+        items = queue.score(
+            [
+                _record("China and US hold trade talks in Geneva"),
+                _record("China and US hold trade talks in Geneva today"),
+                _record("Local football results"),
+            ]
+        )
+        sizes = {item.record.title: item.cluster_size for item in items}
+        assert sizes["Local football results"] == 1
+        assert sizes["China and US hold trade talks in Geneva"] == 2
+    finally:
+        queue.close()
@@ -0,0 +1,51 @@
+"""Config hot-reload tests."""
+from __future__ import annotations
+
+import os
+
+import yaml
+
+from filters import FilterSet
+from utils.config_loader import load_settings
+from utils.config_watcher import ConfigWatcher, validate_components
+
+
+def _write(path, data, mtime: int) -> None:
+    path.write_text(yaml.safe_dump(data, allow_unicode=True), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def _config(*rules) -> dict:
+    return {"filters": {"enabled": True, "default_action": "deny", "rules": list(rules)}}
+
+
+def test_watcher_swaps_valid_config_and_reports_rule_diff(tmp_path) -> None:
+    path = tmp_path / "config.yaml"
+    _write(path, _config({"name": "a", "any_of": ["china"]}, {"name": "b", "any_of": ["japan"]}), 1_000)
+    watcher = ConfigWatcher(path)
+    assert watcher.poll() is None
+
+    _write(path, _config({"name": "a", "any_of": ["china", "taiwan"]}, {"name": "c", "any_of": ["korea"]}), 2_000)
+    change = watcher.poll()
+
+    assert change is not None
+    assert change.sections == ["filters"]
+    assert change.rules_added == ["c"]
+    assert change.rules_removed == ["b"]
+    assert change.rules_modified == ["a"]
+    assert [rule.name for rule in FilterSet(path).rules] == ["a", "c"]
+
+
+def test_watcher_keeps_previous_config_when_validation_fails(tmp_path) -> None:
+    path = tmp_path / "config.yaml"
+    _write(path, _config({"name": "a", "any_of": ["china"]}), 1_000)
+    watcher = ConfigWatcher(path, validators=(validate_components,))
+    before = load_settings(path)
+
+    path.write_text("filters: [unclosed", encoding="utf-8")
+    os.utime(path, (2_000, 2_000))
+    assert watcher.poll() is None
+
+    _write(path, {"filters": {"rules": ["not-a-mapping"]}}, 3_000)
+    assert watcher.poll() is None
+    assert load_settings(path) is before
@@ -1,7 +1,14 @@
 """Filter rule matching tests."""
 from __future__ import annotations
 
-from filters import FilterRule
+import random
+
+import pytest
+import yaml
+
+from fetcher.base_fetcher import NewsRecord
+from filters import FilterRule, FilterSet
+from utils.aho_corasick import AhoCorasick
 
 
 def test_all_of_groups_support_or_logic() -> None:
@@ -25,3 +32,101 @@ def test_none_of_and_any_of_behaviour() -> None:
     assert rule.matches("中国与美国进行安全会晤")
     assert not rule.matches("中国旅游业恢复")
     assert not rule.matches("中国体育赛事与日本合作")
+
+
+def test_filter_set_automaton_matches_first_rule_semantics(tmp_path) -> None:
+    vocab = ["中国", "中", "美国", "美", "日本", "台湾", "旅游", "Trade", "trade war", "war"]
+    rng = random.Random(7)
+    rules = []
+    for idx in range(12):
+        rules.append(
+            {
+                "name": f"rule-{idx}",
+                "action": rng.choice(["allow", "deny"]),
+                "all_of": [rng.sample(vocab, 2) for _ in range(rng.randint(0, 2))],
+                "any_of": rng.sample(vocab, rng.randint(0, 2)),
+                "none_of": rng.sample(vocab, rng.randint(0, 1)),
+                "enabled": idx != 3,
+                "match": rng.choice(["substring", "word", "stem"]),
+            }
+        )
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        yaml.safe_dump({"filters": {"enabled": True, "default_action": "deny", "rules": rules}}, allow_unicode=True),
+        encoding="utf-8",
+    )
+    filter_set = FilterSet(path)
+
+    for _ in range(300):
+        title = " ".join(rng.sample(vocab + ["其他", "news", "wars", "trades"], 3))
+        text = filter_set._combine_text(NewsRecord(source="s", title=title, url=""))
+        expected = next(
+            ((rule.action, rule.name, idx) for idx, rule in enumerate(filter_set.rules) if rule.matches(text)),
+            ("deny", None, None),
+        )
+        assert filter_set._evaluate(text) == expected
+
+
+def test_aho_corasick_reports_overlapping_tokens() -> None:
+    automaton = AhoCorasick(["he", "she", "his", "hers", "中美", "美日"])
+    hits = {automaton.patterns[idx] for idx in automaton.search("ushers 中美日")}
+    assert hits == {"he", "she", "hers", "中美", "美日"}
+
+
+def test_word_and_stem_match_modes() -> None:
+    word_rule = FilterRule(name="us", any_of=["US", "trade war"], match="word")
+    assert word_rule.matches("US and China resume talks")
+    assert word_rule.matches("Fears of a Trade War grow")
+    assert not word_rule.matches("Business confidence rises")
+    assert not word_rule.matches("trade warriors")
+
+    stem_rule = FilterRule(name="sanctions", all_of=["sanction"], none_of=["tariffs"], match="stem")
+    assert stem_rule.matches("EU sanctioned three firms")
+    assert stem_rule.matches("New sanctions announced")
+    assert not stem_rule.matches("Sanctions and a tariff hike")
+
+
+def test_segment_match_mode_respects_compounds() -> None:
+    pytest.importorskip("jieba")
+    rule = FilterRule(name="taiwan", any_of=["台湾"], match="segment")
+    assert rule.match == "segment"
+    assert rule.matches("中国大陆与台湾关系")
+    assert not rule.matches("台湾海峡局势")
+
+
+def test_profile_stats_and_explain(tmp_path) -> None:
+    path = tmp_path / "config.yaml"
+    rules = [
+        {"name": "ads", "action": "deny", "any_of": ["广告"]},
+        {"name": "china-us", "all_of": [["中国", "台湾"], ["美国"]], "none_of": ["旅游"]},
+    ]
+    path.write_text(
+        yaml.safe_dump(
+            {"filters": {"enabled": True, "default_action": "deny", "profile": True, "rules": rules}},
+            allow_unicode=True,
+        ),
+        encoding="utf-8",
+    )
+    filter_set = FilterSet(path)
+    records = [
+        NewsRecord(source="s", title="台湾与美国会谈", url="1"),
+        NewsRecord(source="s", title="美国旅游广告", url="2"),
+        NewsRecord(source="s", title="中国美国旅游合作", url="3"),
+        NewsRecord(source="s", title="其他", url="4", raw={"_prefilter_relevant": False}),
+    ]
+
+    allowed = filter_set.apply(records)
+
+    assert [record.url for record in allowed] == ["1"]
+    ads, china_us = filter_set.profile_report()["rules"]
+    assert (ads["evaluations"], ads["hits"], ads["failed_any_of"]) == (3, 1, 2)
+    assert (china_us["evaluations"], china_us["hits"], china_us["skipped"]) == (2, 1, 1)
+    assert (china_us["failed_all_of"], china_us["failed_none_of"]) == (0, 1)
+    assert filter_set.scan_stats["prefilter_overrides"] == 1
+
+    explained = filter_set.explain(records[0])
+    assert (explained.action, explained.via, explained.rule) == ("allow", "rule", "china-us")
+    assert sorted(explained.tokens) == ["台湾", "美国"]
+    denied = filter_set.explain(records[2])
+    assert denied.trace[-1] == {"rule": "china-us", "result": "none_of", "tokens": ["旅游"]}
+    assert filter_set.explain(records[3]).via == "prefilter"
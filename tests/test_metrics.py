@@ -0,0 +1,113 @@
+"""Metrics registry and instrumentation tests."""
+from __future__ import annotations
+
+import json
+import urllib.request
+
+import pytest
+
+from ai import AIClient
+from fetcher.base_fetcher import BaseNewsFetcher, NewsRecord
+from pipeline import NewsPipeline
+from scheduler import RunMetrics
+from utils import config_loader
+from utils.metrics import REGISTRY, Counter, MetricsRegistry, MetricsServer, write_report
+
+SETTINGS = {
+    "notification": {"enable": False},
+    "ai": {"enabled": False},
+    "filters": {"enabled": True, "default_action": "deny", "rules": [{"name": "trade", "any_of": ["trade"]}]},
+}
+
+
+def test_prometheus_text_and_snapshot() -> None:
+    registry = MetricsRegistry()
+    requests_total = registry.counter("demo_requests_total", "请求数", ("channel",))
+    latency = registry.histogram("demo_seconds", "耗时", ("channel",), buckets=(0.1, 1))
+    requests_total.inc(channel='tele"gram')
+    requests_total.inc(2, channel='tele"gram')
+    latency.observe(0.05, channel="email")
+    latency.observe(0.5, channel="email")
+    latency.observe(5, channel="email")
+
+    assert registry.counter("demo_requests_total", "请求数", ("channel",)) is requests_total
+    assert registry.render_prometheus().splitlines() == [
+        "# HELP demo_requests_total 请求数",
+        "# TYPE demo_requests_total counter",
+        'demo_requests_total{channel="tele\\"gram"} 3',
+        "# HELP demo_seconds 耗时",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{channel="email",le="0.1"} 1',
+        'demo_seconds_bucket{channel="email",le="1"} 2',
+        'demo_seconds_bucket{channel="email",le="+Inf"} 3',
+        'demo_seconds_sum{channel="email"} 5.55',
+        'demo_seconds_count{channel="email"} 3',
+    ]
+    assert registry.snapshot()["demo_seconds"]["samples"] == [
+        {"labels": {"channel": "email"}, "count": 3, "sum": 5.55, "avg": 1.85}
+    ]
+
+
+def test_gauge_is_not_a_counter() -> None:
+    registry = MetricsRegistry()
+    gauge = registry.gauge("demo_items", "条数")
+    gauge.inc(3)
+    gauge.inc(-5)
+    assert gauge.value() == -2
+    assert not isinstance(gauge, Counter)
+    with pytest.raises(ValueError):
+        registry.counter("demo_items", "条数")
+    with pytest.raises(ValueError):
+        registry.counter("demo_total", "次数").inc(-1)
+
+
+class _TradeFetcher(BaseNewsFetcher):
+    def get_news_list(self):
+        return [
+            NewsRecord(source="s", title="trade talks", url="https://x/trade"),
+            NewsRecord(source="s", title="weather", url="https://x/weather"),
+        ]
+
+
+def test_pipeline_stages_and_components_feed_the_registry(tmp_path, monkeypatch) -> None:
+    monkeypatch.setitem(config_loader._CACHE, config_loader._cache_key(None), dict(SETTINGS))
+    REGISTRY.reset()
+    pipeline = NewsPipeline(tmp_path / "news.db")
+    try:
+        assert [item.title for item in pipeline.run([_TradeFetcher])] == ["trade talks", "weather"]
+        assert pipeline.run([_TradeFetcher]) == []
+        AIClient()._log_usage({"prompt_tokens": 120, "completion_tokens": 30}, "t", stage="AI 摘要")
+    finally:
+        pipeline.close()
+
+    snapshot = REGISTRY.snapshot()
+    stages = {sample["labels"]["stage"]: sample["count"] for sample in snapshot["radarflow_stage_duration_seconds"]["samples"]}
+    assert stages == {stage: 2 for stage in ("fetch", "dedup", "prefilter", "filter", "summary", "postfilter", "notify")}
+    assert REGISTRY.get("radarflow_fetch_records_total").value(source="_TradeFetcher") == 4
+    assert REGISTRY.get("radarflow_fetch_duration_seconds").count(source="_TradeFetcher", phase="detail") == 4
+    assert REGISTRY.get("radarflow_dedup_records_total").value(result="seen") == 2
+    assert REGISTRY.get("radarflow_filter_records_total").value(action="allow") == 1
+    assert REGISTRY.get("radarflow_filter_records_total").value(action="deny") == 1
+    assert REGISTRY.get("radarflow_pipeline_runs_total").value(status="ok") == 2
+    assert REGISTRY.get("radarflow_ai_tokens_total").value(stage="summary", kind="prompt") == 120
+
+
+def test_metrics_endpoint_and_json_report(tmp_path) -> None:
+    registry = MetricsRegistry()
+    registry.counter("demo_total", "示例").inc()
+    run_metrics = RunMetrics(runs=3, misfires=1)
+    registry.add_collector(run_metrics.export)
+    server = MetricsServer(registry=registry).start()
+    try:
+        host, port = server.address
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            body = response.read().decode("utf-8")
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    finally:
+        server.close()
+
+    assert "demo_total 1" in body
+    assert 'radarflow_scheduler_events{event="runs"} 3' in body
+    report = json.loads(write_report(tmp_path / "report.json", registry, mode="once").read_text(encoding="utf-8"))
+    assert report["mode"] == "once"
+    assert report["metrics"]["demo_total"]["samples"] == [{"labels": {}, "value": 1}]
@@ -0,0 +1,188 @@
+"""Notification dispatch tests."""
+from __future__ import annotations
+
+import re
+import smtplib
+import threading
+import time
+from email import message_from_string
+
+import yaml
+
+from fetcher.base_fetcher import NewsRecord
+from notifications import NotificationClient
+
+
+def _client(tmp_path, **overrides) -> NotificationClient:
+    notification = {
+        "enable": True,
+        "items_per_message": 1,
+        "feishu": {"webhook_url": "https://feishu.test/hook"},
+        "dingtalk": {"webhook_url": "https://dingtalk.test/hook"},
+        **overrides,
+    }
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump({"notification": notification}), encoding="utf-8")
+    return NotificationClient(path)
+
+
+def _records(count: int):
+    return [NewsRecord(source="s", title=f"title {idx}", url=f"https://x/{idx}") for idx in range(count)]
+
+
+def test_channels_dispatch_in_parallel_and_keep_order(tmp_path, monkeypatch) -> None:
+    client = _client(tmp_path)
+    sent = {"feishu": [], "dingtalk": []}
+    lock = threading.Lock()
+
+    def fake_post(url, payload):
+        channel = "feishu" if "feishu" in url else "dingtalk"
+        text = payload.get("content", {}).get("text") or payload.get("text", {}).get("content")
+        time.sleep(0.05)
+        with lock:
+            sent[channel].append(text)
+        return True
+
+    monkeypatch.setattr(client, "_post_json", fake_post)
+    result = client.send(_records(4))
+
+    assert result.summary() == {"feishu": True, "dingtalk": True}
+    assert result.elapsed < 0.35
+    for channel, texts in sent.items():
+        assert [next(f"title {idx}" for idx in range(4) if f"title {idx}" in text) for text in texts] == [
+            f"title {idx}" for idx in range(4)
+        ]
+        assert [message.index for message in result.channels[channel].messages] == [1, 2, 3, 4]
+        assert all(message.latency >= 0.04 for message in result.channels[channel].messages)
+
+
+def test_slow_channel_times_out_without_blocking_others(tmp_path, monkeypatch) -> None:
+    client = _client(tmp_path, channel_timeouts={"dingtalk": 0.2})
+
+    def fake_post(url, payload):
+        time.sleep(0.5 if "dingtalk" in url else 0.01)
+        return True
+
+    monkeypatch.setattr(client, "_post_json", fake_post)
+    started = time.monotonic()
+    result = client.send(_records(3))
+
+    assert time.monotonic() - started < 0.45
+    assert result.channels["feishu"].delivered == 3
+    assert result.channels["dingtalk"].timed_out
+    assert result.channels["dingtalk"].delivered == 0
+    time.sleep(0.6)  # 等待被放弃的发送线程结束，避免其日志写入已关闭的捕获流
+
+
+class _FakeSMTP:
+    instances: list = []
+
+    def __init__(self, host, port, timeout=None) -> None:
+        self.sent = []
+        self.drop_next = False
+        self.closed = False
+        _FakeSMTP.instances.append(self)
+
+    def login(self, user, password) -> None:
+        pass
+
+    def noop(self):
+        return (250, b"ok")
+
+    def sendmail(self, sender, recipients, message) -> None:
+        if self.drop_next:
+            self.drop_next = False
+            raise smtplib.SMTPServerDisconnected("gone")
+        self.sent.append(message)
+
+    def quit(self) -> None:
+        self.closed = True
+
+
+def _email_client(tmp_path, monkeypatch, **email) -> NotificationClient:
+    _FakeSMTP.instances = []
+    monkeypatch.setattr(smtplib, "SMTP_SSL", _FakeSMTP)
+    return _client(
+        tmp_path,
+        feishu={},
+        dingtalk={},
+        email={"from": "bot@test", "password": "pw", "to": "a@test", "smtp_server": "smtp.test", **email},
+    )
+
+
+def test_email_reuses_one_connection_and_reconnects_once(tmp_path, monkeypatch) -> None:
+    client = _email_client(tmp_path, monkeypatch)
+    sender = client.channel_sender("email")
+
+    assert sender("one") and sender("two")
+    assert len(_FakeSMTP.instances) == 1
+    _FakeSMTP.instances[0].drop_next = True
+    assert sender("three")
+    assert len(_FakeSMTP.instances) == 2
+    assert len(_FakeSMTP.instances[1].sent) == 1
+
+    client.close()
+    assert _FakeSMTP.instances[1].closed
+
+
+def test_email_digest_renders_single_html_message_with_toc(tmp_path, monkeypatch) -> None:
+    client = _email_client(tmp_path, monkeypatch, digest=True)
+    records = _records(5)
+    for idx, record in enumerate(records):
+        record.raw = {"_matched_rule": f"rule <{idx % 2}>", "_matched_rule_index": idx % 2}
+
+    result = client.send(records)
+
+    assert result.channels["email"].delivered == 1
+    message = _FakeSMTP.instances[0].sent[0]
+    assert "text/html" in message
+    body = message_from_string(message).get_payload(decode=True).decode("utf-8")
+    assert body.count('href="#news-') == 5
+    assert body.index("rule &lt;0&gt;") < body.index("rule &lt;1&gt;")
+    assert all(f'id="news-{idx}"' in body for idx in range(1, 6))
+
+
+def test_messages_are_packed_up_to_channel_limit_with_group_headers(tmp_path) -> None:
+    client = _client(
+        tmp_path,
+        items_per_message=0,
+        feishu={},
+        dingtalk={},
+        telegram={"bot_token": "t", "chat_id": "c"},
+        message_limits={"telegram": 700},
+    )
+    records = _records(12)
+    for record in records:
+        record.raw = {"_matched_rule": "rule <a>", "_matched_rule_index": 0}
+    records.append(NewsRecord(source="s", title="Q&A " * 300, url="https://x/long", raw={"_matched_rule": "big"}))
+
+    messages = client.render(records, {})["telegram"]
+
+    assert all(len(text) <= 700 for text, _ in messages)
+    assert 1 < len(messages) < 13
+    packed = [batch for text, batch in messages if batch[0].url != "https://x/long"]
+    assert [record.url for batch in packed for record in batch] == [record.url for record in records[:12]]
+    assert all("<b>[rule &lt;a&gt;]</b>" in text for text, batch in messages if batch in packed)
+    long_parts = [text for text, batch in messages if batch[0].url == "https://x/long"]
+    assert len(long_parts) > 1
+    assert all(not re.search(r"&[a-z]*$|^[a-z]*;", part) for part in long_parts)
+    assert all(part.count("<a ") == part.count("</a>") for part in long_parts)
+
+
+def test_render_builds_each_view_once_across_styles(tmp_path, monkeypatch) -> None:
+    client = _client(
+        tmp_path,
+        telegram={"bot_token": "t", "chat_id": "c"},
+        wechat_work={"webhook_url": "https://wework.test/hook", "msgtype": "markdown"},
+    )
+    built = []
+    original = client._build_view
+    monkeypatch.setattr(client, "_build_view", lambda item, summary: built.append(item) or original(item, summary))
+
+    rendered = client.render(_records(3), {})
+
+    assert len(built) == 3
+    assert set(rendered) == {"feishu", "dingtalk", "wechat_work", "telegram"}
+    assert rendered["feishu"] == rendered["dingtalk"]
+    assert "<a href=" in rendered["telegram"][0][0]
+    assert "[title 0](https://x/0)" in rendered["wechat_work"][0][0]
@@ -0,0 +1,141 @@
+"""Notification outbox tests."""
+from __future__ import annotations
+
+import threading
+import time
+
+import yaml
+
+from deduper import SQLiteDeduper
+from fetcher.base_fetcher import NewsRecord
+from notifications import NotificationClient
+from outbox import NotificationOutbox, TokenBucket
+
+
+def _setup(tmp_path, **outbox_cfg):
+    path = tmp_path / "config.yaml"
+    notification = {
+        "enable": True,
+        "items_per_message": 1,
+        "feishu": {"webhook_url": "https://feishu.test/hook"},
+        "outbox": {"base_delay_sec": 0.01, "drain_timeout_sec": 2, **outbox_cfg},
+    }
+    path.write_text(yaml.safe_dump({"notification": notification}), encoding="utf-8")
+    db_path = tmp_path / "news.db"
+    return NotificationClient(path), NotificationOutbox(db_path, path), SQLiteDeduper(db_path), path, db_path
+
+
+def _records(count: int):
+    return [NewsRecord(source="s", title=f"title {idx}", url=f"https://x/{idx}") for idx in range(count)]
+
+
+def test_failed_posts_are_retried_and_marked_only_after_delivery(tmp_path, monkeypatch) -> None:
+    notifier, outbox, deduper, _, _ = _setup(tmp_path)
+    calls = []
+
+    def flaky_post(url, payload):
+        calls.append(payload["content"]["text"])
+        return len(calls) > 1
+
+    monkeypatch.setattr(notifier, "_post_json", flaky_post)
+    records = _records(2)
+    awaiting = outbox.enqueue(notifier.render(records, {}))
+    assert len(awaiting) == 2
+
+    result = outbox.drain(notifier)
+    assert result.channels["feishu"].delivered == 2
+    assert len(calls) == 3
+    assert outbox.settle(deduper) == 2
+    assert all(deduper.is_seen(record) for record in records)
+    assert outbox.pending_news_ids() == set()
+
+    assert outbox.enqueue(notifier.render(records, {})) == set()
+    outbox.drain(notifier)
+    assert len(calls) == 3
+
+
+def test_every_chunk_of_an_oversized_item_is_enqueued(tmp_path, monkeypatch) -> None:
+    notifier, outbox, deduper, _, _ = _setup(tmp_path)
+    notifier.message_limits = {"feishu": 400}
+    sent = []
+    monkeypatch.setattr(notifier, "_post_json", lambda url, payload: sent.append(payload["content"]["text"]) or True)
+    record = NewsRecord(source="s", title="long " * 400, url="https://x/long")
+    rendered = notifier.render([record], {})
+    assert len(rendered["feishu"]) > 2
+
+    outbox.enqueue(rendered)
+    assert outbox._count_pending() == len(rendered["feishu"])
+    outbox.drain(notifier)
+    assert sent == [body for body, _ in rendered["feishu"]]
+    assert outbox.settle(deduper) == 1
+    assert outbox.enqueue(notifier.render([record], {})) == set()
+
+
+def test_message_still_sending_after_channel_timeout_is_not_retried(tmp_path, monkeypatch) -> None:
+    notifier, outbox, deduper, _, _ = _setup(tmp_path)
+    notifier.channel_timeout = 0.2
+    release = threading.Event()
+    slow_calls, quick_calls = [], []
+
+    def slow(text):
+        slow_calls.append(text)
+        release.wait(5)
+        return True
+
+    def quick(text):
+        quick_calls.append(text)
+        return len(quick_calls) > 1
+
+    senders = {"feishu": slow, "telegram": quick}
+    monkeypatch.setattr(notifier, "channel_sender", lambda channel: senders[channel])
+    slow_record, quick_record = _records(2)
+    outbox.enqueue({"feishu": [("slow", [slow_record])], "telegram": [("quick", [quick_record])]})
+
+    result = outbox.drain(notifier)
+    assert result.channels["feishu"].timed_out
+    assert len(quick_calls) == 2
+    assert slow_calls == ["slow"]
+
+    release.set()
+    for _ in range(100):
+        if not outbox._count_pending():
+            break
+        time.sleep(0.05)
+    outbox.drain(notifier)
+    assert slow_calls == ["slow"]
+    assert outbox.settle(deduper) == 2
+
+
+def test_pending_messages_survive_restart_and_give_up_after_max_attempts(tmp_path, monkeypatch) -> None:
+    notifier, outbox, deduper, path, db_path = _setup(tmp_path, max_attempts=2)
+    records = _records(1)
+    outbox.enqueue(notifier.render(records, {}))
+    outbox.close()
+
+    restarted = NotificationOutbox(db_path, path)
+    assert len(restarted.pending_news_ids()) == 1
+    attempts = []
+    monkeypatch.setattr(notifier, "_post_json", lambda url, payload: attempts.append(url) and False)
+
+    restarted.drain(notifier)
+
+    assert len(attempts) == 2
+    assert not deduper.is_seen(records[0])
+    assert restarted.settle(deduper) == 1
+    assert deduper.is_seen(records[0])
+
+
+def test_token_bucket_refills_at_configured_rate() -> None:
+    now = [0.0]
+    sleeps = []
+
+    def fake_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(per_minute=60, burst=2, clock=lambda: now[0], sleep=fake_sleep)
+    assert bucket.acquire() and bucket.acquire()
+    assert sleeps == []
+    assert not bucket.acquire(deadline=0.5)
+    assert bucket.acquire(deadline=5)
+    assert sleeps == [1.0]
@@ -0,0 +1,89 @@
+"""Resident pipeline reuse tests."""
+from __future__ import annotations
+
+import threading
+
+from fetcher.aggregator import collect_news
+from fetcher.base_fetcher import BaseNewsFetcher, NewsRecord
+from pipeline import NewsPipeline
+from utils import config_loader
+
+SETTINGS = {"notification": {"enable": False}, "ai": {"enabled": False}, "filters": {"enabled": False}}
+
+
+def _in_thread(func, *args):
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault("value", func(*args)))
+    thread.start()
+    thread.join()
+    return result["value"]
+
+
+def test_resident_pipeline_reuses_components_and_rebuilds_when_needed(tmp_path, monkeypatch) -> None:
+    key = config_loader._cache_key(None)
+    monkeypatch.setitem(config_loader._CACHE, key, dict(SETTINGS))
+    pipeline = NewsPipeline(tmp_path / "news.db")
+    record = NewsRecord(source="s", title="t", url="https://x/1")
+
+    assert len(_in_thread(pipeline.process, [record])) == 1
+    assert _in_thread(pipeline.process, [NewsRecord(source="s", title="t", url="https://x/1")]) == []
+    assert pipeline.builds == 1
+
+    pipeline.components().deduper.conn.close()
+    assert pipeline.process([NewsRecord(source="s", title="t2", url="https://x/2")])
+    assert pipeline.builds == 2
+
+    monkeypatch.setitem(config_loader._CACHE, key, dict(SETTINGS))
+    pipeline.process([])
+    assert pipeline.builds == 2
+    pipeline.close()
+
+
+def test_config_change_rebuilds_only_affected_components(tmp_path, monkeypatch) -> None:
+    key = config_loader._cache_key(None)
+    monkeypatch.setitem(config_loader._CACHE, key, dict(SETTINGS))
+    pipeline = NewsPipeline(tmp_path / "news.db")
+    try:
+        before = pipeline.components()
+        deduper, outbox, ai_client, notifier = before.deduper, before.outbox, before.ai_client, before.notifier
+        fetcher = object()
+        pipeline._fetchers[_FlakyFetcher] = fetcher
+
+        monkeypatch.setitem(config_loader._CACHE, key, {**SETTINGS, "notification": {"enable": False, "title": "Radar"}})
+        after = pipeline.components()
+        assert after.notifier is not notifier and after.notifier.config.title == "Radar"
+        assert (after.deduper, after.outbox, after.ai_client) == (deduper, outbox, ai_client)
+        assert pipeline._fetchers == {_FlakyFetcher: fetcher}
+        assert pipeline.builds == 1
+
+        monkeypatch.setitem(
+            config_loader._CACHE, key, {**SETTINGS, "notification": {"enable": False, "title": "Radar"}, "fetching": {"max_workers": 2}}
+        )
+        assert pipeline.components().deduper is deduper
+        assert pipeline._fetchers == {}
+    finally:
+        pipeline.close()
+
+
+class _FlakyFetcher(BaseNewsFetcher):
+    created = 0
+
+    def __init__(self) -> None:
+        type(self).created += 1
+        self.calls = 0
+
+    def get_news_list(self):
+        self.calls += 1
+        if self.calls == 2:
+            raise RuntimeError("boom")
+        return [NewsRecord(source="s", title=f"t{self.calls}", url=f"https://x/{self.calls}")]
+
+
+def test_collect_news_reuses_fetchers_and_drops_failed_ones() -> None:
+    instances = {}
+
+    assert len(collect_news([_FlakyFetcher], instances=instances)) == 1
+    assert len(collect_news([_FlakyFetcher], instances=instances)) == 0
+    assert instances == {}
+    assert len(collect_news([_FlakyFetcher], instances=instances)) == 1
+    assert _FlakyFetcher.created == 2
@@ -0,0 +1,40 @@
+"""Prompt template precompilation tests."""
+from __future__ import annotations
+
+from pathlib import Path
+
+from ai.prompting import PromptTemplate
+from ai.usage import parse_usage
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_render_matches_plain_replace_and_keeps_json_braces() -> None:
+    text = '规则：{rules}\n格式 {"relevant": true}\n标题：{title}\n链接：{url}'
+    template = PromptTemplate(text, ("rules", "title", "url"))
+    values = {"rules": "[]", "title": "T", "url": "U"}
+    expected = text
+    for key, value in values.items():
+        expected = expected.replace(f"{{{key}}}", value)
+    assert template.render(values) == expected
+    assert template.bind({"rules": "[]"}).render({"title": "T", "url": "U"}) == expected
+
+
+def test_bundled_prompts_share_static_prefix_across_records() -> None:
+    for name, fields, static in (
+        ("news_summary.md", ("identity_hint", "title", "content", "current_time"), {"identity_hint": "立场"}),
+        ("ai_prefilter.md", ("rules", "title", "summary"), {"rules": '[{"name": "r"}]'}),
+    ):
+        template = PromptTemplate((ROOT / "prompts" / name).read_text(encoding="utf-8"), fields).bind(static)
+        first = template.render({"title": "A", "content": "a", "summary": "a", "current_time": "1"})
+        second = template.render({"title": "B", "content": "b", "summary": "b", "current_time": "2"})
+        prefix = template.static_prefix()
+        assert len(prefix) > len(first) // 2
+        assert first.startswith(prefix) and second.startswith(prefix)
+
+
+def test_parse_usage_reads_cached_tokens_from_known_formats() -> None:
+    assert parse_usage({"prompt_tokens": 10, "prompt_tokens_details": {"cached_tokens": 6}}).cached == 6
+    assert parse_usage({"prompt_tokens": 10, "prompt_cache_hit_tokens": 4}).cached == 4
+    stats = parse_usage({"prompt_tokens": 3, "completion_tokens": 2})
+    assert stats.total == 5 and stats.cached is None
@@ -0,0 +1,39 @@
+"""Local relevance model tests."""
+from __future__ import annotations
+
+from ai.relevance import LabeledSample, RelevanceModel, evaluate, extract_ngrams
+
+
+def _samples() -> list[LabeledSample]:
+    relevant = [
+        "中国与美国举行安全会谈",
+        "台湾海峡局势紧张，美国派舰",
+        "China and Japan discuss trade tensions",
+        "北京回应日本防卫白皮书",
+    ]
+    unrelated = [
+        "英超联赛周末比分汇总",
+        "NBA playoffs final score recap",
+        "明星演唱会门票售罄",
+        "Football transfer window rumours",
+    ]
+    return [LabeledSample(text, True) for text in relevant] + [LabeledSample(text, False) for text in unrelated]
+
+
+def test_extract_ngrams_mixes_words_and_cjk_chars() -> None:
+    grams = extract_ngrams("China 中国台湾")
+    assert "w:china" in grams
+    assert "c:中国" in grams
+    assert "c:国台湾" in grams
+
+
+def test_model_separates_training_classes_and_round_trips(tmp_path) -> None:
+    model = RelevanceModel.train(_samples(), n_features=1 << 12, epochs=20)
+    assert model.predict_proba("中国与美国举行会谈") > model.predict_proba("英超联赛比分")
+    path = tmp_path / "model.json"
+    model.save(path)
+    loaded = RelevanceModel.load(path)
+    assert abs(loaded.predict_proba("NBA final score") - model.predict_proba("NBA final score")) < 1e-3
+    report = evaluate(loaded, _samples(), reject_below=0.5)
+    assert report.total == 8
+    assert report.accuracy == 1.0
@@ -0,0 +1,241 @@
+"""Scheduler job planning tests."""
+from __future__ import annotations
+
+import random
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+import scheduler
+from fetcher.aggregator import AVAILABLE_FETCHERS, DEFAULT_FETCHER_CLASSES
+from fetcher.base_fetcher import NewsRecord
+from scheduler import (
+    AdaptiveSchedule,
+    CronSchedule,
+    IntervalSchedule,
+    RunCoordinator,
+    SourceJob,
+    _job_fetchers,
+    _load_jobs,
+    _observe_yield,
+)
+from utils.poll_stats import PollStats
+from utils.run_lock import RunLease
+from utils.settings import SettingsError, parse_settings
+
+
+def test_sources_get_their_own_jobs_and_the_rest_keep_global_cron() -> None:
+    default_names = [cls.__name__ for cls in DEFAULT_FETCHER_CLASSES]
+    config = parse_settings(
+        {
+            "scheduler": {
+                "cron": ["0 * * * *"],
+                "sources": {
+                    default_names[0]: {"interval_sec": 120},
+                    "ZaobaoRealtimeFetcher": {"cron": "*/2 * * * *", "interval_sec": 300},
+                    "MissingFetcher": {"interval_sec": 60},
+                },
+            }
+        },
+        env={},
+    )
+    jobs = _load_jobs(config.scheduler)
+
+    assert [job.name for job in jobs] == ["default", default_names[0], "ZaobaoRealtimeFetcher"]
+    assert [cls.__name__ for cls in jobs[0].fetchers] == default_names[1:]
+    assert [schedule.expression for schedule in jobs[2].schedules] == ["*/2 * * * *", "every 300s"]
+    assert len(_job_fetchers(jobs)) == len(default_names) + 1
+
+
+def test_adaptive_ratios_and_intervals_are_validated_separately() -> None:
+    scheduler_cfg = {
+        "adaptive": {"target_items": 0.5, "burst_factor": 1.5},
+        "sources": {"BBCNewsFetcher": {"adaptive": True, "min_interval_sec": 30, "max_interval_sec": 600}},
+    }
+    schedule = _load_jobs(parse_settings({"scheduler": scheduler_cfg}, env={}).scheduler)[0].schedules[0]
+
+    assert (schedule.target_items, schedule.burst_factor, schedule.min_seconds) == (0.5, 1.5, 30)
+    with pytest.raises(SettingsError) as excinfo:
+        parse_settings(
+            {
+                "scheduler": {
+                    "adaptive": {"target_items": 0, "backoff": 0.5},
+                    "sources": {"BBCNewsFetcher": {"interval_sec": "bad", "min_interval_sec": 0.5}},
+                }
+            },
+            env={},
+        )
+    assert excinfo.value.errors == [
+        "config.scheduler.adaptive.target_items 必须大于 0: 0",
+        "config.scheduler.adaptive.backoff 不能小于 1: 0.5",
+        "config.scheduler.sources.BBCNewsFetcher.min_interval_sec 不能小于 1: 0.5",
+        "config.scheduler.sources.BBCNewsFetcher.interval_sec 必须是数字: 'bad'",
+    ]
+
+
+def test_job_advance_uses_earliest_schedule_and_skips_missed_runs() -> None:
+    start = datetime(2024, 5, 1, 12, 0, 30, tzinfo=timezone.utc)
+    job = SourceJob("hot", [IntervalSchedule(120), CronSchedule("5 * * * *")], [])
+
+    assert job.advance(start) == 0
+    assert job.next_time == start + timedelta(seconds=120)
+    assert job.advance(start + timedelta(seconds=121)) == 0
+    assert job.next_time == datetime(2024, 5, 1, 12, 4, 30, tzinfo=timezone.utc)
+    late = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    assert job.advance(late) > 0
+    assert job.next_time == late + timedelta(seconds=120)
+
+
+def test_misfire_policies_coalesce_or_queue_missed_triggers() -> None:
+    start = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+    late = start + timedelta(seconds=650)
+
+    coalesce = SourceJob("a", [IntervalSchedule(60)], [], next_time=start)
+    assert coalesce.advance(late, "coalesce") == 9
+    assert coalesce.next_time == start + timedelta(seconds=600)
+    assert coalesce.advance(late, "coalesce") == 0
+    assert coalesce.next_time == start + timedelta(seconds=660)
+
+    queue = SourceJob("b", [IntervalSchedule(60)], [], next_time=start)
+    assert queue.advance(late, "queue", max_queue=3) == 7
+    assert queue.next_time == start + timedelta(seconds=480)
+    assert queue.advance(late, "queue", max_queue=3) == 0
+    assert queue.next_time == start + timedelta(seconds=540)
+
+
+def test_run_lease_excludes_other_owners_until_expiry(tmp_path) -> None:
+    now = [1000.0]
+    first = RunLease(tmp_path / "state.db", ttl_sec=60, owner="a", clock=lambda: now[0])
+    second = RunLease(tmp_path / "state.db", ttl_sec=60, owner="b", clock=lambda: now[0])
+
+    assert first.acquire()
+    assert not second.acquire()
+    assert second.holder() == ("a", 1060.0)
+    now[0] = 1050.0
+    assert first.renew()
+    now[0] = 1100.0
+    assert not second.acquire()
+    now[0] = 1111.0
+    assert second.acquire()
+    assert not first.renew()
+    second.release()
+    assert first.acquire()
+    first.close()
+    second.close()
+
+
+def test_coordinator_skips_when_lease_is_held_elsewhere(tmp_path, monkeypatch) -> None:
+    calls = []
+    monkeypatch.setattr(scheduler, "run_once", lambda fetchers, cancel=None: calls.append(fetchers) or [])
+    other = RunLease(tmp_path / "state.db", owner="other")
+    coordinator = RunCoordinator(RunLease(tmp_path / "state.db", owner="me"))
+
+    assert other.acquire()
+    assert coordinator.run([]) is None
+    other.release()
+    assert coordinator.run([]) == []
+    assert calls == [[]]
+    assert coordinator.metrics.lock_skipped == 1
+    assert coordinator.lease.holder() is None
+    coordinator.close()
+    other.close()
+
+
+def _random_field(rng: random.Random, minimum: int, maximum: int) -> str:
+    roll = rng.random()
+    if roll < 0.4:
+        return "*"
+    if roll < 0.6:
+        return f"*/{rng.randint(2, maximum - minimum + 1)}"
+    if roll < 0.8:
+        start = rng.randint(minimum, maximum)
+        return f"{start}-{rng.randint(start, maximum)}"
+    return ",".join(str(rng.randint(minimum, maximum)) for _ in range(rng.randint(1, 3)))
+
+
+def test_cron_next_run_matches_minute_scan() -> None:
+    rng = random.Random(7)
+    for tz in (timezone.utc, ZoneInfo("Asia/Shanghai")):
+        for _ in range(60):
+            days = _random_field(rng, 1, 28)
+            weekdays = "*" if days != "*" else _random_field(rng, 0, 6)
+            schedule = CronSchedule(f"{_random_field(rng, 0, 59)} {_random_field(rng, 0, 23)} {days} * {weekdays}")
+            after = datetime(2021, 1, 1, tzinfo=tz) + timedelta(seconds=rng.randint(0, 4 * 365 * 86400))
+            assert schedule.next_run(after) == schedule._scan_next_run(after), schedule.expression
+
+
+def test_cron_next_run_handles_dst_and_sparse_expressions() -> None:
+    new_york = ZoneInfo("America/New_York")
+    nightly = CronSchedule("30 2 * * *")
+    assert nightly.next_run(datetime(2024, 3, 10, 1, 0, tzinfo=new_york)) == datetime(
+        2024, 3, 11, 2, 30, tzinfo=new_york
+    )
+
+    quarter = CronSchedule("*/15 1 * * *")
+    moment = datetime(2024, 11, 3, 0, 59, tzinfo=new_york)
+    fired = []
+    for _ in range(5):
+        moment = quarter.next_run(moment)
+        fired.append(moment.astimezone(timezone.utc).strftime("%m-%d %H:%M"))
+    assert fired == ["11-03 05:00", "11-03 05:15", "11-03 05:30", "11-03 05:45", "11-04 06:00"]
+
+    leap = CronSchedule("0 9 29 2 *")
+    assert leap.next_run(datetime(2097, 3, 1, tzinfo=timezone.utc)) == datetime(2104, 2, 29, 9, tzinfo=timezone.utc)
+    with pytest.raises(ValueError):
+        CronSchedule("0 0 31 2 *").next_run(datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+
+def test_adaptive_schedule_speeds_up_on_bursts_and_backs_off_when_quiet() -> None:
+    schedule = AdaptiveSchedule(seconds=600, min_seconds=60, max_seconds=3600)
+
+    assert schedule.update(new_items=2, rate=6.0) == 1.0
+    assert schedule.seconds == 600
+    schedule.update(new_items=9, rate=6.0)
+    assert schedule.seconds == 300
+    schedule.update(new_items=0, rate=6.0)
+    assert schedule.seconds == 600
+    for _ in range(10):
+        schedule.update(new_items=0, rate=0.0)
+    assert schedule.seconds == 3600
+    schedule.update(new_items=50, rate=200.0)
+    assert schedule.seconds == 60
+
+
+def test_poll_stats_blend_published_history_with_poll_yield(tmp_path) -> None:
+    db_path = tmp_path / "news.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("CREATE TABLE news_records (source TEXT, published_at TEXT, created_at TEXT DEFAULT CURRENT_TIMESTAMP)")
+    conn.executemany(
+        "INSERT INTO news_records (source, published_at) VALUES (?, ?)",
+        [("联合早报", "2024-05-01T08:15:00+00:00")] * 28,
+    )
+    conn.commit()
+    conn.close()
+    stats = PollStats(db_path, history_days=14)
+    polled_at = datetime.now(timezone.utc).replace(hour=8, minute=30) - timedelta(days=1)
+
+    assert stats.hourly_rates("ZaobaoRealtimeFetcher", ["联合早报"])[8] == 2.0
+    stats.record("ZaobaoRealtimeFetcher", interval_sec=3600, predicted=2.0, new_items=0, polled_at=polled_at.timestamp())
+    rates = stats.hourly_rates("ZaobaoRealtimeFetcher", ["联合早报"])
+    assert rates[8] == 1.0 and rates[9] == 0.0
+
+    fetcher_cls = AVAILABLE_FETCHERS["ZaobaoRealtimeFetcher"]
+    job = SourceJob("ZaobaoRealtimeFetcher", [AdaptiveSchedule(600, 60, 3600)], [fetcher_cls])
+    fresh = [NewsRecord(source="联合早报", title=f"t{idx}", url="", raw={"_fetcher": job.name}) for idx in range(4)]
+    fresh.append(NewsRecord(source="BBC", title="other", url="", raw={"_fetcher": "BBCNewsFetcher"}))
+    _observe_yield([job], fresh, stats, polled_at + timedelta(hours=1))
+
+    assert job.source_names == {"联合早报"}
+    assert job.adaptive.seconds == 300
+    assert stats.report() == [
+        {
+            "source": "ZaobaoRealtimeFetcher",
+            "polls": 2,
+            "avg_interval_sec": 2100.0,
+            "predicted": 2.0,
+            "actual": 4,
+            "empty_polls": 1,
+        }
+    ]
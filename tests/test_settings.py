@@ -0,0 +1,110 @@
+"""Typed settings model tests."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+import yaml
+
+from notifications import NotificationClient
+from utils.config_loader import load_settings
+from utils.config_watcher import ConfigWatcher
+from utils.settings import SettingsError, get_config, parse_settings
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _write(path, data, mtime: int) -> None:
+    path.write_text(yaml.safe_dump(data, allow_unicode=True), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_invalid_values_are_reported_together() -> None:
+    with pytest.raises(SettingsError) as excinfo:
+        parse_settings(
+            {
+                "ai": {"max_workers": "many", "timeout_sec": 0},
+                "ai_prefilter": {"mode": "both"},
+                "scheduler": {"misfire_policy": "later", "enabled": "sometimes"},
+                "notification": "off",
+            },
+            env={},
+        )
+
+    assert excinfo.value.errors == [
+        "config.ai.timeout_sec 不能小于 1: 0",
+        "config.ai.max_workers 必须是整数: 'many'",
+        "config.ai_prefilter.mode 必须是 separate / combined 之一: 'both'",
+        "config.notification 必须是映射: 'off'",
+        "config.scheduler.enabled 必须是 true/false: 'sometimes'",
+        "config.scheduler.misfire_policy 必须是 skip / coalesce / queue 之一: 'later'",
+    ]
+
+
+def test_component_sections_are_validated() -> None:
+    with pytest.raises(SettingsError) as excinfo:
+        parse_settings(
+            {
+                "ai": {"queue": {"token_budget": "lots", "chars_per_token": 0.1}},
+                "notification": {
+                    "outbox": {"max_attempts": 0, "base_delay_sec": 10, "max_delay_sec": 5},
+                    "aggregation": {"urgent_rules": "breaking"},
+                },
+                "sources": {"BBCNewsFetcher": {"concurrency": "many", "params": [1]}, "SCMPNewsFetcher": "yes"},
+                "fetching": {"max_workers": 0},
+            },
+            env={},
+        )
+
+    assert excinfo.value.errors == [
+        "config.ai.queue.token_budget 必须是整数: 'lots'",
+        "config.ai.queue.chars_per_token 不能小于 0.5: 0.1",
+        "config.notification.outbox.max_delay_sec 不能小于 base_delay_sec(10): 5.0",
+        "config.notification.outbox.max_attempts 不能小于 1: 0",
+        "config.notification.aggregation.urgent_rules 必须是列表: 'breaking'",
+        "config.sources.BBCNewsFetcher.params 必须是映射: [1]",
+        "config.sources.BBCNewsFetcher.concurrency 必须是整数: 'many'",
+        "config.sources.SCMPNewsFetcher 必须是 true/false 或映射: 'yes'",
+        "config.fetching.max_workers 不能小于 1: 0",
+    ]
+
+
+def test_example_config_passes_validation() -> None:
+    data = yaml.safe_load((ROOT / "config" / "config.example.yaml").read_text(encoding="utf-8"))
+
+    settings = parse_settings(data, env={})
+
+    assert settings.ai.max_items == -1
+
+
+def test_env_overrides_apply_consistently_without_touching_raw_config() -> None:
+    raw = {"ai": {"api_key": "file", "max_workers": 2}, "telegram": {"bot_token": "file", "chat_id": "1"}}
+    env = {"OPENAI_API_KEY": "env-key", "TELEGRAM_CHAT_ID": "42", "RADARFLOW__AI__MAX_WORKERS": "5"}
+
+    settings = parse_settings(raw, env=env)
+
+    assert settings.ai.api_key == settings.ai_prefilter.api_key == "env-key"
+    assert settings.ai.max_workers == 5
+    assert settings.notification.channel("telegram") == {"bot_token": "file", "chat_id": "42"}
+    assert raw == {"ai": {"api_key": "file", "max_workers": 2}, "telegram": {"bot_token": "file", "chat_id": "1"}}
+
+
+def test_typed_settings_are_shared_and_swapped_with_reloaded_config(tmp_path) -> None:
+    path = tmp_path / "config.yaml"
+    _write(path, {"notification": {"enable": True, "items_per_message": 3}}, 1_000)
+    watcher = ConfigWatcher(path)
+    first = get_config(path)
+
+    assert get_config(path) is first
+    assert NotificationClient(path).items_per_message == 3
+
+    _write(path, {"notification": {"enable": True, "items_per_message": "lots"}}, 2_000)
+    assert watcher.poll() is None
+    assert get_config(path) is first
+
+    _write(path, {"notification": {"enable": True, "items_per_message": 5}}, 3_000)
+    assert watcher.poll() is not None
+    second = get_config(path)
+    assert second is not first and second.raw["notification"] == load_settings(path)["notification"]
+    assert NotificationClient(path).items_per_message == 5
@@ -0,0 +1,84 @@
+"""Declarative source registry tests."""
+from __future__ import annotations
+
+import threading
+import time
+
+from fetcher.aggregator import collect_news
+from fetcher.base_fetcher import BaseNewsFetcher, NewsRecord
+from fetcher.eightworld import EightWorldNewsFetcher
+from fetcher.sources import GROUPS_ENV, SourceConfig, SourceSession, SourceSpec
+from scheduler import _load_jobs
+from utils.settings import parse_settings
+
+SETTINGS = {
+    "sources": {
+        "BBCNewsFetcher": {"enabled": True},
+        "EightWorldNewsFetcher": {
+            "params": {"max_pages": 3, "section_urls": ["https://www.8world.com/world"]},
+            "timeout_sec": 12,
+            "priority": 5,
+            "group": "heavy",
+        },
+        "SCMPNewsFetcher": False,
+        "MissingFetcher": {"enabled": True},
+    },
+    "fetching": {"max_workers": 2},
+}
+
+
+def test_enabled_sources_follow_priority_and_node_groups(monkeypatch) -> None:
+    monkeypatch.delenv(GROUPS_ENV, raising=False)
+    sources = SourceConfig(parse_settings(SETTINGS))
+
+    assert sources.enabled_names(["ZaobaoRealtimeFetcher"]) == ["EightWorldNewsFetcher", "BBCNewsFetcher"]
+    assert SourceConfig().enabled_names(["ZaobaoRealtimeFetcher"]) == ["ZaobaoRealtimeFetcher"]
+    assert sources.max_workers == 2
+
+    monkeypatch.setenv(GROUPS_ENV, "heavy")
+    heavy = SourceConfig(parse_settings(SETTINGS))
+    assert heavy.enabled_names([]) == ["EightWorldNewsFetcher"]
+    scheduler_cfg = {"cron": "*/5 * * * *", "sources": {"BBCNewsFetcher": {"interval_sec": 60}}}
+    jobs = _load_jobs(parse_settings({"scheduler": scheduler_cfg}).scheduler, heavy)
+    assert [(job.name, [cls.__name__ for cls in job.fetchers]) for job in jobs] == [
+        ("default", ["EightWorldNewsFetcher"])
+    ]
+
+
+def test_sources_map_onto_constructor_params_and_timeout() -> None:
+    fetcher = SourceConfig(parse_settings(SETTINGS)).create(EightWorldNewsFetcher)
+
+    assert fetcher.max_pages == 3
+    assert fetcher.section_urls == ["https://www.8world.com/world"]
+    assert isinstance(fetcher.session, SourceSession)
+    assert fetcher.session.timeout == 12
+
+
+class _SlowDetailFetcher(BaseNewsFetcher):
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def get_news_list(self):
+        return [NewsRecord(source="s", title=f"t{idx}", url=f"https://x/{idx}") for idx in range(6)]
+
+    def get_news_detail(self, record):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(0.02)
+        with cls.lock:
+            cls.active -= 1
+        return record
+
+
+def test_detail_requests_use_source_concurrency() -> None:
+    sources = SourceConfig()
+    sources.specs["_SlowDetailFetcher"] = SourceSpec("_SlowDetailFetcher", concurrency=3)
+
+    news = collect_news([_SlowDetailFetcher], sources=sources)
+
+    assert [record.title for record in news] == [f"t{idx}" for idx in range(6)]
+    assert 1 < _SlowDetailFetcher.peak <= 3
+    assert news[0].raw["_fetcher"] == "_SlowDetailFetcher"
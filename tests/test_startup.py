@@ -0,0 +1,48 @@
+"""Lazy fetcher registry and startup import tests."""
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from fetcher.aggregator import AVAILABLE_FETCHERS, DEFAULT_FETCHER_NAMES
+from fetcher.registry import FETCHER_MODULES
+from utils.startup_profile import format_report, parse_importtime
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_importing_entry_points_does_not_load_fetchers_or_jieba() -> None:
+    code = "import json, sys, scheduler; print(json.dumps(sorted(sys.modules)))"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=str(ROOT), check=True)
+    modules = set(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    assert not {f"fetcher.{name}" for name in FETCHER_MODULES.values()} & modules
+    assert "jieba" not in modules
+    assert "playwright" not in modules
+
+
+def test_registry_resolves_names_on_demand() -> None:
+    assert set(DEFAULT_FETCHER_NAMES) <= set(AVAILABLE_FETCHERS)
+    assert "MissingFetcher" not in AVAILABLE_FETCHERS
+    assert AVAILABLE_FETCHERS.get("MissingFetcher") is None
+    assert AVAILABLE_FETCHERS["ZaobaoRealtimeFetcher"].__name__ == "ZaobaoRealtimeFetcher"
+
+
+def test_importtime_output_is_summarized_per_module() -> None:
+    output = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     json.decoder",
+            "import time:       300 |        420 |   json",
+            "import time:      1000 |       1420 | main",
+        ]
+    )
+    timings = parse_importtime(output)
+
+    assert [(item.module, item.depth) for item in timings] == [("json.decoder", 2), ("json", 1), ("main", 0)]
+    report = format_report("main", timings, top=2).splitlines()
+    assert report[0].startswith("导入 main 共 1.4 ms")
+    assert report[2].split() == ["1.4", "1.0", "main"]
+    assert len(report) == 4
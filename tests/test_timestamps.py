@@ -0,0 +1,60 @@
+"""Timestamp normalization tests."""
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+from fetcher.aggregator import collect_news
+from fetcher.base_fetcher import BaseNewsFetcher, NewsRecord
+from fetcher.sources import SourceConfig
+from utils.timestamps import TimestampNormalizer
+
+NOW = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_formats_parse_to_utc_and_winning_format_is_learned_per_source() -> None:
+    normalizer = TimestampNormalizer(cache_size=2, clock=lambda: NOW)
+
+    assert normalizer.parse("2025-03-01T20:00:00+08:00") == NOW
+    assert normalizer.parse("1740830400") == NOW
+    assert normalizer.parse("01/03/2025 12:00", "8world") == NOW
+    assert normalizer.format_for("8world") == "%d/%m/%Y %H:%M"
+    assert normalizer.parse("Sat, 01 Mar 2025 12:00:00 GMT", "rss") == NOW
+    assert normalizer.parse("not a date") is None
+
+    assert len(normalizer._cache) == 2
+    misses = normalizer.misses
+    assert normalizer.parse("not a date") is None
+    assert normalizer.misses == misses and normalizer.hits == 1
+
+
+def test_relative_formats_follow_the_clock_and_are_not_cached() -> None:
+    clock = [NOW]
+    normalizer = TimestampNormalizer(clock=lambda: clock[0])
+
+    assert normalizer.parse("2 hrs ago", "BBC") == NOW - timedelta(hours=2)
+    assert normalizer.parse("an hour ago") == NOW - timedelta(hours=1)
+    assert normalizer.parse("1 day ago") == NOW - timedelta(days=1)
+    assert normalizer.parse("15分钟前") == NOW - timedelta(minutes=15)
+    clock[0] += timedelta(minutes=30)
+    assert normalizer.parse("2 hrs ago") == NOW - timedelta(hours=1, minutes=30)
+
+
+class _CardFetcher(BaseNewsFetcher):
+    def get_news_list(self):
+        return [
+            NewsRecord(source="BBC", title="a", url="https://x/a", published_at="2025-03-01 12:00"),
+            NewsRecord(source="BBC", title="b", url="https://x/b", published_at="just now"),
+        ]
+
+
+def test_records_carry_typed_utc_value_from_fetch_time() -> None:
+    first, second = collect_news([_CardFetcher], sources=SourceConfig())
+
+    assert first.published_utc == NOW
+    assert first.published_at == NOW.isoformat()
+    assert first.raw["original_published_at"] == "2025-03-01 12:00"
+    assert second.published_utc is not None and second.published_utc.tzinfo is not None
+
+    restored = NewsRecord(**json.loads(json.dumps(first.to_dict(), default=str)))
+    assert restored.published_utc == NOW
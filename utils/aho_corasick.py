@@ -0,0 +1,76 @@
+"""Aho–Corasick 多模式匹配：一次扫描文本即可得到所有命中的关键词。"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class AhoCorasick:
+    """对一组固定关键词构建自动机，`search` 返回文本中出现过的关键词 ID 集合。
+
+    关键词 ID 为其在 `patterns` 中的下标；重复关键词只保留首次出现的 ID。
+    匹配区分大小写，调用方需自行统一大小写。
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns: List[str] = []
+        self._ids: Dict[str, int] = {}
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for pattern in patterns:
+            if not pattern or pattern in self._ids:
+                continue
+            pattern_id = len(self.patterns)
+            self._ids[pattern] = pattern_id
+            self.patterns.append(pattern)
+            node = 0
+            for ch in pattern:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                node = nxt
+            outputs[node].append(pattern_id)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                fallback = goto[state].get(ch, 0)
+                fail[child] = fallback if fallback != child else 0
+                outputs[child].extend(outputs[fail[child]])
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs: List[Tuple[int, ...]] = [tuple(ids) for ids in outputs]
+        self._alphabet = frozenset(ch for pattern in self.patterns for ch in pattern)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def id_of(self, pattern: str) -> int:
+        return self._ids[pattern]
+
+    def search(self, text: str) -> Set[int]:
+        hits: Set[int] = set()
+        if not self.patterns or not text:
+            return hits
+        goto, fail, outputs, alphabet = self._goto, self._fail, self._outputs, self._alphabet
+        node = 0
+        for ch in text:
+            if ch not in alphabet:
+                node = 0
+                continue
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if outputs[node]:
+                hits.update(outputs[node])
+        return hits
@@ -1,7 +1,7 @@
 """统一的配置读取工具。"""
 from __future__ import annotations
 
-from functools import lru_cache
+import threading
 from pathlib import Path
 from typing import Any, Dict
 
@@ -9,26 +9,49 @@ import yaml
 
 DEFAULT_CONFIG_PATH = Path("config") / "config.yaml"
 
+_CACHE: Dict[str, Dict[str, Any]] = {}
+_LOCK = threading.Lock()
 
-@lru_cache(maxsize=8)
-def _load_cached(path_str: str) -> Dict[str, Any]:
-    path = Path(path_str)
-    if not path.exists():
+
+def _cache_key(path: Path | None) -> str:
+    return str((path or DEFAULT_CONFIG_PATH).resolve())
+
+
+def read_settings(path: Path | None = None) -> Dict[str, Any]:
+    """绕过缓存直接解析配置文件，解析失败时抛出异常。"""
+
+    target = path or DEFAULT_CONFIG_PATH
+    if not target.exists():
         return {}
-    with path.open("r", encoding="utf-8") as fh:
+    with target.open("r", encoding="utf-8") as fh:
         data = yaml.safe_load(fh) or {}
+    if not isinstance(data, dict):
+        raise ValueError(f"配置文件顶层必须是映射: {target}")
     return data
 
 
 def load_settings(path: Path | None = None) -> Dict[str, Any]:
     """加载完整配置，可传入自定义路径。"""
 
-    target = str((path or DEFAULT_CONFIG_PATH).resolve())
-    return _load_cached(target)
+    key = _cache_key(path)
+    cached = _CACHE.get(key)
+    if cached is not None:
+        return cached
+    data = read_settings(Path(key))
+    with _LOCK:
+        return _CACHE.setdefault(key, data)
+
+
+def replace_settings(path: Path | None, data: Dict[str, Any]) -> None:
+    """用已校验的新配置整体替换缓存，之后的 load_settings 立即读到新配置。"""
+
+    with _LOCK:
+        _CACHE[_cache_key(path)] = data
 
 
 def reload_settings(path: Path | None = None) -> Dict[str, Any]:
     """清理缓存后重新加载配置。"""
 
-    _load_cached.cache_clear()
+    with _LOCK:
+        _CACHE.clear()
     return load_settings(path)
@@ -0,0 +1,118 @@
+"""配置文件热更新：轮询 mtime，校验通过后原子替换配置缓存并报告差异；类型化配置随之失效重建。"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .config_loader import DEFAULT_CONFIG_PATH, load_settings, read_settings, replace_settings
+from .settings import parse_settings
+from .time_utils import clear_timezone_helpers
+
+logger = logging.getLogger(__name__)
+
+Validator = Callable[[Dict[str, Any]], None]
+
+
+@dataclass
+class ConfigChange:
+    sections: List[str] = field(default_factory=list)
+    rules_added: List[str] = field(default_factory=list)
+    rules_removed: List[str] = field(default_factory=list)
+    rules_modified: List[str] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not self.sections
+
+    def describe(self) -> str:
+        parts = [f"变更配置段: {', '.join(self.sections)}"]
+        if self.rules_added:
+            parts.append(f"新增规则: {', '.join(self.rules_added)}")
+        if self.rules_removed:
+            parts.append(f"删除规则: {', '.join(self.rules_removed)}")
+        if self.rules_modified:
+            parts.append(f"修改规则: {', '.join(self.rules_modified)}")
+        return "；".join(parts)
+
+
+def diff_settings(old: Dict[str, Any], new: Dict[str, Any]) -> ConfigChange:
+    change = ConfigChange()
+    change.sections = sorted(key for key in set(old) | set(new) if old.get(key) != new.get(key))
+    if "filters" not in change.sections:
+        return change
+    old_rules = _rules_by_name(old)
+    new_rules = _rules_by_name(new)
+    change.rules_added = [name for name in new_rules if name not in old_rules]
+    change.rules_removed = [name for name in old_rules if name not in new_rules]
+    change.rules_modified = [
+        name for name, rule in new_rules.items() if name in old_rules and old_rules[name] != rule
+    ]
+    return change
+
+
+def _rules_by_name(settings: Dict[str, Any]) -> Dict[str, Any]:
+    filters_cfg = settings.get("filters") or {}
+    rules = filters_cfg.get("rules") if isinstance(filters_cfg, dict) else None
+    result: Dict[str, Any] = {}
+    for idx, rule in enumerate(rules or []):
+        name = rule.get("name", "unnamed") if isinstance(rule, dict) else f"#{idx}"
+        result[str(name)] = rule
+    return result
+
+
+def validate_components(settings: Dict[str, Any]) -> None:
+    """先做类型化配置校验，再用新配置构建关键词过滤、AI 预过滤与后置过滤，任何异常都会阻止切换。"""
+
+    from ai import AIPreFilter, AISummaryFilter
+    from filters import FilterSet
+
+    parse_settings(settings)
+    FilterSet(settings=settings)
+    AIPreFilter(settings=settings)
+    AISummaryFilter(settings=settings)
+
+
+class ConfigWatcher:
+    """在调度间隙检查配置文件是否变化；只有新配置通过全部校验才会生效。"""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        validators: Sequence[Validator] = (validate_components,),
+    ) -> None:
+        self.path = path or DEFAULT_CONFIG_PATH
+        self.validators = list(validators)
+        self._current = load_settings(self.path)
+        self._signature = self._stat()
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self) -> Optional[ConfigChange]:
+        """配置文件有变化且校验通过时切换配置并返回差异，否则返回 None。"""
+
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return None
+        self._signature = signature
+        try:
+            candidate = read_settings(self.path)
+            for validator in self.validators:
+                validator(candidate)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("配置文件 %s 校验失败，继续使用旧配置: %s", self.path, exc)
+            return None
+        change = diff_settings(self._current, candidate)
+        if change.empty:
+            return None
+        replace_settings(self.path, candidate)
+        clear_timezone_helpers()
+        self._current = candidate
+        logger.info("配置已热更新 (%s)：%s", self.path, change.describe())
+        return change
@@ -0,0 +1,83 @@
+"""按渠道长度上限度量与切分消息文本。"""
+from __future__ import annotations
+
+import json
+import re
+from typing import Callable, Dict, List, Tuple
+
+Measure = Callable[[str], int]
+
+MEASURES: Dict[str, Measure] = {
+    "chars": len,
+    "bytes": lambda text: len(text.encode("utf-8")),
+    # 请求体按 JSON 转义后的长度计算（中文会被转义为 \uXXXX）
+    "json": lambda text: len(json.dumps(text)),
+}
+_TAG = re.compile(r"<(/?)([a-zA-Z]+)[^>]*>")
+
+
+def split_message(text: str, limit: int, measure: Measure = len, *, html_safe: bool = False) -> List[str]:
+    """把超长文本切成不超过 limit 的若干段，优先按行切分。
+
+    html_safe 为 True 时不会在 HTML 实体（&amp;）或标签（<a ...>）中间截断，
+    被切开的标签会在本段末尾闭合、在下一段开头重新打开。"""
+    if measure(text) <= limit:
+        return [text]
+    chunks: List[str] = []
+    current = ""
+    for line in text.split("\n"):
+        candidate = f"{current}\n{line}" if current else line
+        if measure(candidate) <= limit:
+            current = candidate
+            continue
+        if current:
+            chunks.append(current)
+            current = ""
+        while measure(line) > limit:
+            reserve = 0
+            if html_safe:
+                reserve = sum(measure(m.group(0)) + len(m.group(2)) + 3 for m in _TAG.finditer(line) if not m.group(1))
+                if reserve * 2 >= limit:
+                    line, reserve = _TAG.sub("", line), 0
+                    continue
+            cut = _safe_cut(line, limit - reserve, measure, html_safe)
+            head, line = line[:cut], line[cut:]
+            if html_safe:
+                open_tags = _open_tags(head)
+                head += "".join(f"</{name}>" for name, _ in reversed(open_tags))
+                line = "".join(tag for _, tag in open_tags) + line
+            chunks.append(head)
+        current = line
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _safe_cut(line: str, limit: int, measure: Measure, html_safe: bool) -> int:
+    low, high = 1, len(line)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if measure(line[:mid]) <= limit:
+            low = mid
+        else:
+            high = mid - 1
+    cut = low
+    if html_safe:
+        amp = line.rfind("&", 0, cut)
+        if amp > 0 and ";" not in line[amp:cut] and cut - amp <= 10:
+            cut = amp
+        tag = line.rfind("<", 0, cut)
+        if tag > 0 and tag > line.rfind(">", 0, cut):
+            cut = tag
+    return cut
+
+
+def _open_tags(text: str) -> List[Tuple[str, str]]:
+    stack: List[Tuple[str, str]] = []
+    for match in _TAG.finditer(text):
+        name = match.group(2).lower()
+        if not match.group(1):
+            stack.append((name, match.group(0)))
+        elif stack and stack[-1][0] == name:
+            stack.pop()
+    return stack
@@ -0,0 +1,350 @@
+"""进程内运行指标：计数器、仪表盘与直方图，可导出为 Prometheus 文本格式或 JSON 运行报告。
+
+各模块在导入时向全局 REGISTRY 注册自己的指标；调度模式下由 MetricsServer 提供 /metrics，
+单次运行结束时用 write_report 写出 JSON。"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 覆盖从单条 SQLite 查询到整轮 AI 摘要的耗时范围（秒）
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelKey = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _render_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelKey:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"指标 {self.name} 的标签应为 {self.labelnames}，实际为 {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelKey) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    @abstractmethod
+    def reset(self) -> None:
+        """清空取值，指标定义保留。"""
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        """返回 Prometheus 文本格式的样本行（不含 HELP/TYPE）。"""
+
+    @abstractmethod
+    def samples(self) -> List[Dict[str, Any]]:
+        """返回 JSON 运行报告中的样本列表。"""
+
+
+class _ValueMetric(_Metric):
+    """每组标签对应一个数值的指标，Counter 与 Gauge 共用。"""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def _add(self, amount: float, labels: Dict[str, Any]) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_render_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+    def samples(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [{"labels": self._labels(key), "value": value} for key, value in items]
+
+
+class Counter(_ValueMetric):
+    """只增不减的累计值。"""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError(f"计数器 {self.name} 不能减少: {amount}")
+        self._add(amount, labels)
+
+
+class Gauge(_ValueMetric):
+    """可任意设置的瞬时值。"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        self._add(amount, labels)
+
+
+class _HistogramState:
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self, size: int) -> None:
+        self.buckets = [0] * size
+        self.count = 0
+        self.sum = 0.0
+
+
+class Histogram(_Metric):
+    """按桶统计耗时分布，同时记录总次数与总和。"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+        self._states: Dict[LabelKey, _HistogramState] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = _HistogramState(len(self.buckets))
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state.buckets[idx] += 1
+                    break
+            state.count += 1
+            state.sum += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """记录 with 块的耗时；块内抛出异常时同样记录。"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: Any) -> int:
+        with self._lock:
+            state = self._states.get(self._key(labels))
+            return state.count if state else 0
+
+    def sum(self, **labels: Any) -> float:
+        with self._lock:
+            state = self._states.get(self._key(labels))
+            return state.sum if state else 0.0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._states.clear()
+
+    def _snapshot(self) -> List[Tuple[LabelKey, List[int], int, float]]:
+        with self._lock:
+            return [(key, list(state.buckets), state.count, state.sum) for key, state in sorted(self._states.items())]
+
+    def render(self) -> List[str]:
+        lines: List[str] = []
+        names = (*self.labelnames, "le")
+        for key, buckets, count, total in self._snapshot():
+            cumulative = 0
+            for bound, hits in zip(self.buckets, buckets):
+                cumulative += hits
+                lines.append(f"{self.name}_bucket{_render_labels(names, (*key, _format_value(bound)))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_render_labels(names, (*key, '+Inf'))} {count}")
+            lines.append(f"{self.name}_sum{_render_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_render_labels(self.labelnames, key)} {count}")
+        return lines
+
+    def samples(self) -> List[Dict[str, Any]]:
+        return [
+            {"labels": self._labels(key), "count": count, "sum": round(total, 6), "avg": round(total / count, 6) if count else 0.0}
+            for key, _, count, total in self._snapshot()
+        ]
+
+
+class MetricsRegistry:
+    """按名称登记指标；重复注册同名同类型的指标时返回已有对象。"""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[["MetricsRegistry"], None]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, help_text, labelnames)  # type: ignore[return-value]
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, help_text, labelnames)  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, help_text, labelnames, buckets=buckets)  # type: ignore[return-value]
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def add_collector(self, collector: Callable[["MetricsRegistry"], None]) -> None:
+        """注册在每次导出前调用的回调，用于把其他组件维护的统计同步为指标。"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[["MetricsRegistry"], None]) -> None:
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def reset(self) -> None:
+        """清空全部指标的取值，指标定义保留。"""
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        for metric in self._collect():
+            body = metric.render()
+            if not body:
+                continue
+            lines.append(f"# HELP {metric.name} {_escape(metric.help)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(body)
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            metric.name: {"type": metric.kind, "help": metric.help, "samples": samples}
+            for metric in self._collect()
+            if (samples := metric.samples())
+        }
+
+    def _collect(self) -> List[_Metric]:
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            try:
+                collector(self)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("指标采集回调失败: %s", exc)
+        return sorted(self._metrics.values(), key=lambda metric: metric.name)
+
+    def _register(self, cls: type, name: str, help_text: str, labelnames: Sequence[str], **kwargs: Any) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"指标 {name} 已以不同的类型或标签注册")
+            return metric
+
+
+REGISTRY = MetricsRegistry()
+
+
+def write_report(path: Path, registry: MetricsRegistry = REGISTRY, **extra: Any) -> Path:
+    """把当前指标写成 JSON 运行报告，供单次运行（非调度模式）事后查看。"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    report = {"generated_at": datetime.now(timezone.utc).isoformat(), **extra, "metrics": registry.snapshot()}
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+class MetricsServer:
+    """在后台线程中提供 Prometheus 文本格式的 /metrics 端点。port 为 0 时由系统分配端口。"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, registry: MetricsRegistry = REGISTRY) -> None:
+        self.registry = registry
+        registry_ref = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry_ref.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                logger.debug("metrics: " + format, *args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        host, port = self._server.server_address[:2]
+        return str(host), int(port)
+
+    def start(self) -> "MetricsServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="radarflow-metrics", daemon=True)
+        self._thread.start()
+        logger.info("指标端点已启动: http://%s:%d/metrics", *self.address)
+        return self
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._server.server_close()
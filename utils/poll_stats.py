@@ -0,0 +1,148 @@
+"""新闻源轮询统计：记录每次抓取的预测/实际新增条数，并按一天中的小时估计到达速率。"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .time_utils import parse_datetime_string
+
+HOURS_PER_DAY = 24
+# news_records 中的发布时间分布作为先验，相当于每个小时段已观察了这么长时间（小时）
+PRIOR_WEIGHT_HOURS = 1.0
+PRIOR_CACHE_SEC = 3600.0
+
+
+class PollStats:
+    """把每次轮询结果写入 poll_stats 表，供自适应调度估计各新闻源的到达速率。"""
+
+    def __init__(self, db_path: Path, *, history_days: int = 14, tz: Optional[tzinfo] = None) -> None:
+        self.history_days = max(1, history_days)
+        self.tz = tz or timezone.utc
+        if not db_path.parent.exists():
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._prior_cache: Dict[Tuple[str, ...], Tuple[float, List[float]]] = {}
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS poll_stats (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT,
+                polled_at REAL,
+                hour INTEGER,
+                interval_sec REAL,
+                predicted REAL,
+                new_items INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_poll_stats_source ON poll_stats(source, polled_at);
+            """
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def record(
+        self,
+        source: str,
+        *,
+        interval_sec: float,
+        predicted: float,
+        new_items: int,
+        polled_at: Optional[float] = None,
+    ) -> None:
+        polled_at = time.time() if polled_at is None else polled_at
+        hour = datetime.fromtimestamp(polled_at, self.tz).hour
+        with self._lock:
+            self.conn.execute(
+                """
+                INSERT INTO poll_stats (source, polled_at, hour, interval_sec, predicted, new_items)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (source, polled_at, hour, interval_sec, predicted, new_items),
+            )
+            self.conn.commit()
+
+    def hourly_rates(
+        self,
+        source: str,
+        source_names: Iterable[str] = (),
+        *,
+        now: Optional[float] = None,
+    ) -> List[float]:
+        """返回 24 个小时段的估计到达速率（条/小时）。
+
+        以轮询实测的新增条数 / 覆盖时长为主，news_records 的发布时间分布按 PRIOR_WEIGHT_HOURS 作为先验。"""
+        now = time.time() if now is None else now
+        since = now - self.history_days * 86400
+        new_items = [0.0] * HOURS_PER_DAY
+        covered = [0.0] * HOURS_PER_DAY
+        with self._lock:
+            rows = self.conn.execute(
+                """
+                SELECT hour, SUM(new_items), SUM(interval_sec) FROM poll_stats
+                WHERE source = ? AND polled_at >= ? GROUP BY hour
+                """,
+                (source, since),
+            ).fetchall()
+        for hour, items, seconds in rows:
+            new_items[hour] = float(items or 0)
+            covered[hour] = float(seconds or 0) / 3600
+        prior = self._published_prior(tuple(sorted(set(source_names))), now)
+        return [
+            (new_items[hour] + prior[hour] * PRIOR_WEIGHT_HOURS) / (covered[hour] + PRIOR_WEIGHT_HOURS)
+            for hour in range(HOURS_PER_DAY)
+        ]
+
+    def report(self, since_days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """按新闻源汇总轮询次数、平均间隔以及预测与实际新增条数。"""
+        since = time.time() - (since_days or self.history_days) * 86400
+        with self._lock:
+            rows = self.conn.execute(
+                """
+                SELECT source, COUNT(*), AVG(interval_sec), SUM(predicted), SUM(new_items), SUM(new_items = 0)
+                FROM poll_stats WHERE polled_at >= ? GROUP BY source ORDER BY source
+                """,
+                (since,),
+            ).fetchall()
+        return [
+            {
+                "source": source,
+                "polls": polls,
+                "avg_interval_sec": round(avg_interval or 0, 1),
+                "predicted": round(predicted or 0, 1),
+                "actual": int(actual or 0),
+                "empty_polls": int(empty or 0),
+            }
+            for source, polls, avg_interval, predicted, actual, empty in rows
+        ]
+
+    def _published_prior(self, source_names: Tuple[str, ...], now: float) -> List[float]:
+        if not source_names:
+            return [0.0] * HOURS_PER_DAY
+        cached = self._prior_cache.get(source_names)
+        if cached and now - cached[0] < PRIOR_CACHE_SEC:
+            return cached[1]
+        cutoff = datetime.fromtimestamp(now, timezone.utc) - timedelta(days=self.history_days)
+        counts = [0] * HOURS_PER_DAY
+        marks = ",".join("?" for _ in source_names)
+        with self._lock:
+            try:
+                rows = self.conn.execute(
+                    f"SELECT published_at FROM news_records WHERE source IN ({marks}) AND created_at >= ?",
+                    (*source_names, cutoff.strftime("%Y-%m-%d %H:%M:%S")),
+                ).fetchall()
+            except sqlite3.OperationalError:  # news_records 尚未创建
+                rows = []
+        for (published_at,) in rows:
+            moment = parse_datetime_string(published_at)
+            if moment is not None:
+                counts[moment.astimezone(self.tz).hour] += 1
+        prior = [count / self.history_days for count in counts]
+        self._prior_cache[source_names] = (now, prior)
+        return prior
@@ -0,0 +1,103 @@
+"""基于 SQLite 的运行租约，防止多个实例同时对同一个 state 数据库执行抓取任务。"""
+from __future__ import annotations
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+DEFAULT_LEASE_TTL_SEC = 300.0
+
+
+class RunLease:
+    """持有者需在 ttl 内续约；进程崩溃后租约过期，其他实例即可接管。"""
+
+    def __init__(
+        self,
+        db_path: Path,
+        name: str = "pipeline",
+        *,
+        ttl_sec: float = DEFAULT_LEASE_TTL_SEC,
+        owner: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.name = name
+        self.ttl_sec = max(1.0, ttl_sec)
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.clock = clock
+        self.held = False
+        if not db_path.parent.exists():
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(db_path), timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS run_leases (
+                name TEXT PRIMARY KEY,
+                owner TEXT,
+                acquired_at REAL,
+                expires_at REAL
+            )
+            """
+        )
+
+    def acquire(self) -> bool:
+        """租约空闲、已过期或本来就由自己持有时获取成功。"""
+        with self._lock:
+            now = self.clock()
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute(
+                    "SELECT owner, expires_at FROM run_leases WHERE name = ?", (self.name,)
+                ).fetchone()
+                if row and row[0] != self.owner and row[1] > now:
+                    self.conn.execute("ROLLBACK")
+                    return False
+                self.conn.execute(
+                    """
+                    INSERT INTO run_leases (name, owner, acquired_at, expires_at) VALUES (?, ?, ?, ?)
+                    ON CONFLICT(name) DO UPDATE SET
+                        owner = excluded.owner, acquired_at = excluded.acquired_at, expires_at = excluded.expires_at
+                    """,
+                    (self.name, self.owner, now, now + self.ttl_sec),
+                )
+                self.conn.execute("COMMIT")
+            except sqlite3.Error:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.held = True
+            return True
+
+    def renew(self) -> bool:
+        """延长租约；租约已被其他实例接管时返回 False。"""
+        with self._lock:
+            cur = self.conn.execute(
+                "UPDATE run_leases SET expires_at = ? WHERE name = ? AND owner = ?",
+                (self.clock() + self.ttl_sec, self.name, self.owner),
+            )
+            self.held = cur.rowcount > 0
+            return self.held
+
+    def release(self) -> None:
+        with self._lock:
+            self.conn.execute("DELETE FROM run_leases WHERE name = ? AND owner = ?", (self.name, self.owner))
+            self.held = False
+
+    def holder(self) -> Optional[Tuple[str, float]]:
+        """返回当前有效租约的持有者与过期时间。"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT owner, expires_at FROM run_leases WHERE name = ? AND expires_at > ?",
+                (self.name, self.clock()),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def close(self) -> None:
+        if self.held:
+            self.release()
+        with self._lock:
+            self.conn.close()
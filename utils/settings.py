@@ -0,0 +1,687 @@
+"""类型化配置：启动时解析并校验一次，各组件共享同一份只读对象；热更新时随原始配置一起原子替换。
+
+环境变量覆盖统一在解析前应用：RADARFLOW__<段>__<键>（按 YAML 语法解析取值，例如
+RADARFLOW__AI__MAX_WORKERS=4），以及兼容既有的 OPENAI_API_KEY、TELEGRAM_BOT_TOKEN 等变量名。
+"""
+from __future__ import annotations
+
+import copy
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import yaml
+
+from .config_loader import _cache_key, load_settings
+from .text_index import DEFAULT_MATCH_MODE, MATCH_MODES
+
+ENV_PREFIX = "RADARFLOW__"
+# 既有环境变量名 -> 覆盖的配置路径；同一配置项靠后的变量优先（ARK_API_KEY 优先于 OPENAI_API_KEY）
+ENV_ALIASES: Dict[str, Tuple[Tuple[str, ...], ...]] = {
+    "OPENAI_API_KEY": (("ai", "api_key"), ("ai_prefilter", "api_key")),
+    "ARK_API_KEY": (("ai", "api_key"), ("ai_prefilter", "api_key")),
+    "FEISHU_WEBHOOK": (("notification", "feishu", "webhook_url"),),
+    "DINGTALK_WEBHOOK": (("notification", "dingtalk", "webhook_url"),),
+    "WEWORK_WEBHOOK": (("notification", "wechat_work", "webhook_url"),),
+    "TELEGRAM_BOT_TOKEN": (("notification", "telegram", "bot_token"),),
+    "TELEGRAM_CHAT_ID": (("notification", "telegram", "chat_id"),),
+    "EMAIL_FROM": (("notification", "email", "from"),),
+    "EMAIL_PASSWORD": (("notification", "email", "password"),),
+    "EMAIL_TO": (("notification", "email", "to"),),
+    "EMAIL_SMTP_SERVER": (("notification", "email", "smtp_server"),),
+    "EMAIL_SMTP_PORT": (("notification", "email", "smtp_port"),),
+    # 工作节点只运行指定分组的新闻源（逗号分隔）
+    "RADARFLOW_SOURCE_GROUPS": (("fetching", "groups"),),
+}
+NOTIFICATION_CHANNELS = ("feishu", "dingtalk", "wechat_work", "telegram", "email")
+MISFIRE_POLICIES = ("skip", "coalesce", "queue")
+DEFAULT_AI_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_AI_MODEL = "gpt-4o-mini"
+DEFAULT_SOURCE_GROUP = "default"
+DEFAULT_QUEUE_WEIGHTS: Mapping[str, float] = {"rule": 3.0, "recency": 2.0, "cluster": 1.0}
+
+
+class SettingsError(ValueError):
+    """配置校验失败，errors 中列出全部问题。"""
+
+    def __init__(self, errors: Sequence[str]) -> None:
+        self.errors = list(errors)
+        super().__init__("配置校验失败: " + "；".join(self.errors))
+
+
+@dataclass(frozen=True, slots=True)
+class TimezoneSettings:
+    name: Optional[str] = None
+    offset_hours: Optional[float] = None
+    display_format: str = "%Y-%m-%d %H:%M"
+
+
+@dataclass(frozen=True, slots=True)
+class AIQueueSettings:
+    enabled: bool = True
+    token_budget: int = 0
+    time_budget_sec: float = 0.0
+    recency_half_life_hours: float = 6.0
+    cluster_threshold: float = 0.5
+    max_age_hours: float = 24.0
+    chars_per_token: float = 1.5
+    completion_tokens: int = 800
+    weights: Mapping[str, float] = field(default_factory=lambda: dict(DEFAULT_QUEUE_WEIGHTS))
+    source_weights: Mapping[str, float] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class AISettings:
+    enabled: bool = False
+    base_url: str = DEFAULT_AI_BASE_URL
+    model: str = DEFAULT_AI_MODEL
+    api_key: str = ""
+    prompt_file: Optional[str] = None
+    system_prompt: str = "你是一名严谨的中文财经记者，请根据指定信息生成摘要。"
+    reasoning_effort: Optional[str] = None
+    temperature: Optional[float] = None
+    timeout_sec: int = 30
+    max_items: int = 5
+    max_workers: int = 3
+    use_article_body: bool = True
+    identity_hint: str = "保持专业中立、关注风险敞口的分析视角"
+    fail_open_on_error: bool = True
+    queue: AIQueueSettings = AIQueueSettings()
+
+
+@dataclass(frozen=True, slots=True)
+class LocalModelSettings:
+    enabled: bool = False
+    model_path: Optional[str] = None
+    reject_below: float = 0.05
+
+
+@dataclass(frozen=True, slots=True)
+class AIPrefilterSettings:
+    enabled: bool = False
+    mode: str = "separate"
+    base_url: str = DEFAULT_AI_BASE_URL
+    model: str = DEFAULT_AI_MODEL
+    api_key: str = ""
+    prompt_file: Optional[str] = None
+    combined_prompt_file: Optional[str] = None
+    system_prompt: str = "你是一名资深的中英文新闻审核员，擅长理解不同语言的同义表达并判断是否命中指定情报需求。"
+    temperature: Optional[float] = None
+    reasoning_effort: Optional[str] = None
+    timeout_sec: int = 30
+    include_article_body: bool = False
+    max_text_chars: int = 300
+    log_rejections: bool = False
+    fail_open_on_error: bool = True
+    max_workers: int = 3
+    local_model: LocalModelSettings = LocalModelSettings()
+
+
+@dataclass(frozen=True, slots=True)
+class AIFilterSettings:
+    # ai 段未启用时后置过滤同样关闭
+    enabled: bool = False
+    config: Mapping[str, Any] = None  # type: ignore[assignment]
+
+
+@dataclass(frozen=True, slots=True)
+class FiltersSettings:
+    configured: bool = False
+    enabled: bool = False
+    default_action: str = "allow"
+    profile: bool = False
+    match: str = DEFAULT_MATCH_MODE
+    rules: Tuple[Mapping[str, Any], ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitSettings:
+    per_minute: Optional[float] = None
+    burst: Optional[float] = None
+
+
+@dataclass(frozen=True, slots=True)
+class OutboxSettings:
+    enabled: bool = True
+    max_attempts: int = 6
+    base_delay_sec: float = 5.0
+    max_delay_sec: float = 3600.0
+    drain_timeout_sec: float = 60.0
+    retention_days: int = 7
+    # 按渠道覆盖内置的令牌桶限流，未设置的项沿用默认值
+    rate_limits: Mapping[str, RateLimitSettings] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class AggregationSettings:
+    enabled: bool = False
+    window_min: float = 30.0
+    max_items: int = 20
+    urgent_rules: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class NotificationSettings:
+    enabled: bool = False
+    title: str = "News Digest"
+    display_summary: bool = True
+    parallel: bool = True
+    channel_timeout_sec: float = 120.0
+    channel_timeouts: Mapping[str, float] = None  # type: ignore[assignment]
+    items_per_message: int = 0
+    message_limits: Mapping[str, int] = None  # type: ignore[assignment]
+    channels: Mapping[str, Mapping[str, Any]] = None  # type: ignore[assignment]
+    outbox: OutboxSettings = OutboxSettings()
+    aggregation: AggregationSettings = AggregationSettings()
+
+    def channel(self, name: str) -> Dict[str, Any]:
+        return dict((self.channels or {}).get(name) or {})
+
+
+@dataclass(frozen=True, slots=True)
+class AdaptiveSettings:
+    history_days: int = 14
+    # 以下为比例参数，与间隔秒数分开校验
+    target_items: float = 1.0
+    burst_factor: float = 2.0
+    backoff: float = 1.5
+
+
+@dataclass(frozen=True, slots=True)
+class SourceScheduleSettings:
+    """scheduler.sources 中单个新闻源的调度。"""
+
+    name: str
+    cron: Tuple[str, ...] = ()
+    interval_sec: Optional[float] = None
+    adaptive: bool = False
+    min_interval_sec: float = 60.0
+    max_interval_sec: float = 3600.0
+
+
+@dataclass(frozen=True, slots=True)
+class SchedulerSettings:
+    enabled: bool = False
+    run_on_start: bool = False
+    max_runs: Optional[int] = None
+    hot_reload: bool = True
+    reload_poll_sec: float = 30.0
+    misfire_policy: str = "skip"
+    max_queue: int = 3
+    max_runtime_sec: int = 0
+    lock_ttl_sec: float = 300.0
+    cron: Tuple[str, ...] = ()
+    adaptive: AdaptiveSettings = AdaptiveSettings()
+    sources: Mapping[str, SourceScheduleSettings] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class SourceSettings:
+    """sources 段中单个新闻源的配置。"""
+
+    name: str
+    enabled: bool = True
+    params: Mapping[str, Any] = field(default_factory=dict)
+    timeout_sec: Optional[float] = None
+    concurrency: int = 1
+    priority: int = 0
+    group: str = DEFAULT_SOURCE_GROUP
+
+
+@dataclass(frozen=True, slots=True)
+class FetchingSettings:
+    max_workers: Optional[int] = None
+    groups: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class MetricsSettings:
+    # port 为 0 时不启动调度模式下的 /metrics 端点
+    port: int = 0
+    host: str = "127.0.0.1"
+    report_path: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    timezone: TimezoneSettings
+    ai: AISettings
+    ai_prefilter: AIPrefilterSettings
+    ai_filter: AIFilterSettings
+    filters: FiltersSettings
+    notification: NotificationSettings
+    scheduler: SchedulerSettings
+    metrics: MetricsSettings
+    # sources 段中的新闻源，保持配置顺序；sources_configured 为 False 时使用代码中的默认列表
+    sources: Mapping[str, SourceSettings]
+    sources_configured: bool
+    fetching: FetchingSettings
+    # 已应用环境变量覆盖的原始配置，供规则、按源调度等自由结构的配置段使用
+    raw: Mapping[str, Any]
+
+
+class _Section:
+    """读取单个配置段，类型不符时记录错误而不是静默回退到默认值。"""
+
+    def __init__(self, data: Any, path: str, errors: List[str]) -> None:
+        if data is not None and not isinstance(data, dict):
+            errors.append(f"{path} 必须是映射: {data!r}")
+            data = {}
+        self.data: Dict[str, Any] = data or {}
+        self.path = path
+        self.errors = errors
+
+    def section(self, key: str) -> "_Section":
+        return _Section(self.data.get(key), f"{self.path}.{key}", self.errors)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.data.get(key)
+        return default if value is None else value
+
+    def bool(self, key: str, default: bool) -> bool:
+        value = self.get(key, default)
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, int) and value in (0, 1):
+            return bool(value)
+        return self._error(key, "必须是 true/false", value, default)
+
+    def int(self, key: str, default: Optional[int], *, minimum: Optional[int] = None) -> Any:
+        value = self.data.get(key)
+        if value is None:
+            return default
+        if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+            return self._error(key, "必须是整数", value, default)
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            return self._error(key, "必须是整数", value, default)
+        if minimum is not None and number < minimum:
+            return self._error(key, f"不能小于 {minimum}", value, default)
+        return number
+
+    def float(self, key: str, default: Optional[float], *, minimum: Optional[float] = None, positive: bool = False) -> Any:
+        value = self.data.get(key)
+        if value is None:
+            return default
+        if isinstance(value, bool):
+            return self._error(key, "必须是数字", value, default)
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return self._error(key, "必须是数字", value, default)
+        if positive and number <= 0:
+            return self._error(key, "必须大于 0", value, default)
+        if minimum is not None and number < minimum:
+            return self._error(key, f"不能小于 {minimum:g}", value, default)
+        return number
+
+    def str(self, key: str, default: Optional[str]) -> Any:
+        value = self.data.get(key)
+        if value is None or value == "":
+            return default
+        if isinstance(value, (dict, list)):
+            return self._error(key, "必须是字符串", value, default)
+        return str(value)
+
+    def choice(self, key: str, default: str, choices: Sequence[str]) -> str:
+        value = str(self.get(key, default)).strip().lower()
+        if value not in choices:
+            return self._error(key, f"必须是 {' / '.join(choices)} 之一", value, default)
+        return value
+
+    def _error(self, key: str, message: str, value: Any, default: Any) -> Any:
+        self.errors.append(f"{self.path}.{key} {message}: {value!r}")
+        return default
+
+
+def apply_env_overrides(data: Mapping[str, Any], env: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    """返回应用了环境变量覆盖的配置副本，不修改传入的配置。"""
+
+    env = os.environ if env is None else env
+    merged: Dict[str, Any] = copy.deepcopy(dict(data))
+    notification = merged.setdefault("notification", {})
+    if notification is None:
+        notification = merged["notification"] = {}
+    # 兼容通知渠道写在顶层的旧格式：notification 内未配置时沿用顶层
+    for channel in NOTIFICATION_CHANNELS if isinstance(notification, dict) else ():
+        if not notification.get(channel) and isinstance(merged.get(channel), dict):
+            notification[channel] = copy.deepcopy(merged[channel])
+    for name, paths in ENV_ALIASES.items():
+        value = str(env.get(name) or "").strip()
+        if value:
+            for path in paths:
+                _set_path(merged, path, value)
+    for name, value in env.items():
+        if name.startswith(ENV_PREFIX) and len(name) > len(ENV_PREFIX):
+            path = tuple(part.lower() for part in name[len(ENV_PREFIX):].split("__") if part)
+            _set_path(merged, path, yaml.safe_load(value) if value.strip() else value)
+    return merged
+
+
+def _set_path(data: Dict[str, Any], path: Tuple[str, ...], value: Any) -> None:
+    node = data
+    for key in path[:-1]:
+        child = node.get(key)
+        if not isinstance(child, dict):
+            child = node[key] = {}
+        node = child
+    node[path[-1]] = value
+
+
+def parse_settings(data: Mapping[str, Any], env: Optional[Mapping[str, str]] = None) -> Settings:
+    """解析并校验完整配置；存在任何类型或取值错误时抛出 SettingsError。"""
+
+    raw = apply_env_overrides(data, env)
+    errors: List[str] = []
+    root = _Section(raw, "config", errors)
+    settings = Settings(
+        timezone=_timezone(root.section("timezone")),
+        ai=_ai(root.section("ai")),
+        ai_prefilter=_ai_prefilter(root.section("ai_prefilter"), root.section("ai")),
+        ai_filter=_ai_filter(root.section("ai_filter"), root.section("ai")),
+        filters=_filters(root.section("filters")),
+        notification=_notification(root.section("notification")),
+        scheduler=_scheduler(root.section("scheduler")),
+        metrics=_metrics(root.section("metrics")),
+        sources=_sources(root),
+        sources_configured=isinstance(raw.get("sources"), dict) and bool(raw.get("sources")),
+        fetching=_fetching(root.section("fetching")),
+        raw=raw,
+    )
+    if errors:
+        raise SettingsError(errors)
+    return settings
+
+
+def _timezone(cfg: _Section) -> TimezoneSettings:
+    return TimezoneSettings(
+        name=cfg.str("name", None),
+        offset_hours=cfg.float("offset_hours", None),
+        display_format=cfg.str("display_format", TimezoneSettings().display_format),
+    )
+
+
+def _ai(cfg: _Section) -> AISettings:
+    defaults = AISettings()
+    return AISettings(
+        enabled=cfg.bool("enabled", False),
+        base_url=cfg.str("base_url", defaults.base_url),
+        model=cfg.str("model", defaults.model),
+        api_key=cfg.str("api_key", ""),
+        prompt_file=cfg.str("prompt_file", None),
+        system_prompt=cfg.str("system_prompt", defaults.system_prompt),
+        reasoning_effort=cfg.str("reasoning_effort", None),
+        temperature=cfg.float("temperature", None, minimum=0),
+        timeout_sec=cfg.int("timeout_sec", defaults.timeout_sec, minimum=1),
+        max_items=cfg.int("max_items", defaults.max_items),
+        max_workers=cfg.int("max_workers", defaults.max_workers, minimum=1),
+        use_article_body=cfg.bool("use_article_body", True),
+        identity_hint=cfg.str("identity_hint", defaults.identity_hint),
+        fail_open_on_error=cfg.bool("fail_open_on_error", True),
+        queue=_ai_queue(cfg.section("queue")),
+    )
+
+
+def _ai_queue(cfg: _Section) -> AIQueueSettings:
+    defaults = AIQueueSettings()
+    weights = cfg.section("weights")
+    source_weights = cfg.section("source_weights")
+    return AIQueueSettings(
+        enabled=cfg.bool("enabled", True),
+        token_budget=cfg.int("token_budget", 0),
+        time_budget_sec=cfg.float("time_budget_sec", 0.0),
+        recency_half_life_hours=cfg.float("recency_half_life_hours", defaults.recency_half_life_hours, minimum=0.1),
+        cluster_threshold=cfg.float("cluster_threshold", defaults.cluster_threshold, minimum=0),
+        max_age_hours=cfg.float("max_age_hours", defaults.max_age_hours, positive=True),
+        chars_per_token=cfg.float("chars_per_token", defaults.chars_per_token, minimum=0.5),
+        completion_tokens=cfg.int("completion_tokens", defaults.completion_tokens, minimum=0),
+        weights={key: weights.float(key, default) for key, default in DEFAULT_QUEUE_WEIGHTS.items()},
+        source_weights={str(name): source_weights.float(name, 1.0, minimum=0) for name in source_weights.data},
+    )
+
+
+def _ai_prefilter(cfg: _Section, ai_cfg: _Section) -> AIPrefilterSettings:
+    defaults = AIPrefilterSettings()
+    # 未单独配置的连接参数沿用 ai 段；此处只取值，ai 段的错误由 _ai 报告
+    ai_quiet = _Section(ai_cfg.data, ai_cfg.path, [])
+    local = cfg.section("local_model")
+    return AIPrefilterSettings(
+        enabled=cfg.bool("enabled", False),
+        mode=cfg.choice("mode", defaults.mode, ("separate", "combined")),
+        base_url=cfg.str("base_url", None) or ai_quiet.str("base_url", defaults.base_url),
+        model=cfg.str("model", None) or ai_quiet.str("model", defaults.model),
+        api_key=cfg.str("api_key", None) or ai_quiet.str("api_key", ""),
+        prompt_file=cfg.str("prompt_file", None),
+        combined_prompt_file=cfg.str("combined_prompt_file", None),
+        system_prompt=cfg.str("system_prompt", defaults.system_prompt),
+        temperature=cfg.float("temperature", None, minimum=0),
+        reasoning_effort=cfg.str("reasoning_effort", None),
+        timeout_sec=cfg.int("timeout_sec", defaults.timeout_sec, minimum=1),
+        include_article_body=cfg.bool("include_article_body", False),
+        max_text_chars=cfg.int("max_text_chars", defaults.max_text_chars, minimum=1),
+        log_rejections=cfg.bool("log_rejections", False),
+        fail_open_on_error=cfg.bool("fail_open_on_error", True),
+        max_workers=cfg.int("max_workers", defaults.max_workers, minimum=1),
+        local_model=LocalModelSettings(
+            enabled=local.bool("enabled", False),
+            model_path=local.str("model_path", None),
+            reject_below=local.float("reject_below", 0.05, minimum=0),
+        ),
+    )
+
+
+def _ai_filter(cfg: _Section, ai_cfg: _Section) -> AIFilterSettings:
+    ai_enabled = _Section(ai_cfg.data, ai_cfg.path, []).bool("enabled", False)
+    return AIFilterSettings(enabled=cfg.bool("enabled", False) and ai_enabled, config=cfg.data)
+
+
+def _filters(cfg: _Section) -> FiltersSettings:
+    rules = cfg.get("rules", [])
+    if not isinstance(rules, list) or not all(isinstance(rule, dict) for rule in rules):
+        cfg.errors.append(f"{cfg.path}.rules 必须是由映射组成的列表")
+        rules = []
+    return FiltersSettings(
+        configured=bool(cfg.data),
+        enabled=cfg.bool("enabled", False),
+        default_action=cfg.choice("default_action", "allow", ("allow", "deny")),
+        profile=cfg.bool("profile", False),
+        match=cfg.choice("match", DEFAULT_MATCH_MODE, MATCH_MODES),
+        rules=tuple(rules),
+    )
+
+
+def _notification(cfg: _Section) -> NotificationSettings:
+    defaults = NotificationSettings()
+    channel_timeout = cfg.float("channel_timeout_sec", defaults.channel_timeout_sec, positive=True)
+    timeouts = cfg.section("channel_timeouts")
+    limits = cfg.section("message_limits")
+    return NotificationSettings(
+        enabled=cfg.bool("enable", False),
+        title=cfg.str("title", defaults.title),
+        display_summary=cfg.bool("display_summary", True),
+        parallel=cfg.bool("parallel", True),
+        channel_timeout_sec=channel_timeout,
+        channel_timeouts={str(name): timeouts.float(name, channel_timeout, positive=True) for name in timeouts.data},
+        items_per_message=cfg.int("items_per_message", 0, minimum=0),
+        message_limits={str(name): limits.int(name, 0) for name in limits.data},
+        channels={name: cfg.section(name).data for name in NOTIFICATION_CHANNELS},
+        outbox=_outbox(cfg.section("outbox")),
+        aggregation=_aggregation(cfg.section("aggregation")),
+    )
+
+
+def _outbox(cfg: _Section) -> OutboxSettings:
+    defaults = OutboxSettings()
+    limits = cfg.section("rate_limits")
+    base_delay = cfg.float("base_delay_sec", defaults.base_delay_sec, minimum=0)
+    max_delay = cfg.float("max_delay_sec", defaults.max_delay_sec, minimum=0)
+    if max_delay < base_delay:
+        max_delay = cfg._error("max_delay_sec", f"不能小于 base_delay_sec({base_delay:g})", max_delay, base_delay)
+    rate_limits = {}
+    for channel in limits.data:
+        limit = limits.section(channel)
+        rate_limits[str(channel)] = RateLimitSettings(
+            per_minute=limit.float("per_minute", None, minimum=0),
+            burst=limit.float("burst", None, minimum=1),
+        )
+    return OutboxSettings(
+        enabled=cfg.bool("enabled", True),
+        max_attempts=cfg.int("max_attempts", defaults.max_attempts, minimum=1),
+        base_delay_sec=base_delay,
+        max_delay_sec=max_delay,
+        drain_timeout_sec=cfg.float("drain_timeout_sec", defaults.drain_timeout_sec, minimum=0),
+        retention_days=cfg.int("retention_days", defaults.retention_days),
+        rate_limits=rate_limits,
+    )
+
+
+def _aggregation(cfg: _Section) -> AggregationSettings:
+    defaults = AggregationSettings()
+    urgent = cfg.get("urgent_rules", [])
+    if not isinstance(urgent, list):
+        urgent = cfg._error("urgent_rules", "必须是列表", urgent, [])
+    return AggregationSettings(
+        enabled=cfg.bool("enabled", False),
+        window_min=cfg.float("window_min", defaults.window_min, minimum=0),
+        max_items=cfg.int("max_items", defaults.max_items, minimum=0),
+        urgent_rules=tuple(str(name) for name in urgent),
+    )
+
+
+def _scheduler(cfg: _Section) -> SchedulerSettings:
+    defaults = SchedulerSettings()
+    return SchedulerSettings(
+        enabled=cfg.bool("enabled", False),
+        run_on_start=cfg.bool("run_on_start", False),
+        max_runs=cfg.int("max_runs", None, minimum=1),
+        hot_reload=cfg.bool("hot_reload", True),
+        reload_poll_sec=cfg.float("reload_poll_sec", defaults.reload_poll_sec, minimum=1),
+        misfire_policy=cfg.choice("misfire_policy", defaults.misfire_policy, MISFIRE_POLICIES),
+        max_queue=cfg.int("max_queue", defaults.max_queue, minimum=0),
+        max_runtime_sec=cfg.int("max_runtime_sec", 0, minimum=0),
+        lock_ttl_sec=cfg.float("lock_ttl_sec", defaults.lock_ttl_sec, minimum=1),
+        cron=_cron(cfg),
+        adaptive=_adaptive(cfg.section("adaptive")),
+        sources=_source_schedules(cfg.section("sources")),
+    )
+
+
+def _cron(cfg: _Section) -> Tuple[str, ...]:
+    value = cfg.get("cron", [])
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list):
+        value = cfg._error("cron", "必须是字符串或字符串列表", value, [])
+    return tuple(str(expr).strip() for expr in value if str(expr).strip())
+
+
+def _adaptive(cfg: _Section) -> AdaptiveSettings:
+    defaults = AdaptiveSettings()
+    return AdaptiveSettings(
+        history_days=cfg.int("history_days", defaults.history_days, minimum=1),
+        target_items=cfg.float("target_items", defaults.target_items, positive=True),
+        burst_factor=cfg.float("burst_factor", defaults.burst_factor, minimum=1),
+        backoff=cfg.float("backoff", defaults.backoff, minimum=1),
+    )
+
+
+def _source_schedules(cfg: _Section) -> Dict[str, SourceScheduleSettings]:
+    defaults = SourceScheduleSettings("")
+    schedules: Dict[str, SourceScheduleSettings] = {}
+    for name in cfg.data:
+        spec = cfg.section(name)
+        min_seconds = spec.float("min_interval_sec", defaults.min_interval_sec, minimum=1)
+        max_seconds = spec.float("max_interval_sec", defaults.max_interval_sec, minimum=1)
+        if max_seconds < min_seconds:
+            max_seconds = spec._error(
+                "max_interval_sec", f"不能小于 min_interval_sec({min_seconds:g})", max_seconds, min_seconds
+            )
+        schedules[str(name)] = SourceScheduleSettings(
+            str(name),
+            cron=_cron(spec),
+            interval_sec=spec.float("interval_sec", None, positive=True),
+            adaptive=spec.bool("adaptive", False),
+            min_interval_sec=min_seconds,
+            max_interval_sec=max_seconds,
+        )
+    return schedules
+
+
+def _metrics(cfg: _Section) -> MetricsSettings:
+    port = cfg.int("port", 0, minimum=0)
+    if port > 65535:
+        port = cfg._error("port", "不能大于 65535", port, 0)
+    return MetricsSettings(
+        port=port,
+        host=cfg.str("host", MetricsSettings().host),
+        report_path=cfg.str("report_path", None),
+    )
+
+
+def _sources(root: _Section) -> Dict[str, SourceSettings]:
+    cfg = root.section("sources")
+    specs: Dict[str, SourceSettings] = {}
+    for name, raw in cfg.data.items():
+        name = str(name)
+        if isinstance(raw, bool):
+            specs[name] = SourceSettings(name, enabled=raw)
+            continue
+        if not isinstance(raw, dict):
+            cfg.errors.append(f"{cfg.path}.{name} 必须是 true/false 或映射: {raw!r}")
+            continue
+        spec = cfg.section(name)
+        params = spec.get("params", {})
+        if not isinstance(params, dict):
+            params = spec._error("params", "必须是映射", params, {})
+        specs[name] = SourceSettings(
+            name,
+            enabled=spec.bool("enabled", True),
+            params=dict(params),
+            timeout_sec=spec.float("timeout_sec", None, positive=True),
+            concurrency=spec.int("concurrency", 1, minimum=1),
+            priority=spec.int("priority", 0),
+            group=spec.str("group", DEFAULT_SOURCE_GROUP),
+        )
+    return specs
+
+
+def _fetching(cfg: _Section) -> FetchingSettings:
+    groups: Any = cfg.get("groups", [])
+    if isinstance(groups, str):
+        groups = groups.split(",")
+    if not isinstance(groups, list):
+        groups = cfg._error("groups", "必须是列表或逗号分隔的字符串", groups, [])
+    return FetchingSettings(
+        max_workers=cfg.int("max_workers", None, minimum=1),
+        groups=tuple(str(group).strip() for group in groups if str(group).strip()),
+    )
+
+
+_TYPED: Dict[str, Tuple[Mapping[str, Any], Settings]] = {}
+_LOCK = threading.Lock()
+
+
+def get_config(path: Optional[Path] = None) -> Settings:
+    """返回与当前缓存配置对应的类型化配置。
+
+    以原始配置对象的身份判断是否需要重新解析：ConfigWatcher 通过 replace_settings 整体替换原始配置后，
+    下一次调用即得到新的类型化配置，读者不会看到新旧配置混杂的状态。"""
+
+    source = load_settings(path)
+    key = _cache_key(path)
+    cached = _TYPED.get(key)
+    if cached is not None and cached[0] is source:
+        return cached[1]
+    settings = parse_settings(source)
+    with _LOCK:
+        _TYPED[key] = (source, settings)
+    return settings
+
+
+def resolve_settings(path: Optional[Path], settings: Optional[Mapping[str, Any]]) -> Settings:
+    """组件构造时使用：传入原始配置（如热更新前的校验）则直接解析，否则读取共享配置。"""
+
+    return parse_settings(settings) if settings is not None else get_config(path)
@@ -0,0 +1,57 @@
+"""启动耗时分析：在子进程中以 -X importtime 导入入口模块，按模块汇总导入耗时。"""
+from __future__ import annotations
+
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    timings: List[ImportTiming] = []
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            timings.append(ImportTiming(module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return timings
+
+
+def profile_imports(target: str, *, cwd: Optional[Path] = None) -> List[ImportTiming]:
+    """在全新的解释器中导入 target，返回每个模块的导入耗时（微秒）。"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        cwd=str(cwd or ROOT),
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"导入 {target} 失败: {proc.stderr.strip().splitlines()[-1:]}")
+    return parse_importtime(proc.stderr)
+
+
+def format_report(target: str, timings: List[ImportTiming], top: int = 25) -> str:
+    root = next((item for item in timings if item.module == target and item.depth == 0), None)
+    lines = [f"导入 {target} 共 {root.cumulative_us / 1000:.1f} ms（{len(timings)} 个模块）" if root else target]
+    lines.append(f"{'累计(ms)':>10} {'自身(ms)':>10}  模块")
+    for item in sorted(timings, key=lambda timing: timing.cumulative_us, reverse=True)[: max(1, top)]:
+        lines.append(f"{item.cumulative_us / 1000:>10.1f} {item.self_us / 1000:>10.1f}  {'  ' * item.depth}{item.module}")
+    return "\n".join(lines)
+
+
+def print_startup_profile(target: str, top: int = 25) -> None:
+    print(format_report(target, profile_imports(target), top))
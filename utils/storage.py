@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Dict, Iterable, Optional
 
 from ai import AISummary
+from ai.relevance import relevance_text
 from fetcher.base_fetcher import NewsRecord
 
 
@@ -17,7 +18,7 @@ class SQLiteStorage:
         self.db_path = db_path
         if not db_path.parent.exists():
             db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(str(db_path))
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
         self.conn.execute(
             """
             CREATE TABLE IF NOT EXISTS news_records (
@@ -34,6 +35,21 @@ class SQLiteStorage:
             )
             """
         )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS prefilter_verdicts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT,
+                title TEXT,
+                url TEXT,
+                text TEXT,
+                relevant INTEGER,
+                matched_rules TEXT,
+                origin TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
         self.conn.commit()
 
     def close(self) -> None:
@@ -48,6 +64,40 @@ class SQLiteStorage:
             self._save_single(record, summary_map)
         self.conn.commit()
 
+    def save_prefilter_verdicts(self, news: Iterable[NewsRecord]) -> int:
+        """保存 AI 预过滤的判定结果，供本地相关性模型训练使用。"""
+
+        saved = 0
+        for record in news:
+            raw = record.raw if isinstance(record.raw, dict) else {}
+            relevant = raw.get("_prefilter_relevant")
+            if relevant is None:
+                continue
+            if raw.get("_prefilter_error"):
+                origin = "error"
+            elif raw.get("_prefilter_local"):
+                origin = "local"
+            else:
+                origin = "llm"
+            self.conn.execute(
+                """
+                INSERT INTO prefilter_verdicts (source, title, url, text, relevant, matched_rules, origin)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    record.source,
+                    record.title,
+                    record.url,
+                    relevance_text(record),
+                    1 if relevant else 0,
+                    json.dumps(raw.get("_prefilter_rules") or [], ensure_ascii=False),
+                    origin,
+                ),
+            )
+            saved += 1
+        self.conn.commit()
+        return saved
+
     def _save_single(self, record: NewsRecord, summary_map: Dict[str, AISummary]) -> None:
         key = record.url or f"{record.source}-{record.title}"
         ai_summary = summary_map.get(key)
@@ -0,0 +1,153 @@
+"""关键词规则的分词索引：每篇新闻只切分一次，各规则通过集合查找判断命中。"""
+from __future__ import annotations
+
+import importlib.util
+import logging
+import re
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+MATCH_MODES = ("substring", "word", "stem", "segment")
+DEFAULT_MATCH_MODE = "substring"
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+_IRREGULAR_LEMMAS = {
+    "men": "man",
+    "women": "woman",
+    "children": "child",
+    "people": "person",
+    "was": "be",
+    "were": "be",
+    "is": "be",
+    "are": "be",
+    "been": "be",
+    "has": "have",
+    "had": "have",
+    "did": "do",
+    "does": "do",
+    "said": "say",
+    "says": "say",
+    "went": "go",
+    "gone": "go",
+    "led": "lead",
+    "met": "meet",
+    "won": "win",
+}
+_NO_UNDOUBLE = set("lsz")
+# jieba 导入即需数百毫秒，只在首次需要分词时加载
+_JIEBA_AVAILABLE = importlib.util.find_spec("jieba") is not None
+_jieba: Any = None
+
+
+def _load_jieba() -> Any:
+    global _jieba
+    if _jieba is None and _JIEBA_AVAILABLE:
+        import jieba
+
+        _jieba = jieba
+    return _jieba
+
+
+def normalize_match_mode(value: Optional[str]) -> str:
+    mode = str(value or DEFAULT_MATCH_MODE).strip().lower()
+    if mode not in MATCH_MODES:
+        logger.warning("未知的关键词匹配模式 %s，改用 substring", value)
+        return DEFAULT_MATCH_MODE
+    if mode == "segment" and not _JIEBA_AVAILABLE:
+        logger.warning("未安装 jieba，segment 匹配模式退化为 substring")
+        return DEFAULT_MATCH_MODE
+    return mode
+
+
+def stem(word: str) -> str:
+    """轻量英文词干化：处理常见复数、过去式、进行时与不规则词形。"""
+
+    if word in _IRREGULAR_LEMMAS:
+        return _IRREGULAR_LEMMAS[word]
+    if len(word) <= 3 or not word.isascii():
+        return word
+    base = word
+    if base.endswith("ies") and len(base) > 4:
+        base = base[:-3] + "y"
+    elif base.endswith("ied") and len(base) > 4:
+        base = base[:-3] + "y"
+    elif base.endswith(("sses", "xes", "zes", "ches", "shes")):
+        base = base[:-2]
+    elif base.endswith("ing") and len(base) > 5:
+        base = _undouble(base[:-3])
+    elif base.endswith("ed") and len(base) > 4:
+        base = _undouble(base[:-2])
+    elif base.endswith("s") and not base.endswith(("ss", "us", "is")):
+        base = base[:-1]
+    if len(base) > 3 and base.endswith("e"):
+        base = base[:-1]
+    return base
+
+
+def _undouble(base: str) -> str:
+    if len(base) > 2 and base[-1] == base[-2] and base[-1].isalpha() and base[-1] not in _NO_UNDOUBLE:
+        return base[:-1]
+    return base
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_PATTERN.findall(text)
+
+
+def _segments(text: str) -> List[str]:
+    jieba = _load_jieba()
+    if jieba is None:
+        return [text] if text.strip() else []
+    return [segment for segment in jieba.lcut(text) if segment.strip()]
+
+
+def keyword_key(token: str, mode: str) -> Tuple[str, int]:
+    """返回关键词在指定模式下的索引键与所跨的词元数。"""
+
+    if mode == "word":
+        parts = _words(token)
+        return " ".join(parts), len(parts)
+    if mode == "stem":
+        parts = [stem(word) for word in _words(token)]
+        return " ".join(parts), len(parts)
+    if mode == "segment":
+        parts = _segments(token)
+        return "".join(parts), len(parts)
+    return token, 1
+
+
+class TokenIndex:
+    """单篇新闻的倒排词元集合，按需为每种匹配模式构建一次。
+
+    `spans` 指定各模式需要索引的最长词元序列（多词关键词），文本需已转为小写。
+    """
+
+    def __init__(self, lowered_text: str, spans: Optional[Mapping[str, int]] = None) -> None:
+        self.text = lowered_text
+        self.spans = dict(spans or {})
+        self._terms: Dict[str, Set[str]] = {}
+
+    def contains(self, mode: str, key: str) -> bool:
+        if mode == "substring":
+            return key in self.text
+        return key in self.terms(mode)
+
+    def terms(self, mode: str) -> Set[str]:
+        cached = self._terms.get(mode)
+        if cached is not None:
+            return cached
+        if mode == "word":
+            units, joiner = _words(self.text), " "
+        elif mode == "stem":
+            units, joiner = [stem(word) for word in _words(self.text)], " "
+        elif mode == "segment":
+            units, joiner = _segments(self.text), ""
+        else:
+            raise ValueError(f"unsupported match mode: {mode}")
+        span = max(1, self.spans.get(mode, 1))
+        terms: Set[str] = set(units)
+        for size in range(2, span + 1):
+            terms.update(joiner.join(units[idx : idx + size]) for idx in range(len(units) - size + 1))
+        self._terms[mode] = terms
+        return terms
@@ -7,77 +7,45 @@ from typing import Dict, Optional
 
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from .config_loader import DEFAULT_CONFIG_PATH, load_settings
+from .config_loader import DEFAULT_CONFIG_PATH
+from .settings import TimezoneSettings, get_config
+from .timestamps import normalize_timestamp
 
 DEFAULT_DISPLAY_FORMAT = "%Y-%m-%d %H:%M"
 _CACHE: Dict[str, "TimeZoneHelper"] = {}
 
 
-def _from_unix_timestamp(raw: float) -> Optional[datetime]:
-    try:
-        seconds = raw / 1000 if raw > 10**11 else raw
-        return datetime.fromtimestamp(seconds, tz=timezone.utc)
-    except (OSError, OverflowError, ValueError):
-        return None
-
+def parse_datetime_string(value: Optional[str | int | float | datetime]) -> Optional[datetime]:
+    """解析为 UTC datetime；解析结果由 utils.timestamps 中的共享缓存复用。"""
 
-def parse_datetime_string(value: Optional[str | int | float]) -> Optional[datetime]:
-    if value is None:
-        return None
-    if isinstance(value, (int, float)):
-        return _from_unix_timestamp(float(value))
-    text = str(value).strip()
-    if not text:
-        return None
-    if text.isdigit():
-        return _from_unix_timestamp(float(text))
-    normalized = text
-    if normalized.endswith("Z"):
-        normalized = normalized[:-1] + "+00:00"
-    try:
-        dt = datetime.fromisoformat(normalized)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt
-    except ValueError:
-        pass
-    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M"):
-        try:
-            dt = datetime.strptime(text, fmt)
-            return dt.replace(tzinfo=timezone.utc)
-        except ValueError:
-            continue
-    return None
+    return normalize_timestamp(value)
 
 
 class TimeZoneHelper:
     """根据配置转换时间。"""
 
     def __init__(self, config_path: Optional[Path] = None) -> None:
-        settings = load_settings(config_path or DEFAULT_CONFIG_PATH)
-        tz_config = settings.get("timezone", {}) or {}
-        self.display_format = tz_config.get("display_format") or DEFAULT_DISPLAY_FORMAT
+        tz_config = get_config(config_path or DEFAULT_CONFIG_PATH).timezone
+        self.display_format = tz_config.display_format or DEFAULT_DISPLAY_FORMAT
         self.tzinfo = self._resolve_timezone(tz_config)
 
-    def _resolve_timezone(self, cfg: Dict[str, any]) -> timezone:
-        name = cfg.get("name")
-        if name:
+    def _resolve_timezone(self, cfg: TimezoneSettings) -> timezone:
+        if cfg.name:
             try:
-                return ZoneInfo(str(name))
+                return ZoneInfo(cfg.name)
             except ZoneInfoNotFoundError:
                 pass
-        offset = cfg.get("offset_hours")
-        if isinstance(offset, (int, float)):
-            return timezone(timedelta(hours=float(offset)))
+        if cfg.offset_hours is not None:
+            return timezone(timedelta(hours=cfg.offset_hours))
         return timezone.utc
 
-    def to_iso(self, value: Optional[str]) -> Optional[str]:
+    def to_iso(self, value: Optional[str | datetime]) -> Optional[str]:
         dt = parse_datetime_string(value)
         if not dt:
             return value
         return dt.astimezone(self.tzinfo).isoformat()
 
-    def to_display(self, value: Optional[str]) -> Optional[str]:
+    def to_display(self, value: Optional[str | datetime]) -> Optional[str]:
         dt = parse_datetime_string(value)
         if not dt:
             return value
@@ -93,8 +61,14 @@ def get_timezone_helper(path: Optional[Path] = None) -> TimeZoneHelper:
     return helper
 
 
-def to_utc_iso(value: Optional[str | int | float]) -> Optional[str]:
-    dt = parse_datetime_string(value)
+def clear_timezone_helpers() -> None:
+    """配置热更新后丢弃缓存的时区助手。"""
+
+    _CACHE.clear()
+
+
+def to_utc_iso(value: Optional[str | int | float], source: Optional[str] = None) -> Optional[str]:
+    dt = normalize_timestamp(value, source)
     if not dt:
         return None
-    return dt.astimezone(timezone.utc).isoformat()
+    return dt.isoformat()
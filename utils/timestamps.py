@@ -0,0 +1,200 @@
+"""统一的时间戳解析：抓取时解析一次为 UTC datetime，按新闻源记住命中的格式，并用有界 LRU 缓存结果。"""
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+DEFAULT_CACHE_SIZE = 4096
+
+# 依次尝试的绝对时间格式；新闻源命中某个格式后，下次优先尝试该格式
+STRPTIME_FORMATS: List[str] = [
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y/%m/%d %H:%M",
+    "%d/%m/%Y %H:%M",
+    "%d %b %Y %H:%M",
+    "%d %b %Y",
+    "%d %B %Y",
+    "%a, %d %b %Y %H:%M:%S %z",
+    "%a, %d %b %Y %H:%M:%S GMT",
+]
+
+_RELATIVE_UNITS: Dict[str, timedelta] = {
+    "s": timedelta(seconds=1),
+    "sec": timedelta(seconds=1),
+    "second": timedelta(seconds=1),
+    "m": timedelta(minutes=1),
+    "min": timedelta(minutes=1),
+    "minute": timedelta(minutes=1),
+    "h": timedelta(hours=1),
+    "hr": timedelta(hours=1),
+    "hour": timedelta(hours=1),
+    "d": timedelta(days=1),
+    "day": timedelta(days=1),
+    "w": timedelta(weeks=1),
+    "wk": timedelta(weeks=1),
+    "week": timedelta(weeks=1),
+    "秒": timedelta(seconds=1),
+    "分钟": timedelta(minutes=1),
+    "分鐘": timedelta(minutes=1),
+    "小时": timedelta(hours=1),
+    "小時": timedelta(hours=1),
+    "天": timedelta(days=1),
+    "周": timedelta(weeks=1),
+}
+# BBC 卡片上的 "2 hrs ago"、"1 day ago"，以及中文站点的 "3分钟前"
+_RELATIVE_EN = re.compile(r"^(\d+|an?|one)\s*([a-z]+?)s?\s+ago$", re.IGNORECASE)
+_RELATIVE_ZH = re.compile(r"^(\d+)\s*(秒|分钟|分鐘|小时|小時|天|周)前$")
+_JUST_NOW = {"just now", "now", "刚刚", "剛剛"}
+
+Value = Union[str, int, float, datetime, None]
+_MISSING = object()
+
+
+def from_unix_timestamp(raw: float) -> Optional[datetime]:
+    try:
+        seconds = raw / 1000 if raw > 10**11 else raw
+        return datetime.fromtimestamp(seconds, tz=timezone.utc)
+    except (OSError, OverflowError, ValueError):
+        return None
+
+
+def _as_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _parse_epoch(text: str) -> Optional[datetime]:
+    return from_unix_timestamp(float(text)) if text.isdigit() else None
+
+
+def _parse_iso(text: str) -> Optional[datetime]:
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        return _as_utc(datetime.fromisoformat(text))
+    except ValueError:
+        return None
+
+
+def _strptime_parser(fmt: str) -> Callable[[str], Optional[datetime]]:
+    def parse(text: str) -> Optional[datetime]:
+        try:
+            return _as_utc(datetime.strptime(text, fmt))
+        except ValueError:
+            return None
+
+    return parse
+
+
+def parse_relative(text: str, now: datetime) -> Optional[datetime]:
+    """解析 "2 hrs ago"、"3分钟前"、"just now" 等相对时间；结果依赖 now，不进入缓存。"""
+    lowered = text.strip().lower()
+    if lowered in _JUST_NOW:
+        return _as_utc(now)
+    match = _RELATIVE_EN.match(lowered) or _RELATIVE_ZH.match(lowered)
+    if not match:
+        return None
+    count_text, unit = match.groups()
+    unit_delta = _RELATIVE_UNITS.get(unit)
+    if unit_delta is None:
+        return None
+    count = int(count_text) if count_text.isdigit() else 1
+    return _as_utc(now) - unit_delta * count
+
+
+class TimestampNormalizer:
+    """线程安全的时间戳解析服务，抓取线程共享同一实例。"""
+
+    def __init__(
+        self,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        *,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        self.cache_size = max(1, cache_size)
+        self.clock = clock
+        self.parsers: List[Tuple[str, Callable[[str], Optional[datetime]]]] = [
+            ("epoch", _parse_epoch),
+            ("iso", _parse_iso),
+            *((fmt, _strptime_parser(fmt)) for fmt in STRPTIME_FORMATS),
+        ]
+        self._parser_map = dict(self.parsers)
+        self._winners: Dict[str, str] = {}
+        self._cache: "OrderedDict[str, Optional[datetime]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, value: Value, source: Optional[str] = None, *, now: Optional[datetime] = None) -> Optional[datetime]:
+        """解析为带 UTC 时区的 datetime；无法识别时返回 None。无时区的时间按 UTC 处理。"""
+        if value is None:
+            return None
+        if isinstance(value, datetime):
+            return _as_utc(value)
+        if isinstance(value, (int, float)):
+            return from_unix_timestamp(float(value))
+        text = str(value).strip()
+        if not text:
+            return None
+        with self._lock:
+            cached = self._cache.get(text, _MISSING)
+            if cached is not _MISSING:
+                self._cache.move_to_end(text)
+                self.hits += 1
+                return cached  # type: ignore[return-value]
+            self.misses += 1
+        relative = parse_relative(text, now or self.clock())
+        if relative is not None:
+            return relative
+        result = self._parse_absolute(text, source)
+        with self._lock:
+            self._cache[text] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def to_utc_iso(self, value: Value, source: Optional[str] = None) -> Optional[str]:
+        dt = self.parse(value, source)
+        return dt.isoformat() if dt else None
+
+    def format_for(self, source: str) -> Optional[str]:
+        """该新闻源最近一次命中的格式名。"""
+        return self._winners.get(source)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._winners.clear()
+            self.hits = self.misses = 0
+
+    def _parse_absolute(self, text: str, source: Optional[str]) -> Optional[datetime]:
+        winner = self._winners.get(source) if source else None
+        if winner is not None:
+            result = self._parser_map[winner](text)
+            if result is not None:
+                return result
+        for name, parser in self.parsers:
+            if name == winner:
+                continue
+            result = parser(text)
+            if result is not None:
+                if source:
+                    self._winners[source] = name
+                return result
+        return None
+
+
+_DEFAULT = TimestampNormalizer()
+
+
+def get_normalizer() -> TimestampNormalizer:
+    return _DEFAULT
+
+
+def normalize_timestamp(value: Value, source: Optional[str] = None) -> Optional[datetime]:
+    return _DEFAULT.parse(value, source)